@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 
 import streamlit as st
 
+from app.comparison import add_encounter_comparison
 from app.config import (
     set_basic_configuration,
     set_pokemon_by_dex_no,
@@ -9,15 +10,20 @@ from app.config import (
     set_pokemon_level,
 )
 from app.dataframe import format_catch_rates, get_catch_rates
+from app.grid import add_catch_rate_grid
 from app.sidebar import add_sidebar_widgets
+from models.exceptions import MissingSpeciesIndexError
 from settings import CURRENT_LAST_DEX_NUMBER
 from src.api import get_pokemon_names
+from src.assets import get_artwork_image, get_type_image
+from src.metrics import start_json_dump
 
 if TYPE_CHECKING:
     from models.pokemon import Pokemon
 
 
 def main() -> None:
+    start_json_dump()
     set_basic_configuration()
     add_sidebar_widgets()
 
@@ -41,9 +47,16 @@ def main() -> None:
         on_change=set_pokemon_by_dex_no,
     )
 
+    try:
+        pokemon_names = get_pokemon_names()
+    except MissingSpeciesIndexError as error:
+        # Pokémon can still be looked up by their dex number.
+        st.error(str(error))
+        pokemon_names = ()
+
     form_columns[1].selectbox(
         label='Pokémon Name',
-        options=get_pokemon_names(),
+        options=pokemon_names,
         index=None,
         key='pokemon_name',
         on_change=set_pokemon_by_name,
@@ -70,8 +83,19 @@ def main() -> None:
     pokemon: Pokemon | None = st.session_state.get('pokemon')
 
     if pokemon:
-        image_box.image(pokemon.sprites.official_artwork.default)
-        type_box.image([type_.url for type_ in pokemon.types])
+        image_box.markdown(
+            f'<img class="artwork" src="{get_artwork_image(pokemon)}">',
+            unsafe_allow_html=True,
+        )
+        type_box.markdown(
+            '<div class="type-icons">'
+            + ''.join(
+                f'<img src="{get_type_image(type_)}">'
+                for type_ in pokemon.types
+            )
+            + '</div>',
+            unsafe_allow_html=True,
+        )
 
         button_box.button(
             label='Calculate',
@@ -88,6 +112,14 @@ def main() -> None:
                 unsafe_allow_html=True,
             )
 
+        if form_columns[1].toggle(
+            label='Catch rates by level and HP',
+            key='show_grid',
+        ):
+            add_catch_rate_grid(pokemon, form_columns[1])
+
+    add_encounter_comparison(form_columns[1].expander('Compare encounters'))
+
 
 if __name__ == '__main__':
     main()
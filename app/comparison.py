@@ -0,0 +1,96 @@
+from typing import TYPE_CHECKING
+
+from streamlit.delta_generator import DeltaGenerator
+
+from app.config import get_battle_variables, get_game_variables
+from app.dataframe import format_catch_rates
+from models.exceptions import PokemonLoadError
+from src.assets import get_poke_ball_icon
+
+if TYPE_CHECKING:
+    from src.comparison import BallRanking
+
+COLUMNS = ('Image', 'Poké Ball', 'Encounters', 'Mean', 'Lowest')
+TABLE_TEMPLATE = (
+    '<table border="1" class="dataframe">\n'
+    '  <thead>\n'
+    '    <tr style="text-align: center;">\n'
+    + ''.join(f'      <th>{column}</th>\n' for column in COLUMNS)
+    + '    </tr>\n'
+    '  </thead>\n'
+    '  <tbody>\n'
+    '{rows}'
+    '  </tbody>\n'
+    '</table>'
+)
+ROW_TEMPLATE = (
+    '    <tr>\n'
+    '      <td>{image}</td>\n'
+    '      <td>{label}</td>\n'
+    '      <td>{encounters}</td>\n'
+    '      <td>{mean_catch_rate:.2%}</td>\n'
+    '      <td>{min_catch_rate:.2%}</td>\n'
+    '    </tr>\n'
+)
+
+
+def format_ranking(ranking: list['BallRanking']) -> str:
+    return TABLE_TEMPLATE.format(
+        rows=''.join(
+            ROW_TEMPLATE.format(
+                image=get_poke_ball_icon(ball.poke_ball),
+                label=ball.label,
+                encounters=ball.encounters,
+                mean_catch_rate=ball.mean_catch_rate,
+                min_catch_rate=ball.min_catch_rate,
+            )
+            for ball in ranking
+        ),
+    )
+
+
+def add_encounter_comparison(container: DeltaGenerator) -> None:
+    """Rank the Poké Balls across a list of encounters."""
+    text = container.text_area(
+        label='Encounters',
+        placeholder='pikachu 12\nbulbasaur 15\n25 30',
+        key='encounters',
+        help='One Pokémon name or National Dex number and level per line.',
+    )
+    if not container.button(label='Compare', use_container_width=True):
+        return
+
+    # Loaded on first use, as it pulls in PokéAPI loading and requests.
+    from src.comparison import (  # noqa: PLC0415
+        compare_encounters,
+        parse_encounters,
+    )
+
+    try:
+        encounters = parse_encounters(text)
+        if not encounters:
+            return
+        comparison = compare_encounters(
+            encounters,
+            get_battle_variables,
+            get_game_variables(),
+        )
+    except (ValueError, PokemonLoadError) as error:
+        container.error(str(error))
+        return
+
+    container.markdown(
+        format_ranking(comparison.ranking),
+        unsafe_allow_html=True,
+    )
+    tabs = container.tabs(
+        [
+            f'{table.pokemon.name.title()} ({table.encounter.level})'
+            for table in comparison.tables
+        ],
+    )
+    for tab, table in zip(tabs, comparison.tables, strict=True):
+        tab.markdown(
+            format_catch_rates(table.catch_rates),
+            unsafe_allow_html=True,
+        )
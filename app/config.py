@@ -6,7 +6,9 @@ import streamlit as st
 from models.poke_ball import PokeBall
 from models.pokemon import Pokemon, PokemonStatus
 from settings import ROOT
+from src.assets import get_poke_ball_css
 from src.calc import BattleVariables, GameVariables
+from src.loader import get_pokemon
 
 
 def set_basic_configuration() -> None:
@@ -19,7 +21,7 @@ def set_basic_configuration() -> None:
 
     with pathlib.Path.open(ROOT / 'assets' / 'css' / 'styles.css') as css:
         st.markdown(
-            '<style>' + css.read() + '</style>',
+            '<style>' + css.read() + get_poke_ball_css() + '</style>',
             unsafe_allow_html=True,
         )
 
@@ -33,7 +35,7 @@ def set_pokemon_by_dex_no() -> None:
         st.session_state['pokemon_name'] = None
         return
 
-    pokemon = Pokemon(dex_no, level)
+    pokemon = get_pokemon(dex_no, level)
     if pokemon:
         st.session_state['pokemon'] = pokemon
         st.session_state['pokemon_name'] = pokemon.name.title()
@@ -49,15 +51,14 @@ def set_pokemon_by_name() -> None:
         st.session_state['dex_no'] = None
         return
 
-    pokemon = Pokemon(pokemon_name.lower(), level)
+    pokemon = get_pokemon(pokemon_name.lower(), level)
     st.session_state['pokemon'] = pokemon
     st.session_state['dex_no'] = pokemon.dex_no
 
 
 def set_pokemon_level() -> None:
     pokemon: Pokemon = st.session_state['pokemon']
-    pokemon.level = st.session_state['level']
-    st.session_state['pokemon'] = pokemon
+    st.session_state['pokemon'] = pokemon.with_level(st.session_state['level'])
 
 
 def get_current_hp(pokemon_hp: int) -> int:
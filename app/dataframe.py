@@ -1,69 +1,120 @@
-import pandas as pd
+from collections.abc import Sequence
 
 from app.config import get_battle_variables, get_game_variables
+from models.catch_rate_record import (
+    CatchRateRecord,
+    IVCatchRateRecord,
+    rank_catch_rates,
+)
+from models.poke_ball import PokeBall
 from models.pokemon import Pokemon
-from src.calc import (
-    calculate_modified_catch_rates,
-    calculate_overall_catch_rate,
+from settings import CATCH_RATES_CACHE_SIZE
+from src import metrics
+from src.assets import get_poke_ball_icon
+from src.cache import TTLCache
+from src.calc import BattleVariables, GameVariables
+from src.ivs import calculate_iv_catch_rates
+
+COLUMNS = ('Image', 'Poké Ball', 'Condition', 'Catch Rate')
+TABLE_TEMPLATE = (
+    '<table border="1" class="dataframe">\n'
+    '  <thead>\n'
+    '    <tr style="text-align: center;">\n'
+    + ''.join(f'      <th>{column}</th>\n' for column in COLUMNS)
+    + '    </tr>\n'
+    '  </thead>\n'
+    '  <tbody>\n'
+    '{rows}'
+    '  </tbody>\n'
+    '</table>'
+)
+ROW_TEMPLATE = (
+    '    <tr>\n'
+    '      <td>{image}</td>\n'
+    '      <td>{poke_ball}</td>\n'
+    '      <td>{condition}</td>\n'
+    '      <td>{catch_rate}</td>\n'
+    '    </tr>\n'
 )
 
 
-def get_catch_rates(pokemon: Pokemon) -> pd.DataFrame:
-    # add max_iv catch rates  # to-do
-    battle_variables = get_battle_variables(pokemon.min_hp)
+catch_rates_cache: TTLCache[
+    tuple[int, int, tuple[BattleVariables, ...], GameVariables],
+    list[IVCatchRateRecord],
+] = TTLCache('catch_rates', maxsize=CATCH_RATES_CACHE_SIZE)
+
+
+def get_catch_rates(pokemon: Pokemon) -> list[IVCatchRateRecord]:
+    """Return the lowest, highest and expected catch rates over all IVs."""
     game_variables = get_game_variables()
-    catch_rates_data: list[dict[str, str | float | None]] = []
-    for min_iv_scenario, min_iv_rate in calculate_modified_catch_rates(
-        pokemon=pokemon,
-        hp=pokemon.min_hp,
-        battle_variables=battle_variables,
-        game_variables=game_variables,
-    ):
-        catch_rate = calculate_overall_catch_rate(
-            modified_catch_rate=min_iv_rate,
-            registered_pokemon=game_variables.registered_pokemon,
-            catching_charm=game_variables.catching_charm,
-        )
+    return catch_rates_cache.get_or_set(
+        (
+            pokemon.form_id,
+            pokemon.level,
+            tuple(
+                get_battle_variables(hp)
+                for hp in sorted(set(pokemon.hps_by_iv))
+            ),
+            game_variables,
+        ),
+        lambda: calculate_iv_catch_rates(
+            pokemon,
+            get_battle_variables,
+            game_variables,
+        ),
+    )
 
-        catch_rates_data.append(
-            {
-                'Image': f'<img src="{min_iv_scenario.poke_ball.image}"',
-                'Poké Ball': min_iv_scenario.poke_ball.value,
-                'Condition': min_iv_scenario.condition or '',
-                'Catch Rate': catch_rate,
-            },
-        )
-    return pd.DataFrame(catch_rates_data)
 
+def _is_shown(record: CatchRateRecord, max_timer_turns: int | None) -> bool:
+    if record.poke_ball != PokeBall.TIMER_BALL:
+        return True
+    if record.turns is None:
+        return False
+    return max_timer_turns is None or record.turns <= max_timer_turns
 
-def format_catch_rates(catch_rates: pd.DataFrame) -> str:
-    catch_rates['Turns'] = (
-        catch_rates[catch_rates['Poké Ball'] == 'Timer Ball']['Condition']
-        .str.extract(r'(\d+)')
-        .astype(float)
-    )
 
-    min_turns: pd.DataFrame = catch_rates[
-        (catch_rates['Poké Ball'] == 'Timer Ball')
-        & (catch_rates['Catch Rate'] == 1)
-    ]['Turns'].min()
+def _format_catch_rate(record: CatchRateRecord) -> str:
+    if (
+        not isinstance(record, IVCatchRateRecord)
+        or record.min_catch_rate == record.max_catch_rate
+    ):
+        return f'{record.catch_rate:.2%}'
+    return (
+        f'{record.catch_rate:.2%} '
+        f'({record.min_catch_rate:.2%} to {record.max_catch_rate:.2%})'
+    )
 
-    filtered_catch_rates = catch_rates[
-        (catch_rates['Poké Ball'] != 'Timer Ball')
-        | (
-            (catch_rates['Poké Ball'] == 'Timer Ball')
-            & (catch_rates['Turns'] <= min_turns)
-        )
-    ]
 
-    sorted_catch_rates = filtered_catch_rates.sort_values(
-        by=['Catch Rate', 'Poké Ball', 'Turns', 'Condition'],
-        ascending=False,
-    ).drop(columns='Turns')
+@metrics.timed('format_catch_rates')
+def format_catch_rates(catch_rates: Sequence[CatchRateRecord]) -> str:
+    """
+    Render the catch rates from highest to lowest as an HTML table.
 
-    return sorted_catch_rates.to_html(
-        index=False,
-        float_format=lambda x: f'{x:.2%}',
-        justify='center',
-        escape=False,
+    Timer Ball rows past the first turn reaching a 100% catch rate are left
+    out, as is the Timer Ball row without a turn count. Catch rates over
+    every IV show the expected one, then the lowest and highest.
+    """
+    max_timer_turns = min(
+        (
+            record.turns
+            for record in catch_rates
+            if record.poke_ball == PokeBall.TIMER_BALL
+            and record.turns is not None
+            and record.catch_rate == 1
+        ),
+        default=None,
+    )
+    rows = rank_catch_rates(
+        record for record in catch_rates if _is_shown(record, max_timer_turns)
+    )
+    return TABLE_TEMPLATE.format(
+        rows=''.join(
+            ROW_TEMPLATE.format(
+                image=get_poke_ball_icon(record.poke_ball),
+                poke_ball=record.poke_ball.value,
+                condition=record.condition,
+                catch_rate=_format_catch_rate(record),
+            )
+            for record in rows
+        ),
     )
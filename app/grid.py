@@ -0,0 +1,83 @@
+import numpy as np
+from streamlit.delta_generator import DeltaGenerator
+
+from app.config import get_battle_variables, get_game_variables
+from models.pokemon import Pokemon, PokemonStatus
+from settings import GRID_CACHE_SIZE
+from src.cache import TTLCache
+from src.calc import GameVariables
+from src.grid import CatchRateGrid, calculate_catch_rate_grid
+from src.scenarios import get_scenario_label
+
+grid_cache: TTLCache[
+    tuple[int, PokemonStatus | None, bool, int, GameVariables],
+    CatchRateGrid,
+] = TTLCache('catch_rate_grids', maxsize=GRID_CACHE_SIZE)
+
+
+def get_catch_rate_grid(pokemon: Pokemon) -> CatchRateGrid:
+    battle_variables = get_battle_variables(pokemon.min_hp)
+    game_variables = get_game_variables()
+    return grid_cache.get_or_set(
+        (
+            pokemon.form_id,
+            battle_variables.target_status,
+            battle_variables.backstrike,
+            battle_variables.catching_power_level,
+            game_variables,
+        ),
+        lambda: calculate_catch_rate_grid(
+            pokemon,
+            battle_variables,
+            game_variables,
+        ),
+    )
+
+
+def add_catch_rate_grid(pokemon: Pokemon, container: DeltaGenerator) -> None:
+    """Show a heatmap of one Poké Ball's catch rate by level and HP."""
+    import altair as alt  # noqa: PLC0415
+
+    grid = get_catch_rate_grid(pokemon)
+    labels = [
+        get_scenario_label(index) for index in grid.scenario_indexes.tolist()
+    ]
+    row = container.selectbox(
+        label='Poké Ball',
+        options=range(len(labels)),
+        format_func=labels.__getitem__,
+        key='grid_scenario',
+    )
+    if row is None:
+        return
+
+    catch_rates = grid.catch_rates[row]
+    level_indexes, hp_indexes = np.nonzero(~np.isnan(catch_rates))
+    values = [
+        {'Level': level, 'Current HP': current_hp, 'Catch Rate': catch_rate}
+        for level, current_hp, catch_rate in zip(
+            grid.levels[level_indexes].tolist(),
+            grid.current_hps[hp_indexes].tolist(),
+            catch_rates[level_indexes, hp_indexes].tolist(),
+            strict=True,
+        )
+    ]
+    chart = (
+        alt.Chart(alt.InlineData(values=values))
+        .mark_rect()
+        .encode(
+            x=alt.X('Level:Q', bin=alt.Bin(step=1), title='Level'),
+            y=alt.Y('Current HP:Q', bin=alt.Bin(step=1), title='Current HP'),
+            color=alt.Color(
+                'Catch Rate:Q',
+                scale=alt.Scale(domain=[0, 1], scheme='viridis'),
+                legend=alt.Legend(format='.0%'),
+            ),
+            tooltip=[
+                alt.Tooltip('Level:Q'),
+                alt.Tooltip('Current HP:Q'),
+                alt.Tooltip('Catch Rate:Q', format='.2%'),
+            ],
+        )
+    )
+    container.altair_chart(chart, use_container_width=True)
@@ -0,0 +1,158 @@
+"""Offline Pokémon built from trimmed PokéAPI pages, used by benchmarks."""
+
+from typing import Any, NamedTuple
+
+from models.pokemon import Pokemon, PokemonStatus
+from src.calc import BattleVariables, GameVariables
+
+
+class FixturePokemon(NamedTuple):
+    dex_no: int
+    name: str
+    level: int
+    hp: int
+    speed: int
+    types: tuple[str, ...]
+    weight: int  # hectograms
+    capture_rate: int
+    gender_rate: int
+    evolution_line: tuple[str, ...]
+    evolution_item: str | None = None
+
+
+FIXTURES = (
+    FixturePokemon(
+        25,
+        'pikachu',
+        5,
+        35,
+        90,
+        ('electric',),
+        60,
+        190,
+        4,
+        ('pichu', 'pikachu', 'raichu'),
+        'thunder-stone',
+    ),
+    FixturePokemon(
+        35,
+        'clefairy',
+        25,
+        70,
+        35,
+        ('fairy',),
+        75,
+        150,
+        6,
+        ('cleffa', 'clefairy', 'clefable'),
+        'moon-stone',
+    ),
+    FixturePokemon(
+        143,
+        'snorlax',
+        50,
+        160,
+        30,
+        ('normal',),
+        4600,
+        25,
+        1,
+        ('munchlax', 'snorlax'),
+    ),
+    FixturePokemon(
+        751,
+        'dewpider',
+        12,
+        38,
+        27,
+        ('water', 'bug'),
+        40,
+        200,
+        4,
+        ('dewpider', 'araquanid'),
+    ),
+    FixturePokemon(
+        793,
+        'nihilego',
+        100,
+        109,
+        103,
+        ('rock', 'poison'),
+        555,
+        45,
+        -1,
+        ('nihilego',),
+    ),
+)
+
+BATTLE_VARIABLES = (
+    BattleVariables(
+        target_current_hp=1,
+        target_status=None,
+        backstrike=False,
+        catching_power_level=0,
+    ),
+    BattleVariables(
+        target_current_hp=1,
+        target_status=PokemonStatus.ASLEEP,
+        backstrike=True,
+        catching_power_level=3,
+    ),
+)
+GAME_VARIABLES = GameVariables(
+    badges=8,
+    registered_pokemon=843,
+    catching_charm=True,
+)
+
+
+def get_form_page(fixture: FixturePokemon) -> dict[str, Any]:
+    return {
+        'id': fixture.dex_no,
+        'name': fixture.name,
+        'species': {'name': fixture.name},
+        'stats': [
+            {'base_stat': stat}
+            for stat in (fixture.hp, 0, 0, 0, 0, fixture.speed)
+        ],
+        'types': [{'type': {'name': type_}} for type_ in fixture.types],
+        'weight': fixture.weight,
+    }
+
+
+def get_species_page(fixture: FixturePokemon) -> dict[str, Any]:
+    return {
+        'id': fixture.dex_no,
+        'name': fixture.name,
+        'capture_rate': fixture.capture_rate,
+        'gender_rate': fixture.gender_rate,
+    }
+
+
+def get_evolution_page(fixture: FixturePokemon) -> dict[str, Any]:
+    chain: dict[str, Any] = {}
+    node = chain
+    last_index = len(fixture.evolution_line) - 1
+    for index, species in enumerate(fixture.evolution_line):
+        is_evolved_by_item = index == last_index and fixture.evolution_item
+        item = {'name': fixture.evolution_item} if is_evolved_by_item else None
+        node['species'] = {'name': species}
+        node['evolution_details'] = [{'item': item}]
+        node['evolves_to'] = []
+        if index < last_index:
+            node['evolves_to'].append({})
+            node = node['evolves_to'][0]
+    return {'chain': chain}
+
+
+def get_fixture_pokemon() -> list[Pokemon]:
+    return [
+        Pokemon(
+            fixture.dex_no,
+            fixture.level,
+            form_page=get_form_page(fixture),
+            species_page=get_species_page(fixture),
+            evolution_page=get_evolution_page(fixture),
+        )
+        for fixture in FIXTURES
+    ]
@@ -0,0 +1,160 @@
+"""Measure the catch rate server's throughput over keep-alive connections.
+
+Usage: python -m benchmarks.load [--connections N] [--duration SECONDS]
+                                 [--batch-size N] [POKEMON ...]
+
+Each connection sends requests back to back until the duration ends. With
+--batch-size, requests go to the batch endpoint with that many queries.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from settings import SERVER_HOST, SERVER_PORT
+
+DEFAULT_POKEMON = ('pikachu', 'bulbasaur', 'snorlax', 'clefairy', 'nihilego')
+
+
+@dataclass
+class LoadResult:
+    duration: float
+    queries_per_request: int
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[int] = field(default_factory=Counter)
+
+    @property
+    def requests_per_second(self) -> float:
+        return len(self.latencies) / self.duration
+
+    @property
+    def queries_per_second(self) -> float:
+        return self.statuses[200] * self.queries_per_request / self.duration
+
+    def get_latency(self, quantile: float) -> float:
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, int(quantile * len(latencies)))
+        return latencies[index]
+
+
+def get_request(host: str, pokemon: list[str], batch_size: int) -> bytes:
+    queries = [
+        {'pokemon': name, 'level': level}
+        for name, level in itertools.islice(
+            zip(itertools.cycle(pokemon), itertools.cycle(range(1, 101, 7))),
+            max(1, batch_size),
+        )
+    ]
+    if batch_size:
+        path = '/catch-rates/batch'
+        body = json.dumps({'queries': queries}).encode()
+    else:
+        path = '/catch-rates'
+        body = json.dumps(queries[0]).encode()
+    return (
+        f'POST {path} HTTP/1.1\r\n'
+        f'Host: {host}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        '\r\n'
+    ).encode() + body
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """Read one response and return its status code."""
+    status = int((await reader.readline()).split()[1])
+    content_length = 0
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            content_length = int(value)
+    await reader.readexactly(content_length)
+    return status
+
+
+async def run_connection(
+    host: str,
+    port: int,
+    requests: list[bytes],
+    deadline: float,
+    result: LoadResult,
+) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for request in itertools.cycle(requests):
+            if time.perf_counter() >= deadline:
+                break
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            result.statuses[await read_response(reader)] += 1
+            result.latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(  # noqa: PLR0913
+    host: str,
+    port: int,
+    pokemon: list[str],
+    connections: int,
+    duration: float,
+    batch_size: int,
+) -> LoadResult:
+    requests = [
+        get_request(host, [*pokemon[offset:], *pokemon[:offset]], batch_size)
+        for offset in range(len(pokemon))
+    ]
+    result = LoadResult(duration, max(1, batch_size))
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(
+            run_connection(host, port, requests, deadline, result)
+            for _ in range(connections)
+        ),
+    )
+    return result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('pokemon', nargs='*', default=list(DEFAULT_POKEMON))
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--batch-size', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(
+        run_load(
+            args.host,
+            args.port,
+            args.pokemon,
+            args.connections,
+            args.duration,
+            args.batch_size,
+        ),
+    )
+    if not result.latencies:
+        print('no requests completed')  # noqa: T201
+        return
+    print(  # noqa: T201
+        f'{len(result.latencies)} requests in {result.duration:.1f}s: '
+        f'{result.requests_per_second:,.1f} requests/s, '
+        f'{result.queries_per_second:,.1f} queries/s\n'
+        f'latency mean {statistics.fmean(result.latencies) * 1e3:.2f}ms, '
+        f'p50 {result.get_latency(0.5) * 1e3:.2f}ms, '
+        f'p99 {result.get_latency(0.99) * 1e3:.2f}ms\n'
+        f'statuses: {dict(sorted(result.statuses.items()))}',
+    )
+
+
+if __name__ == '__main__':
+    main()
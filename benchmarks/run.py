@@ -0,0 +1,258 @@
+"""Time the hot paths against fixture Pokémon and compare with a baseline.
+
+Usage: python -m benchmarks.run [--save] [--threshold PERCENT] [NAME ...]
+
+Each benchmark reports the best time per call over several repeats. Runs
+exit with status 1 when any benchmark is slower than its baseline by more
+than the threshold or has no baseline. `--save` writes the results as the
+new baseline, which has to be recorded on the machine running the checks.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from app.dataframe import format_catch_rates
+from benchmarks.fixtures import (
+    BATTLE_VARIABLES,
+    GAME_VARIABLES,
+    get_fixture_pokemon,
+)
+from models.catch_rate_record import IVCatchRateRecord
+from models.poke_ball import PokeBall
+from models.pokemon import Pokemon, PokemonStatus
+from settings import CATCHING_POWER_MODIFIERS, ROOT
+from src import modifiers
+from src.calc import (
+    BattleVariables,
+    calculate_modified_catch_rates,
+    calculate_overall_catch_rate,
+)
+from src.fixed_point import (
+    calculate_modified_catch_rates_exact,
+    calculate_overall_catch_rate_exact,
+)
+from src.ivs import calculate_iv_catch_rates
+from src.scenarios import get_catch_scenarios
+
+BASELINE_PATH = ROOT / 'benchmarks' / 'baseline.json'
+DEFAULT_THRESHOLD = 10.0  # percent
+DEFAULT_REPEAT = 5
+
+Benchmark = Callable[[], object]
+
+
+def _get_iv_catch_rates(
+    pokemon: Pokemon,
+    battle_variables: BattleVariables,
+) -> list[IVCatchRateRecord]:
+    return calculate_iv_catch_rates(
+        pokemon,
+        lambda _: battle_variables,
+        GAME_VARIABLES,
+    )
+
+
+def get_benchmarks() -> dict[str, Benchmark]:
+    """Return every benchmark, each running once over all fixtures."""
+    pokemon = get_fixture_pokemon()
+    cases = [
+        (target, battle_variables)
+        for target in pokemon
+        for battle_variables in BATTLE_VARIABLES
+    ]
+    catch_rates = [
+        _get_iv_catch_rates(target, battle_variables)
+        for target, battle_variables in cases
+    ]
+    registered_pokemon = range(0, 844, 60)
+    statuses = [None, *PokemonStatus]
+
+    return {
+        'calc.calculate_modified_catch_rates': lambda: [
+            calculate_modified_catch_rates(
+                target,
+                target.min_hp,
+                battle_variables,
+                GAME_VARIABLES,
+            )
+            for target, battle_variables in cases
+        ],
+        'calc.calculate_overall_catch_rate': lambda: [
+            calculate_overall_catch_rate(modified_catch_rate)
+            for modified_catch_rate in range(1, 0xFF001, 4099)
+        ],
+        'fixed_point.calculate_modified_catch_rates_exact': lambda: [
+            calculate_modified_catch_rates_exact(
+                target,
+                target.min_hp,
+                battle_variables,
+                GAME_VARIABLES,
+            )
+            for target, battle_variables in cases
+        ],
+        'fixed_point.calculate_overall_catch_rate_exact': lambda: [
+            calculate_overall_catch_rate_exact(modified_catch_rate)
+            for modified_catch_rate in range(1, 0xFF001, 4099)
+        ],
+        'scenarios.get_catch_scenarios': lambda: [
+            get_catch_scenarios(target) for target in pokemon
+        ],
+        'modifiers.get_hp_modifier': lambda: [
+            modifiers.get_hp_modifier(target.min_hp, current_hp)
+            for target in pokemon
+            for current_hp in (1, target.min_hp)
+        ],
+        'modifiers.get_dark_grass_modifier': lambda: [
+            modifiers.get_dark_grass_modifier(registered)
+            for registered in registered_pokemon
+        ],
+        'modifiers.get_species_modifier': lambda: [
+            modifiers.get_species_modifier(
+                target.catch_rate,
+                target.weight,
+                poke_ball,
+            )
+            for target in pokemon
+            for poke_ball in PokeBall
+        ],
+        'modifiers.get_badge_modifier': lambda: [
+            modifiers.get_badge_modifier(badges, target.level)
+            for target in pokemon
+            for badges in range(9)
+        ],
+        'modifiers.get_badge_modifier_array': lambda: (
+            modifiers.get_badge_modifier_array(
+                np.arange(9)[:, np.newaxis],
+                [target.level for target in pokemon],
+            )
+        ),
+        'modifiers.get_status_modifier': lambda: [
+            modifiers.get_status_modifier(status) for status in statuses
+        ],
+        'modifiers.get_capture_value_coefficient_modifier': lambda: [
+            modifiers.get_capture_value_coefficient_modifier(
+                catching_power_level,
+                backstrike=backstrike,
+            )
+            for catching_power_level in CATCHING_POWER_MODIFIERS
+            for backstrike in (False, True)
+        ],
+        'modifiers.get_critical_catch_modifier': lambda: [
+            modifiers.get_critical_catch_modifier(registered)
+            for registered in registered_pokemon
+        ],
+        'modifiers.get_critical_catch_modifier_array': lambda: (
+            modifiers.get_critical_catch_modifier_array(registered_pokemon)
+        ),
+        'ivs.calculate_iv_catch_rates': lambda: [
+            _get_iv_catch_rates(target, battle_variables)
+            for target, battle_variables in cases
+        ],
+        'dataframe.format_catch_rates': lambda: [
+            format_catch_rates(table) for table in catch_rates
+        ],
+    }
+
+
+def time_benchmark(benchmark: Benchmark, repeat: int) -> float:
+    """Return the best time per call, in seconds."""
+    timer = timeit.Timer(benchmark)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    if not path.exists():
+        return {}
+    with path.open() as file:
+        baseline: dict[str, float] = json.load(file)['results']
+    return baseline
+
+
+def save_baseline(path: Path, results: dict[str, float]) -> None:
+    with path.open('w') as file:
+        json.dump(
+            {
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results,
+            },
+            file,
+            indent=2,
+        )
+        file.write('\n')
+
+
+def parse_args(
+    argv: list[str] | None,
+    benchmarks: dict[str, Benchmark],
+) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('names', nargs='*', help='benchmarks to run')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='allowed slowdown over the baseline, in percent',
+    )
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(benchmarks)
+    if unknown:
+        parser.error(f'unknown benchmarks: {", ".join(sorted(unknown))}')
+    if not args.save and not args.baseline.exists():
+        parser.error(
+            f'no baseline at {args.baseline}, record one with --save first',
+        )
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    benchmarks = get_benchmarks()
+    args = parse_args(argv, benchmarks)
+    baseline = load_baseline(args.baseline)
+
+    results: dict[str, float] = {}
+    regressions: list[str] = []
+    missing: list[str] = []
+    for name, benchmark in benchmarks.items():
+        if args.names and name not in args.names:
+            continue
+        results[name] = time_benchmark(benchmark, args.repeat)
+        line = f'{name:<50} {results[name] * 1e6:>12.1f} µs'
+        if name in baseline:
+            change = (results[name] / baseline[name] - 1) * 100
+            line += f' {change:>+8.1f}%'
+            if change > args.threshold:
+                line += '  REGRESSION'
+                regressions.append(name)
+        elif not args.save:
+            line += '  NO BASELINE'
+            missing.append(name)
+        print(line)  # noqa: T201
+
+    if args.save:
+        save_baseline(args.baseline, baseline | results)
+        return
+    if missing:
+        print(  # noqa: T201
+            f'{len(missing)} benchmarks have no baseline, '
+            'record them with --save',
+            file=sys.stderr,
+        )
+    if regressions or missing:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
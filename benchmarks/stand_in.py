@@ -0,0 +1,247 @@
+"""A local stand-in for PokéAPI, serving the fixture Pokémon's pages.
+
+Usage: python -m benchmarks.stand_in [--port PORT] [--retry-after SECONDS]
+                                     [--check]
+
+The first request for each resource page is refused, like a throttling
+PokéAPI would: every other page gets 429 with Retry-After, and the rest
+503 without it, so clients have to back off on their own. Later requests
+succeed.
+`--check` runs the ingest command against the stand-in and verifies that
+every resource was stored, and that Retry-After was honoured.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, cast
+
+from benchmarks.fixtures import (
+    FIXTURES,
+    get_evolution_page,
+    get_form_page,
+    get_species_page,
+)
+from settings import INGESTED_ENDPOINTS
+
+API_PATH = '/api/v2/'
+DEFAULT_RETRY_AFTER = 1  # seconds
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        retry_after: int = DEFAULT_RETRY_AFTER,
+    ) -> None:
+        super().__init__(address, StandInHandler)
+        self.retry_after = retry_after
+        self.pages = self._get_pages()
+        self.rate_limited = set(list(self.pages)[::2])
+        self.refused: set[str] = set()
+        # Path, status and time of every resource page request.
+        self.responses: list[tuple[str, int, float]] = []
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host!s}:{port}{API_PATH}'
+
+    def _get_pages(self) -> dict[str, dict[str, Any]]:
+        pages: dict[str, dict[str, Any]] = {}
+        for fixture in FIXTURES:
+            species_page = get_species_page(fixture) | {
+                'evolution_chain': {
+                    'url': f'{self.base_url}evolution-chain/{fixture.dex_no}/',
+                },
+            }
+            for endpoint, page in (
+                ('pokemon', get_form_page(fixture)),
+                ('pokemon-species', species_page),
+                (
+                    'evolution-chain',
+                    get_evolution_page(fixture) | {'id': fixture.dex_no},
+                ),
+            ):
+                pages[f'{API_PATH}{endpoint}/{fixture.dex_no}/'] = page
+        return pages
+
+    def get_listing(self, endpoint: str) -> dict[str, Any]:
+        return {
+            'results': [
+                {
+                    'name': fixture.name,
+                    'url': f'{self.base_url}{endpoint}/{fixture.dex_no}/',
+                }
+                for fixture in FIXTURES
+            ],
+        }
+
+    def get_refusal(self, path: str) -> dict[str, str] | None:
+        """Return the headers of a refusal, on a page's first request only."""
+        with self.lock:
+            if path in self.refused:
+                return None
+            self.refused.add(path)
+        if path in self.rate_limited:
+            return {'Retry-After': str(self.retry_after)}
+        return {}
+
+    def record(self, path: str, status: int) -> None:
+        with self.lock:
+            self.responses.append((path, status, time.monotonic()))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *_: Any) -> None:  # noqa: ANN401
+        pass
+
+    def do_GET(self) -> None:
+        server = cast(StandInServer, self.server)
+        path = self.path.split('?', 1)[0]
+        endpoint = path.removeprefix(API_PATH).strip('/')
+
+        if path == API_PATH:
+            self._send(
+                HTTPStatus.OK,
+                {
+                    endpoint: f'{server.base_url}{endpoint}/'
+                    for endpoint in INGESTED_ENDPOINTS
+                },
+            )
+        elif endpoint in INGESTED_ENDPOINTS:
+            self._send(HTTPStatus.OK, server.get_listing(endpoint))
+        elif path not in server.pages:
+            self._send(HTTPStatus.NOT_FOUND, {'detail': 'Not found.'})
+        elif (headers := server.get_refusal(path)) is not None:
+            status = (
+                HTTPStatus.TOO_MANY_REQUESTS
+                if headers
+                else HTTPStatus.SERVICE_UNAVAILABLE
+            )
+            server.record(path, status)
+            self._send(status, {'detail': status.phrase}, headers)
+        else:
+            server.record(path, HTTPStatus.OK)
+            self._send(HTTPStatus.OK, server.pages[path])
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        body: dict[str, Any],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def get_check_errors(server: StandInServer, datastore_path: Path) -> list[str]:
+    """Return what went wrong when ingesting from `server`, if anything."""
+    from src.datastore import Datastore  # noqa: PLC0415
+
+    expected_ids = {fixture.dex_no for fixture in FIXTURES}
+    with Datastore(datastore_path) as datastore:
+        errors = [
+            f'{endpoint}: {sorted(missing)} not stored'
+            for endpoint in INGESTED_ENDPOINTS
+            if (missing := expected_ids - datastore.get_resource_ids(endpoint))
+        ]
+        errors += [
+            f'{endpoint}: not marked complete'
+            for endpoint in INGESTED_ENDPOINTS
+            if not datastore.is_complete(endpoint)
+        ]
+
+    responses: dict[str, list[tuple[int, float]]] = {}
+    for path, status, responded_at in server.responses:
+        responses.setdefault(path, []).append((status, responded_at))
+    for path in server.pages:
+        statuses = [status for status, _ in responses.get(path, [])]
+        refusal = (
+            HTTPStatus.TOO_MANY_REQUESTS
+            if path in server.rate_limited
+            else HTTPStatus.SERVICE_UNAVAILABLE
+        )
+        if statuses != [refusal, HTTPStatus.OK]:
+            errors.append(f'{path}: answered {statuses}')
+        elif refusal == HTTPStatus.TOO_MANY_REQUESTS:
+            (_, refused_at), (_, fetched_at) = responses[path]
+            if fetched_at - refused_at < server.retry_after:
+                errors.append(f'{path}: retried before Retry-After')
+    return errors
+
+
+def check(retry_after: int) -> list[str]:
+    """Ingest every fixture resource from a stand-in, returning errors."""
+    from src import ingest  # noqa: PLC0415
+
+    server = StandInServer(('127.0.0.1', 0), retry_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            datastore_path = Path(directory) / 'pokeapi.sqlite3'
+            ingest.main(
+                [
+                    '--base-url',
+                    server.base_url,
+                    '--datastore',
+                    str(datastore_path),
+                    '--rate',
+                    '100',
+                ],
+            )
+            return get_check_errors(server, datastore_path)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument(
+        '--retry-after',
+        type=int,
+        default=DEFAULT_RETRY_AFTER,
+        help='seconds sent with 429 responses (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='ingest from the stand-in and verify the result',
+    )
+    args = parser.parse_args(argv)
+
+    if args.check:
+        errors = check(args.retry_after)
+        for error in errors:
+            print(error, file=sys.stderr)  # noqa: T201
+        print(  # noqa: T201
+            f'ingest check {"failed" if errors else "passed"}',
+        )
+        sys.exit(1 if errors else 0)
+
+    server = StandInServer(('127.0.0.1', args.port), args.retry_after)
+    print(f'Serving PokéAPI fixtures at {server.base_url}')  # noqa: T201
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from models.poke_ball import PokeBall
+
+
+@dataclass(frozen=True)
+class CatchRateRecord:
+    poke_ball: PokeBall
+    condition: str
+    catch_rate: float
+    turns: int | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class IVCatchRateRecord(CatchRateRecord):
+    """Catch rates over every HP IV; `catch_rate` is the expected one."""
+
+    min_catch_rate: float
+    max_catch_rate: float
+
+
+def _get_sort_key(record: CatchRateRecord) -> tuple[float, str, int, str]:
+    turns = -1 if record.turns is None else record.turns
+    return record.catch_rate, record.poke_ball.value, turns, record.condition
+
+
+def rank_catch_rates(
+    records: Iterable[CatchRateRecord],
+) -> list[CatchRateRecord]:
+    """Return the records from the highest catch rate to the lowest."""
+    return sorted(records, key=_get_sort_key, reverse=True)
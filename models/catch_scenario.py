@@ -3,9 +3,10 @@ from dataclasses import dataclass
 from models.poke_ball import PokeBall
 
 
-@dataclass
+@dataclass(frozen=True)
 class CatchScenario:
     poke_ball: PokeBall
     catch_rate: int
     condition: str | None = None
     is_possible: bool = True
+    turns: int | None = None
@@ -22,6 +22,52 @@ class InvalidCatchingPowerError(ValueError):
         super().__init__('Catching power level must be 1, 2, or 3.')
 
 
+class CatchRateTableMismatchError(Exception):
+    """Error raised when a catch rate table disagrees with the formula."""
+
+    def __init__(self, modified_catch_rates: list[int]) -> None:
+        super().__init__(
+            'Catch rate table differs from the formula for modified catch '
+            f'rates {modified_catch_rates[:10]}.',
+        )
+
+
+class InvalidQueryError(ValueError):
+    """Error raised when a catch rate query has missing or invalid fields."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(f'Invalid query: {reason}.')
+
+
+class InvalidEncounterError(ValueError):
+    """Error raised when an encounter line is not a Pokémon and a level."""
+
+    def __init__(self, line: str) -> None:
+        super().__init__(
+            f'"{line}" is not a valid encounter, expected a Pokémon and a '
+            'level.',
+        )
+
+
+class MissingSpeciesIndexError(FileNotFoundError):
+    """Error raised when species names are found in no index nor PokéAPI."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(
+            f'No Pokémon species index at {path}, and PokéAPI could not be '
+            'reached for the names. Build it with `make species-index`, or '
+            'store PokéAPI locally with `make ingest`.',
+        )
+
+
+class RequestError(Exception):
+    """Error raised when an HTTP request to the server cannot be served."""
+
+    def __init__(self, status: int, reason: str) -> None:
+        self.status = status
+        super().__init__(reason)
+
+
 class NoMatchFoundError(Exception):
     """Error raised when no matches are found for RegEx pattern in string."""
 
@@ -39,8 +85,15 @@ class NoPaletteFoundError(Exception):
         super().__init__(f'No palette found for image: {image_path}.')
 
 
-class NoPokemonFoundError(Exception):
+class PokemonLoadError(Exception):
+    """Error raised when a Pokémon's pages cannot be fetched or read."""
+
+    def __init__(self, pokemon: str | int, error: Exception) -> None:
+        super().__init__(f'Could not load Pokémon {pokemon!r}: {error!r}.')
+
+
+class NoPokemonFoundError(PokemonLoadError):
     """Error raised when no Pokemon matches are found for dex number passed."""
 
     def __init__(self, *args: str | int) -> None:
-        super().__init__(f'No Pokémon found with {args}.')
+        Exception.__init__(self, f'No Pokémon found with {args}.')
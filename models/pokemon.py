@@ -1,10 +1,14 @@
+import copy
 import math
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum, StrEnum, auto
-from typing import Any
+from typing import Any, Self, TypeVar, cast
 
-from settings import ASSETS_URL
-from src.api import get_resource
+from settings import ASSETS_URL, MAX_IV
+from src.api import get_resource, get_resource_by_url
+
+T = TypeVar('T')
 
 
 class PokemonSprites:
@@ -41,6 +45,10 @@ class PokemonStats:
     speed: int
 
 
+def _get_stats(form_page: dict[str, Any]) -> PokemonStats:
+    return PokemonStats(*[stat['base_stat'] for stat in form_page['stats']])
+
+
 class PokemonStatus(Enum):
     """Represents the statuses a Pokémon might have and their catch bonus."""
 
@@ -78,47 +86,187 @@ class PokemonType(StrEnum):
         return f'{ASSETS_URL}/types/{self.value}.png'
 
 
-class PokemonSpecies:
-    def __init__(self, species_id: str | int, level: int = 1) -> None:
-        self.species_page = get_resource('pokemon-species', species_id)
-        self.level = level
-        self.dex_no: int = self.species_page['id']
-        self.name: str = self.species_page['name']
-        self.catch_rate: int = self.species_page['capture_rate']
-        self.evolution_chain: str = self.species_page['evolution_chain']['url']
-        self.gender_rate: int = self.species_page['gender_rate']
-        self.has_gender_differences: bool = self.species_page[
-            'has_gender_differences'
+class PokemonEvolution:
+    """Represents how a species evolves within its evolution chain."""
+
+    def __init__(self, chain_page: dict[str, Any], species_name: str) -> None:
+        node = _find_chain_node(chain_page['chain'], species_name)
+        evolves_to: list[dict[str, Any]] = node['evolves_to'] if node else []
+        self.species: list[str] = [
+            child['species']['name'] for child in evolves_to
         ]
-        self.pokedex_numbers: list[dict[str, Any]] = self.species_page[
-            'pokedex_numbers'
+        items = [
+            detail['item']['name']
+            for child in evolves_to
+            for detail in child['evolution_details']
+            if detail['item']
         ]
-        self.varieties: list[dict[str, Any]] = self.species_page['varieties']
+        self.item: str | None = (
+            items[0].replace('-', ' ').title() if items else None
+        )
 
-        self.evolution = None
 
+def _find_chain_node(
+    node: dict[str, Any],
+    species_name: str,
+) -> dict[str, Any] | None:
+    if node['species']['name'] == species_name:
+        return node
+    for child in node['evolves_to']:
+        if found := _find_chain_node(child, species_name):
+            return found
+    return None
 
-class Pokemon(PokemonSpecies):
-    def __init__(self, form_id: str | int, level: int = 1) -> None:
-        self.form_page = get_resource('pokemon', form_id)
-        self.abilities: list[dict[str, Any]] = self.form_page['abilities']
-        self.height: float = self.form_page['height'] / 10  # meters
-        self.moves = self.form_page['moves']
-        self.sprites = PokemonSprites(self.form_page['sprites'])
-        self.stats = PokemonStats(
-            *[stat['base_stat'] for stat in self.form_page['stats']],
+
+class PokemonSpecies:
+    """
+    Holds the species fields used by the calculator.
+
+    Everything else is read from the species page on demand, which is served
+    from the datastore or the HTTP cache, and kept on the instance from its
+    first access. Copies made by with_level share what was loaded.
+    """
+
+    __slots__ = (
+        '_loaded',
+        'catch_rate',
+        'dex_no',
+        'evolution_item',
+        'gender_rate',
+        'level',
+        'name',
+    )
+
+    def __init__(
+        self,
+        species_id: str | int,
+        level: int = 1,
+        *,
+        species_page: dict[str, Any] | None = None,
+        evolution_page: dict[str, Any] | None = None,
+    ) -> None:
+        species_page = species_page or get_resource(
+            'pokemon-species',
+            species_id,
         )
-        self.types = [
+        self._loaded: dict[str, Any] = {}
+        self.level = level
+        self.dex_no: int = species_page['id']
+        self.name: str = species_page['name']
+        self.catch_rate: int = species_page['capture_rate']
+        self.gender_rate: int = species_page['gender_rate']
+        self.evolution_item: str | None = PokemonEvolution(
+            evolution_page
+            or get_resource_by_url(species_page['evolution_chain']['url']),
+            self.name,
+        ).item
+
+    def with_level(self, level: int) -> Self:
+        pokemon = copy.copy(self)
+        pokemon.level = level
+        return pokemon
+
+    def _load(self, name: str, load: Callable[[], T]) -> T:
+        if name not in self._loaded:
+            self._loaded[name] = load()
+        return cast(T, self._loaded[name])
+
+    @property
+    def species_page(self) -> dict[str, Any]:
+        return self._load(
+            'species_page',
+            lambda: get_resource('pokemon-species', self.dex_no),
+        )
+
+    @property
+    def evolution_chain(self) -> str:
+        return cast(str, self.species_page['evolution_chain']['url'])
+
+    @property
+    def evolution(self) -> PokemonEvolution:
+        return PokemonEvolution(
+            get_resource_by_url(self.evolution_chain),
+            self.name,
+        )
+
+    @property
+    def has_gender_differences(self) -> bool:
+        return cast(bool, self.species_page['has_gender_differences'])
+
+    @property
+    def pokedex_numbers(self) -> list[dict[str, Any]]:
+        return cast(list[dict[str, Any]], self.species_page['pokedex_numbers'])
+
+    @property
+    def varieties(self) -> list[dict[str, Any]]:
+        return cast(list[dict[str, Any]], self.species_page['varieties'])
+
+
+class Pokemon(PokemonSpecies):
+    """Holds the form fields used by the calculator, loading others lazily."""
+
+    __slots__ = ('base_hp', 'form_id', 'speed', 'types', 'weight')
+
+    def __init__(
+        self,
+        form_id: str | int,
+        level: int = 1,
+        *,
+        form_page: dict[str, Any] | None = None,
+        species_page: dict[str, Any] | None = None,
+        evolution_page: dict[str, Any] | None = None,
+    ) -> None:
+        form_page = form_page or get_resource('pokemon', form_id)
+        self.form_id: int = form_page['id']
+        stats = _get_stats(form_page)
+        self.base_hp = stats.hp
+        self.speed = stats.speed
+        self.types = tuple(
             PokemonType[entry['type']['name'].upper()]
-            for entry in self.form_page['types']
-        ]
-        self.weight: float = self.form_page['weight'] / 10  # meters
+            for entry in form_page['types']
+        )
+        self.weight: float = form_page['weight'] / 10  # kilograms
 
-        super().__init__(self.form_page['species']['name'], level)
+        super().__init__(
+            form_page['species']['name'],
+            level,
+            species_page=species_page,
+            evolution_page=evolution_page,
+        )
+
+    @property
+    def form_page(self) -> dict[str, Any]:
+        return self._load(
+            'form_page',
+            lambda: get_resource('pokemon', self.form_id),
+        )
+
+    @property
+    def abilities(self) -> list[dict[str, Any]]:
+        return cast(list[dict[str, Any]], self.form_page['abilities'])
+
+    @property
+    def height(self) -> float:
+        return cast(int, self.form_page['height']) / 10  # meters
+
+    @property
+    def moves(self) -> list[dict[str, Any]]:
+        return cast(list[dict[str, Any]], self.form_page['moves'])
+
+    @property
+    def sprites(self) -> PokemonSprites:
+        return self._load(
+            'sprites',
+            lambda: PokemonSprites(self.form_page['sprites']),
+        )
+
+    @property
+    def stats(self) -> PokemonStats:
+        return self._load('stats', lambda: _get_stats(self.form_page))
 
     def _get_hp_by_iv(self, iv: int) -> int:
         return (
-            math.floor(((2 * self.stats.hp + iv) * self.level) / 100)
+            math.floor(((2 * self.base_hp + iv) * self.level) / 100)
             + self.level
             + 10
         )
@@ -129,4 +277,9 @@ class Pokemon(PokemonSpecies):
 
     @property
     def max_hp(self) -> int:
-        return self._get_hp_by_iv(31)
+        return self._get_hp_by_iv(MAX_IV)
+
+    @property
+    def hps_by_iv(self) -> list[int]:
+        """HP at each IV, from 0 to 31."""
+        return [self._get_hp_by_iv(iv) for iv in range(MAX_IV + 1)]
@@ -4,9 +4,46 @@ import pathlib
 
 ROOT = pathlib.Path(__file__).resolve().parent
 ASSETS_URL = 'https://raw.githubusercontent.com/GuilhermeCAz/poke_ball_calculator_assets/main/'
+BASE_API_URL = 'https://pokeapi.co/api/v2/'
+
+DATA_DIR = ROOT / 'data'
+DATASTORE_PATH = DATA_DIR / 'pokeapi.sqlite3'
+CATCH_RATE_TABLES_DIR = DATA_DIR / 'catch_rate_tables'
+INGESTED_ENDPOINTS = ('pokemon', 'pokemon-species', 'evolution-chain')
+MAX_FETCH_WORKERS = 8
+INGEST_RATE_LIMIT = 20  # requests per second
+INGEST_BURST = 10
+INGEST_RETRIES = 5
+INGEST_BACKOFF_FACTOR = 0.5  # seconds
+INGEST_MAX_BACKOFF = 30  # seconds
+INGEST_TIMEOUT = 10  # seconds
+SPECIES_INDEX_PATH = ROOT / 'assets' / 'data' / 'pokemon_species.json'
+# Streamlit serves files under static/ at app/static/.
+STATIC_DIR = ROOT / 'static'
+STATIC_URL = 'app/static'
+POKE_BALL_CSS_PATH = STATIC_DIR / 'css' / 'poke_balls.css'
+ASSET_TIMEOUT = 5  # seconds
+IMPORT_TIME_BUDGET = 0.1  # seconds
+
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8080
+SERVER_MAX_CONCURRENCY = 32
+SERVER_MAX_BATCH_SIZE = 1000
+SERVER_MAX_BODY_SIZE = 1024 * 1024  # bytes
+SERVER_KEEP_ALIVE_TIMEOUT = 5  # seconds
+STREAM_CHUNK_SIZE = 1000
+METRICS_DUMP_PATH = DATA_DIR / 'metrics.json'
+METRICS_DUMP_INTERVAL = 60  # seconds
+
+CACHE_TTL = 60 * 60  # seconds
+POKEMON_CACHE_SIZE = 256
+CATCH_RATES_CACHE_SIZE = 1024
+CONSTANT_MODIFIERS_CACHE_SIZE = 1024
+GRID_CACHE_SIZE = 32
 
 CURRENT_LAST_DEX_NUMBER = 1025
 POKEMON_LEVEL_CAP = 100
+MAX_IV = 31
 BADGE_THRESHOLDS = [25, 30, 35, 40, 45, 50, 55, 60, 100]
 LOW_LEVEL_BONUS_THRESHOLD = 13
 
@@ -1,33 +1,88 @@
-from typing import Any, cast
+import threading
+from typing import TYPE_CHECKING, Any, cast
 from urllib.parse import urljoin
 
-import requests
+from models.exceptions import MissingSpeciesIndexError
+from settings import SPECIES_INDEX_PATH
+from src import metrics
+from src.cache import TTLCache
+from src.datastore import get_datastore
+from src.species_index import load_species_index
+
+if TYPE_CHECKING:
+    from src.client import PokeAPIClient
 
 PAYLOAD = {'limit': 10000}
-BASE_API_URL = 'https://pokeapi.co/api/v2/'
+
+names_cache: TTLCache[str, tuple[str, ...]] = TTLCache('names', maxsize=8)
+
+client: 'PokeAPIClient | None' = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> 'PokeAPIClient':
+    """Return the shared client, importing requests on first use."""
+    global client  # noqa: PLW0603
+    with _client_lock:
+        if client is None:
+            from src.client import PokeAPIClient  # noqa: PLC0415
+
+            client = PokeAPIClient()
+    return client
 
 
 def get_pages() -> dict[str, str]:
-    response = requests.get(BASE_API_URL, timeout=1)
-    return cast(dict[str, str], response.json())
+    return get_client().get_pages()
 
 
-def get_endpoint(endpoint: str) -> list[dict[str, str]]:
+def fetch_endpoint(endpoint: str) -> list[dict[str, str]]:
     pages = get_pages()
-    response = requests.get(pages[endpoint], params=PAYLOAD, timeout=10)
-    return cast(list[dict[str, str]], response.json()['results'])
+    response = get_client().get_json(pages[endpoint], PAYLOAD, endpoint)
+    return cast(list[dict[str, str]], response['results'])
+
+
+def fetch_url(url: str, endpoint: str = '') -> dict[str, Any]:
+    return cast(dict[str, Any], get_client().get_json(url, PAYLOAD, endpoint))
 
 
+@metrics.timed('api_get_endpoint')
+def get_endpoint(endpoint: str) -> list[dict[str, str]]:
+    datastore = get_datastore()
+    if datastore and (results := datastore.get_endpoint(endpoint)):
+        return results
+
+    return fetch_endpoint(endpoint)
+
+
+@metrics.timed('api_get_resource')
 def get_resource(endpoint: str, resource: int | str) -> dict[str, Any]:
+    datastore = get_datastore()
+    if datastore and (page := datastore.get_resource(endpoint, resource)):
+        return page
+
     pages = get_pages()
-    response = requests.get(
-        urljoin(pages[endpoint], str(resource)),
-        params=PAYLOAD,
-        timeout=10,
-    )
-    return cast(dict[str, Any], response.json())
+    return fetch_url(urljoin(pages[endpoint], str(resource)), endpoint)
+
+
+def get_resource_by_url(url: str) -> dict[str, Any]:
+    endpoint, resource = url.rstrip('/').rsplit('/', 2)[-2:]
+    return get_resource(endpoint, resource)
 
 
 def get_pokemon_names() -> tuple[str, ...]:
-    pokemon_species = get_endpoint('pokemon-species')
-    return tuple(species['name'].title() for species in pokemon_species)
+    """
+    Return every species name from the bundled index, without any network
+    call, or else from the datastore or PokéAPI.
+    """
+
+    def _get_pokemon_names() -> tuple[str, ...]:
+        if species_index := load_species_index():
+            return tuple(name.title() for _, name in species_index)
+        # requests' errors are OSErrors, so it isn't imported to catch them.
+        try:
+            pokemon_species = get_endpoint('pokemon-species')
+        except OSError as error:
+            raise MissingSpeciesIndexError(str(SPECIES_INDEX_PATH)) from error
+        return tuple(species['name'].title() for species in pokemon_species)
+
+    return names_cache.get_or_set('pokemon-species', _get_pokemon_names)
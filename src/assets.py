@@ -0,0 +1,157 @@
+"""Local copies of the remote images shown by the app.
+
+Usage: python -m src.assets
+
+Downloads the Poké Ball and type icons once into static/, which Streamlit
+serves at app/static/, and inlines every Poké Ball icon into a single
+stylesheet as data URIs, so the catch rate tables refer to them by CSS
+class and make no image request per row. Official artwork is cached the
+first time each Pokémon is shown. Anything missing falls back to its
+remote URL.
+"""
+
+import argparse
+import base64
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+from pathlib import Path
+
+from models.poke_ball import PokeBall
+from models.pokemon import Pokemon, PokemonType
+from settings import (
+    ASSET_TIMEOUT,
+    MAX_FETCH_WORKERS,
+    POKE_BALL_CSS_PATH,
+    POKEMON_CACHE_SIZE,
+    STATIC_DIR,
+    STATIC_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+POKE_BALL_ICON_TEMPLATE = (
+    '<span class="poke-ball-icon poke-ball-{name}"></span>'
+)
+IMAGE_TEMPLATE = '<img src="{url}">'
+POKE_BALL_CSS_RULE = (
+    '.poke-ball-{name} {{ '
+    'background-image: url(data:image/png;base64,{data}); }}\n'
+)
+
+
+def get_poke_ball_path(poke_ball: PokeBall) -> Path:
+    return STATIC_DIR / 'poke_balls' / f'{poke_ball.name.lower()}.png'
+
+
+def get_type_path(type_: PokemonType) -> Path:
+    return STATIC_DIR / 'types' / f'{type_.value}.png'
+
+
+def get_artwork_path(pokemon: Pokemon) -> Path:
+    return STATIC_DIR / 'artwork' / f'{pokemon.form_id}.png'
+
+
+def get_static_url(path: Path) -> str:
+    return f'{STATIC_URL}/{path.relative_to(STATIC_DIR).as_posix()}'
+
+
+def download(url: str, path: Path) -> bool:
+    """Save the file at `url` to `path`, returning whether it succeeded."""
+    import requests  # noqa: PLC0415
+
+    try:
+        response = requests.get(url, timeout=ASSET_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as error:
+        logger.warning('%s: %s', url, error)
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    temporary_path.write_bytes(response.content)
+    temporary_path.replace(path)
+    return True
+
+
+@cache
+def get_poke_ball_css() -> str:
+    """Return the stylesheet of inlined Poké Ball icons, if it was built."""
+    if not POKE_BALL_CSS_PATH.exists():
+        return ''
+    return POKE_BALL_CSS_PATH.read_text()
+
+
+def get_poke_ball_icon(poke_ball: PokeBall) -> str:
+    """Return the HTML of a Poké Ball icon, inlined if possible."""
+    if get_poke_ball_css():
+        return POKE_BALL_ICON_TEMPLATE.format(name=poke_ball.name.lower())
+    return IMAGE_TEMPLATE.format(url=poke_ball.image)
+
+
+def get_type_image(type_: PokemonType) -> str:
+    path = get_type_path(type_)
+    return get_static_url(path) if path.exists() else type_.url
+
+
+@lru_cache(maxsize=POKEMON_CACHE_SIZE)
+def _get_cached_image(url: str, path: Path) -> str:
+    # Cached so that a failed download is not retried on every render.
+    if path.exists() or download(url, path):
+        return get_static_url(path)
+    return url
+
+
+def get_artwork_image(pokemon: Pokemon) -> str:
+    """Return the Pokémon's official artwork, downloading it on first use."""
+    return _get_cached_image(
+        pokemon.sprites.official_artwork.default,
+        get_artwork_path(pokemon),
+    )
+
+
+def build_poke_ball_css() -> int:
+    """Inline the downloaded Poké Ball icons, returning their count."""
+    rules = [
+        POKE_BALL_CSS_RULE.format(
+            name=poke_ball.name.lower(),
+            data=base64.b64encode(path.read_bytes()).decode(),
+        )
+        for poke_ball in PokeBall
+        if (path := get_poke_ball_path(poke_ball)).exists()
+    ]
+    POKE_BALL_CSS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    POKE_BALL_CSS_PATH.write_text(''.join(rules))
+    get_poke_ball_css.cache_clear()
+    return len(rules)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='download icons again even if they are cached',
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    icons = {
+        **{
+            get_poke_ball_path(poke_ball): poke_ball.image
+            for poke_ball in PokeBall
+        },
+        **{get_type_path(type_): type_.url for type_ in PokemonType},
+    }
+    paths = [path for path in icons if args.force or not path.exists()]
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        downloaded = sum(
+            executor.map(download, [icons[path] for path in paths], paths),
+        )
+    logger.info('%d of %d icons downloaded', downloaded, len(paths))
+    logger.info('%d Poké Ball icons inlined', build_poke_ball_css())
+
+
+if __name__ == '__main__':
+    main()
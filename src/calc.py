@@ -1,10 +1,12 @@
 import math
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple
 
 from models.catch_scenario import CatchScenario
 from models.pokemon import Pokemon, PokemonStatus
-from settings import LOW_LEVEL_BONUS_THRESHOLD
-from src import modifiers
+from settings import CONSTANT_MODIFIERS_CACHE_SIZE, LOW_LEVEL_BONUS_THRESHOLD
+from src import metrics, modifiers
 from src.scenarios import get_catch_scenarios
 
 
@@ -12,7 +14,7 @@ def special_round(value: float) -> int:
     return math.floor((value + 2048) / 4096)
 
 
-@dataclass
+@dataclass(frozen=True)
 class BattleVariables:
     target_current_hp: int
     target_status: PokemonStatus | None
@@ -20,33 +22,50 @@ class BattleVariables:
     catching_power_level: int
 
 
-@dataclass
+@dataclass(frozen=True)
 class GameVariables:
     badges: int
     registered_pokemon: int
     catching_charm: bool
 
 
+class ConstantModifiers(NamedTuple):
+    hp: int
+    dark_grass: int
+    badge: float
+    status: int
+    cvc: float
+
+
+@lru_cache(maxsize=CONSTANT_MODIFIERS_CACHE_SIZE)
+def get_constant_modifiers(
+    hp: int,
+    level: int,
+    battle_variables: BattleVariables,
+    game_variables: GameVariables,
+) -> ConstantModifiers:
+    """Return the modifiers shared by every scenario of a catch attempt."""
+    return ConstantModifiers(
+        hp=modifiers.get_hp_modifier(hp, battle_variables.target_current_hp),
+        dark_grass=modifiers.get_dark_grass_modifier(
+            game_variables.registered_pokemon,
+        ),
+        badge=modifiers.get_badge_modifier(game_variables.badges, level),
+        status=modifiers.get_status_modifier(battle_variables.target_status),
+        cvc=modifiers.get_capture_value_coefficient_modifier(
+            battle_variables.catching_power_level,
+            backstrike=battle_variables.backstrike,
+        ),
+    )
+
+
+@metrics.timed('modified_catch_rates')
 def calculate_modified_catch_rates(
     pokemon: Pokemon,
     hp: int,
     battle_variables: BattleVariables,
     game_variables: GameVariables,
 ) -> list[tuple[CatchScenario, int]]:
-    def _get_constant_modifiers() -> tuple[int, int, float, int, float]:
-        return (
-            modifiers.get_hp_modifier(hp, battle_variables.target_current_hp),
-            modifiers.get_dark_grass_modifier(
-                game_variables.registered_pokemon,
-            ),
-            modifiers.get_badge_modifier(game_variables.badges, pokemon.level),
-            modifiers.get_status_modifier(battle_variables.target_status),
-            modifiers.get_capture_value_coefficient_modifier(
-                battle_variables.catching_power_level,
-                backstrike=battle_variables.backstrike,
-            ),
-        )
-
     def _calculate_modified_catch_rate_by_scenario(
         scenario: CatchScenario,
     ) -> int:
@@ -94,7 +113,12 @@ def calculate_modified_catch_rates(
         badge_modifier,
         status_modifier,
         cvc_modifier,
-    ) = _get_constant_modifiers()
+    ) = get_constant_modifiers(
+        hp,
+        pokemon.level,
+        battle_variables,
+        game_variables,
+    )
 
     scenarios = get_catch_scenarios(pokemon)
 
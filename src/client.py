@@ -0,0 +1,210 @@
+"""HTTP client for PokéAPI, kept apart so requests is imported on demand."""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, cast
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from settings import BASE_API_URL, MAX_FETCH_WORKERS
+from src import metrics
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+
+@dataclass(frozen=True)
+class EndpointPolicy:
+    timeout: float = 10
+    retries: int = 3
+    backoff_factor: float = 0.5
+
+
+DEFAULT_POLICY = EndpointPolicy()
+ENDPOINT_POLICIES = {
+    '': EndpointPolicy(timeout=1),
+    'pokemon-species': EndpointPolicy(timeout=10, retries=5),
+}
+
+
+@dataclass
+class CachedResponse:
+    body: Any
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+def _get_retry(policy: EndpointPolicy) -> Retry:
+    return Retry(
+        total=policy.retries,
+        backoff_factor=policy.backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=('GET',),
+        raise_on_status=False,
+    )
+
+
+class EndpointAdapter(HTTPAdapter):
+    """
+    One connection pool per host, retrying each request with the policy of
+    the longest endpoint URL it starts with.
+    """
+
+    def __init__(self, pool_maxsize: int) -> None:
+        self._retries: dict[str, Retry] = {}
+        self._local = threading.local()
+        super().__init__(pool_connections=1, pool_maxsize=pool_maxsize)
+
+    @property
+    def max_retries(self) -> Retry:
+        return cast(Retry, getattr(self._local, 'retry', self._default_retry))
+
+    @max_retries.setter
+    def max_retries(self, retry: Retry) -> None:
+        self._default_retry = retry
+
+    def set_policy(self, url: str, policy: EndpointPolicy) -> None:
+        self._retries[url] = _get_retry(policy)
+
+    def send(  # type: ignore[override]
+        self,
+        request: requests.PreparedRequest,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> requests.Response:
+        url = request.url or ''
+        prefixes = [
+            prefix for prefix in self._retries if url.startswith(prefix)
+        ]
+        if prefixes:
+            self._local.retry = self._retries[max(prefixes, key=len)]
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            self._local.__dict__.pop('retry', None)
+
+
+def _get_expiry(response: requests.Response) -> float:
+    cache_control = response.headers.get('Cache-Control', '')
+    if 'no-cache' in cache_control or 'no-store' in cache_control:
+        return 0
+    match = MAX_AGE_PATTERN.search(cache_control)
+    return time.monotonic() + int(match.group(1)) if match else 0
+
+
+class PokeAPIClient:
+    """Keep-alive PokéAPI session with an HTTP-aware response cache."""
+
+    def __init__(
+        self,
+        base_url: str = BASE_API_URL,
+        policies: dict[str, EndpointPolicy] | None = None,
+        pool_maxsize: int = MAX_FETCH_WORKERS,
+        cache_maxsize: int = 256,
+    ) -> None:
+        self.base_url = base_url
+        self.policies = ENDPOINT_POLICIES if policies is None else policies
+        self.pool_maxsize = pool_maxsize
+        self.cache_maxsize = cache_maxsize
+        self.session = requests.Session()
+        self.adapter = EndpointAdapter(pool_maxsize)
+        self.adapter.set_policy(base_url, self.get_policy(''))
+        scheme, host, *_ = urlsplit(base_url)
+        self.session.mount(f'{scheme}://{host}/', self.adapter)
+        self._pages: dict[str, str] | None = None
+        self._cache: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pages_lock = threading.Lock()
+
+    def get_policy(self, endpoint: str) -> EndpointPolicy:
+        return self.policies.get(endpoint, DEFAULT_POLICY)
+
+    def get_pages(self) -> dict[str, str]:
+        """Return the API root directory, fetched once per client."""
+        with self._pages_lock:
+            if self._pages is None:
+                pages = cast(dict[str, str], self.get_json(self.base_url))
+                for endpoint, url in pages.items():
+                    self.adapter.set_policy(url, self.get_policy(endpoint))
+                self._pages = pages
+        return self._pages
+
+    def get_json(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        endpoint: str = '',
+    ) -> Any:  # noqa: ANN401
+        key = requests.Request('GET', url, params=params).prepare().url or url
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and cached.is_fresh:
+            metrics.increment('http_cache_requests_total', {'result': 'fresh'})
+            return cached.body
+
+        headers = {}
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+
+        start = time.perf_counter()
+        response = self.session.get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=self.get_policy(endpoint).timeout,
+        )
+        labels = {'endpoint': endpoint or 'root'}
+        metrics.observe(
+            'upstream_request_duration_seconds',
+            time.perf_counter() - start,
+            labels,
+        )
+        metrics.increment(
+            'upstream_requests_total',
+            {**labels, 'status': str(response.status_code)},
+        )
+        if cached and response.status_code == requests.codes.not_modified:
+            metrics.increment(
+                'http_cache_requests_total',
+                {'result': 'revalidated'},
+            )
+            cached.expires_at = _get_expiry(response)
+            return cached.body
+
+        metrics.increment('http_cache_requests_total', {'result': 'miss'})
+
+        response.raise_for_status()
+        body = response.json()
+        if 'no-store' not in response.headers.get('Cache-Control', ''):
+            self._store(
+                key,
+                CachedResponse(
+                    body=body,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                    expires_at=_get_expiry(response),
+                ),
+            )
+        return body
+
+    def _store(self, key: str, cached: CachedResponse) -> None:
+        with self._lock:
+            self._cache[key] = cached
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_maxsize:
+                self._cache.popitem(last=False)
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,182 @@
+"""Catch rate tables of many encounters at once, with a combined ranking."""
+
+import re
+import statistics
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+import numpy as np
+
+from models.catch_rate_record import CatchRateRecord, rank_catch_rates
+from models.exceptions import (
+    InvalidEncounterError,
+    InvalidLevelError,
+    PokemonLoadError,
+)
+from models.poke_ball import PokeBall
+from models.pokemon import Pokemon
+from settings import POKEMON_LEVEL_CAP
+from src import metrics
+from src.calc import BattleVariables, GameVariables
+from src.queries import load_species
+from src.scenarios import (
+    HIDDEN_SCENARIOS,
+    SCENARIO_BALLS,
+    get_scenario_label,
+    get_scenario_mask,
+)
+from src.vectorized import CatchCase, calculate_catch_rates_batch
+
+ENCOUNTER_PATTERN = re.compile(r'(?P<pokemon>.+?)[\s,:]+(?P<level>\d+)')
+
+
+class Encounter(NamedTuple):
+    pokemon: str | int
+    level: int
+
+
+class EncounterTable(NamedTuple):
+    encounter: Encounter
+    pokemon: Pokemon
+    catch_rates: list[CatchRateRecord]
+
+
+class BallRanking(NamedTuple):
+    """One scenario's catch rates across the encounters it applies to."""
+
+    label: str
+    poke_ball: PokeBall
+    encounters: int
+    mean_catch_rate: float
+    min_catch_rate: float
+
+
+class Comparison(NamedTuple):
+    tables: list[EncounterTable]
+    ranking: list[BallRanking]
+
+
+def parse_encounters(text: str) -> list[Encounter]:
+    """Read one Pokémon name or dex number and level per non-blank line."""
+    encounters = []
+    for line in filter(None, map(str.strip, text.splitlines())):
+        match = ENCOUNTER_PATTERN.fullmatch(line)
+        if match is None:
+            raise InvalidEncounterError(line)
+        level = int(match['level'])
+        if not 1 <= level <= POKEMON_LEVEL_CAP:
+            raise InvalidLevelError(level)
+        encounters.append(Encounter(match['pokemon'].strip(), level))
+    return encounters
+
+
+def _get_ranking(
+    scenario_catch_rates: Iterable[tuple[int, float]],
+) -> list[BallRanking]:
+    catch_rates_by_index: dict[int, list[float]] = {}
+    for index, catch_rate in scenario_catch_rates:
+        if not HIDDEN_SCENARIOS[index]:
+            catch_rates_by_index.setdefault(index, []).append(catch_rate)
+
+    ranking = [
+        BallRanking(
+            label=get_scenario_label(index),
+            poke_ball=SCENARIO_BALLS[index],
+            encounters=len(catch_rates),
+            mean_catch_rate=statistics.fmean(catch_rates),
+            min_catch_rate=min(catch_rates),
+        )
+        for index, catch_rates in catch_rates_by_index.items()
+    ]
+    return sorted(
+        ranking,
+        key=lambda ball: (
+            ball.encounters,
+            ball.mean_catch_rate,
+            ball.min_catch_rate,
+        ),
+        reverse=True,
+    )
+
+
+@metrics.timed('comparison')
+def compare_encounters(
+    encounters: Iterable[Encounter],
+    get_battle_variables: Callable[[int], BattleVariables],
+    game_variables: GameVariables,
+) -> Comparison:
+    """
+    Return every encounter's catch rate table and a ranking across them.
+
+    Each species is loaded once, and encounters sharing a species, level
+    and battle variables are calculated once, all in one vectorized batch.
+    `get_battle_variables` receives each encounter's HP. The ranking puts
+    the balls usable in the most encounters first, then sorts by mean and
+    lowest catch rate. A species listed twice weighs double.
+    """
+    encounters = list(encounters)
+    species = load_species(
+        str(encounter.pokemon).lower() for encounter in encounters
+    )
+
+    cases: dict[tuple[int, int, BattleVariables], CatchCase] = {}
+    case_keys = []
+    for encounter in encounters:
+        pokemon = species[str(encounter.pokemon).lower()]
+        if isinstance(pokemon, PokemonLoadError):
+            raise pokemon
+        pokemon = pokemon.with_level(encounter.level)
+        battle_variables = get_battle_variables(pokemon.min_hp)
+        key = (pokemon.form_id, pokemon.level, battle_variables)
+        if key not in cases:
+            cases[key] = CatchCase(
+                pokemon,
+                pokemon.min_hp,
+                battle_variables,
+                game_variables,
+            )
+        case_keys.append(key)
+
+    results = dict(
+        zip(
+            cases,
+            calculate_catch_rates_batch(list(cases.values())),
+            strict=True,
+        ),
+    )
+    records = {
+        key: rank_catch_rates(
+            CatchRateRecord(
+                poke_ball=scenario.poke_ball,
+                condition=scenario.condition or '',
+                catch_rate=catch_rate,
+                turns=scenario.turns,
+            )
+            for scenario, catch_rate in zip(
+                scenarios,
+                catch_rates.tolist(),
+                strict=True,
+            )
+        )
+        for key, (scenarios, catch_rates) in results.items()
+    }
+    scenario_indexes = {
+        key: np.flatnonzero(get_scenario_mask(case.pokemon)).tolist()
+        for key, case in cases.items()
+    }
+
+    return Comparison(
+        tables=[
+            EncounterTable(encounter, cases[key].pokemon, records[key])
+            for encounter, key in zip(encounters, case_keys, strict=True)
+        ],
+        ranking=_get_ranking(
+            (index, catch_rate)
+            for key in case_keys
+            for index, catch_rate in zip(
+                scenario_indexes[key],
+                results[key][1].tolist(),
+                strict=True,
+            )
+        ),
+    )
@@ -0,0 +1,134 @@
+"""Local SQLite store holding PokéAPI resources for offline lookups."""
+
+import json
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Self, cast
+
+from settings import BASE_API_URL, DATASTORE_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    endpoint TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT,
+    body BLOB NOT NULL,
+    PRIMARY KEY (endpoint, id)
+);
+CREATE INDEX IF NOT EXISTS resources_name ON resources (endpoint, name);
+CREATE TABLE IF NOT EXISTS complete_endpoints (
+    endpoint TEXT PRIMARY KEY
+);
+"""
+
+
+class Datastore:
+    """
+    Resources stored by endpoint and id. The connection is shared between
+    threads, so every use of it holds the lock.
+    """
+
+    def __init__(self, path: Path = DATASTORE_PATH) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+    def put_resource(self, endpoint: str, resource: dict[str, Any]) -> None:
+        body = zlib.compress(json.dumps(resource).encode())
+        with self.lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?)',
+                (endpoint, resource['id'], resource.get('name'), body),
+            )
+
+    def commit(self) -> None:
+        with self.lock:
+            self.connection.commit()
+
+    def set_complete(self, endpoint: str, *, complete: bool) -> None:
+        """Record whether every resource listed for `endpoint` is stored."""
+        query = (
+            'INSERT OR IGNORE INTO complete_endpoints VALUES (?)'
+            if complete
+            else 'DELETE FROM complete_endpoints WHERE endpoint = ?'
+        )
+        with self.lock:
+            self.connection.execute(query, (endpoint,))
+            self.connection.commit()
+
+    def is_complete(self, endpoint: str) -> bool:
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT 1 FROM complete_endpoints WHERE endpoint = ?',
+                (endpoint,),
+            ).fetchone()
+        return row is not None
+
+    def get_resource(
+        self,
+        endpoint: str,
+        resource: int | str,
+    ) -> dict[str, Any] | None:
+        key = str(resource).lower()
+        query = (
+            'SELECT body FROM resources WHERE endpoint = ? AND id = ?'
+            if key.isdigit()
+            else 'SELECT body FROM resources WHERE endpoint = ? AND name = ?'
+        )
+        with self.lock:
+            row = self.connection.execute(
+                query,
+                (endpoint, int(key) if key.isdigit() else key),
+            ).fetchone()
+        if row is None:
+            return None
+        return cast(dict[str, Any], json.loads(zlib.decompress(row[0])))
+
+    def get_endpoint(self, endpoint: str) -> list[dict[str, str]]:
+        """List the endpoint's resources, or nothing until fully ingested."""
+        if not self.is_complete(endpoint):
+            return []
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT id, name FROM resources WHERE endpoint = ? '
+                'ORDER BY id',
+                (endpoint,),
+            ).fetchall()
+        return [
+            {'name': name, 'url': f'{BASE_API_URL}{endpoint}/{id_}/'}
+            for id_, name in rows
+        ]
+
+    def get_resource_ids(self, endpoint: str) -> set[int]:
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT id FROM resources WHERE endpoint = ?',
+                (endpoint,),
+            ).fetchall()
+        return {id_ for (id_,) in rows}
+
+
+_datastore: Datastore | None = None
+_datastore_lock = threading.Lock()
+
+
+def get_datastore() -> Datastore | None:
+    """Return the shared datastore, or None if it has not been ingested."""
+    global _datastore  # noqa: PLW0603
+    with _datastore_lock:
+        if _datastore is None and DATASTORE_PATH.exists():
+            _datastore = Datastore(DATASTORE_PATH)
+    return _datastore
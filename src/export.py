@@ -0,0 +1,289 @@
+"""Export the catch table of every Pokémon, level and condition.
+
+Usage: python -m src.export [--output DIR] [--workers N] [grid options]
+
+Work is split into chunks of dex numbers, each written to its own part file.
+Part files are only renamed into place once complete, so re-running the
+command after a crash resumes from the first missing chunk.
+"""
+
+import argparse
+import csv
+import itertools
+import logging
+import math
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from models.pokemon import Pokemon, PokemonStatus
+from settings import CURRENT_LAST_DEX_NUMBER, DATA_DIR, POKEMON_LEVEL_CAP
+from src.calc import BattleVariables, GameVariables
+from src.loader import fetch_pokemon
+from src.vectorized import calculate_catch_rates_array
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    'dex_no',
+    'name',
+    'level',
+    'hp',
+    'current_hp',
+    'status',
+    'backstrike',
+    'catching_power_level',
+    'badges',
+    'registered_pokemon',
+    'catching_charm',
+    'poke_ball',
+    'condition',
+    'catch_rate',
+)
+STATUS_CHOICES = [
+    'none',
+    *(name.lower() for name in PokemonStatus.__members__),
+]
+
+
+@dataclass(frozen=True)
+class ExportGrid:
+    levels: Sequence[int]
+    hp_fractions: Sequence[float]
+    statuses: Sequence[str]
+    backstrikes: Sequence[bool]
+    catching_power_levels: Sequence[int]
+    badges: Sequence[int]
+    registered_pokemon: Sequence[int]
+    catching_charms: Sequence[bool]
+
+    def get_game_variables(self) -> list[GameVariables]:
+        return [
+            GameVariables(*values)
+            for values in itertools.product(
+                self.badges,
+                self.registered_pokemon,
+                self.catching_charms,
+            )
+        ]
+
+    def get_battle_variables(self, hp: int) -> list[BattleVariables]:
+        """Return the battle conditions for a Pokémon with `hp` max HP."""
+        return [
+            BattleVariables(
+                target_current_hp=max(1, math.floor(hp_fraction * hp)),
+                target_status=(
+                    None if status == 'none' else PokemonStatus[status.upper()]
+                ),
+                backstrike=backstrike,
+                catching_power_level=catching_power_level,
+            )
+            for hp_fraction, status, backstrike, catching_power_level in (
+                itertools.product(
+                    self.hp_fractions,
+                    self.statuses,
+                    self.backstrikes,
+                    self.catching_power_levels,
+                )
+            )
+        ]
+
+
+def get_rows(pokemon: Pokemon, grid: ExportGrid) -> Iterator[list[Any]]:
+    for level in grid.levels:
+        leveled_pokemon = pokemon.with_level(level)
+        hp = leveled_pokemon.min_hp
+        for game_variables, battle_variables in itertools.product(
+            grid.get_game_variables(),
+            grid.get_battle_variables(hp),
+        ):
+            scenarios, catch_rates = calculate_catch_rates_array(
+                leveled_pokemon,
+                hp,
+                battle_variables,
+                game_variables,
+            )
+            status = battle_variables.target_status
+            for scenario, catch_rate in zip(
+                scenarios,
+                catch_rates.tolist(),
+                strict=True,
+            ):
+                yield [
+                    pokemon.dex_no,
+                    pokemon.name,
+                    level,
+                    hp,
+                    battle_variables.target_current_hp,
+                    status.name.lower() if status else 'none',
+                    battle_variables.backstrike,
+                    battle_variables.catching_power_level,
+                    game_variables.badges,
+                    game_variables.registered_pokemon,
+                    game_variables.catching_charm,
+                    scenario.poke_ball.value,
+                    scenario.condition or '',
+                    catch_rate,
+                ]
+
+
+def _write_csv(path: Path, rows: Iterator[list[Any]]) -> None:
+    with path.open('w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+
+
+def _write_parquet(path: Path, rows: Iterator[list[Any]]) -> None:
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    columns = list(zip(*rows, strict=True)) or [()] * len(COLUMNS)
+    pq.write_table(
+        pa.table(dict(zip(COLUMNS, columns, strict=True))),
+        path,
+    )
+
+
+WRITERS = {'csv': _write_csv, 'parquet': _write_parquet}
+
+
+def get_part_path(output: Path, dex_numbers: Sequence[int], fmt: str) -> Path:
+    return output / f'part-{dex_numbers[0]:04d}-{dex_numbers[-1]:04d}.{fmt}'
+
+
+def export_chunk(
+    dex_numbers: Sequence[int],
+    grid: ExportGrid,
+    output: Path,
+    fmt: str,
+) -> Path:
+    path = get_part_path(output, dex_numbers, fmt)
+    temporary_path = path.with_suffix('.tmp')
+    rows = itertools.chain.from_iterable(
+        get_rows(fetch_pokemon(dex_no), grid) for dex_no in dex_numbers
+    )
+    WRITERS[fmt](temporary_path, rows)
+    temporary_path.replace(path)
+    return path
+
+
+def export(  # noqa: PLR0913
+    grid: ExportGrid,
+    output: Path,
+    *,
+    fmt: str = 'csv',
+    chunk_size: int = 25,
+    workers: int | None = None,
+    last_dex_number: int = CURRENT_LAST_DEX_NUMBER,
+) -> None:
+    output.mkdir(parents=True, exist_ok=True)
+    dex_numbers = range(1, last_dex_number + 1)
+    chunks = [
+        dex_numbers[start : start + chunk_size]
+        for start in range(0, len(dex_numbers), chunk_size)
+    ]
+    pending = [
+        chunk
+        for chunk in chunks
+        if not get_part_path(output, chunk, fmt).exists()
+    ]
+    logger.info(
+        '%d of %d chunks already exported',
+        len(chunks) - len(pending),
+        len(chunks),
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(export_chunk, chunk, grid, output, fmt)
+            for chunk in pending
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            logger.info('%d/%d %s', done, len(futures), future.result())
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in {'1', 'true', 'yes'}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--output', type=Path, default=DATA_DIR / 'export')
+    parser.add_argument('--format', choices=WRITERS, default='csv')
+    parser.add_argument('--chunk-size', type=int, default=25)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument(
+        '--last-dex-number',
+        type=int,
+        default=CURRENT_LAST_DEX_NUMBER,
+    )
+    parser.add_argument('--min-level', type=int, default=1)
+    parser.add_argument('--max-level', type=int, default=POKEMON_LEVEL_CAP)
+    parser.add_argument(
+        '--hp-fractions',
+        type=float,
+        nargs='+',
+        default=[1.0],
+        help='current HP as a fraction of max HP, 0 meaning exactly 1 HP',
+    )
+    parser.add_argument(
+        '--statuses',
+        nargs='+',
+        choices=STATUS_CHOICES,
+        default=['none'],
+    )
+    parser.add_argument(
+        '--backstrike',
+        type=_parse_bool,
+        nargs='+',
+        default=[False],
+    )
+    parser.add_argument(
+        '--catching-power-levels',
+        type=int,
+        nargs='+',
+        default=[0],
+    )
+    parser.add_argument('--badges', type=int, nargs='+', default=[8])
+    parser.add_argument(
+        '--registered-pokemon',
+        type=int,
+        nargs='+',
+        default=[843],
+    )
+    parser.add_argument(
+        '--catching-charm',
+        type=_parse_bool,
+        nargs='+',
+        default=[False],
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    export(
+        ExportGrid(
+            levels=range(args.min_level, args.max_level + 1),
+            hp_fractions=args.hp_fractions,
+            statuses=args.statuses,
+            backstrikes=args.backstrike,
+            catching_power_levels=args.catching_power_levels,
+            badges=args.badges,
+            registered_pokemon=args.registered_pokemon,
+            catching_charms=args.catching_charm,
+        ),
+        args.output,
+        fmt=args.format,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        last_dex_number=args.last_dex_number,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,554 @@
+"""Integer-only implementation of the catch rate formula.
+
+Usage: python -m src.fixed_point [--step N]
+
+The float path in src/calc.py rounds the badge and capture value
+coefficient modifiers, the intermediate divisions and the shake value's
+16th root to binary floating point. Here every step is exact: the two
+modifiers are integer ratios from src/modifiers.py, each rounding is an
+integer floor division, the shake value is looked up among exact integer
+thresholds and the capture probability is an integer numerator over
+CAPTURE_PROBABILITY_SCALE, rounded to a float once. Modified catch rates
+are computed on int64 arrays, every intermediate staying below 2 ** 53.
+
+The command compares the modified catch rates with the float path for
+every level, badge count, status, catching power level, backstrike,
+catalogue catch rate and species modifier, the target having the lowest or
+highest HP of its level and being on full or 1 HP, and reports where they
+diverge. The float path sometimes floors a quotient landing just below an
+integer, like 197868.99999999997. It then compares the critical catch
+values, shake values and capture probabilities for every modified catch
+rate.
+"""
+
+import argparse
+import array
+import bisect
+import itertools
+import math
+from collections.abc import Callable, Sequence
+from functools import cache, lru_cache
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from models.catch_scenario import CatchScenario
+from models.pokemon import Pokemon, PokemonStatus
+from settings import (
+    BADGE_THRESHOLDS,
+    CATCHING_POWER_MODIFIERS,
+    CONSTANT_MODIFIERS_CACHE_SIZE,
+    LOW_LEVEL_BONUS_THRESHOLD,
+    MAX_IV,
+    POKEMON_LEVEL_CAP,
+)
+from src import modifiers
+from src.calc import (
+    BattleVariables,
+    GameVariables,
+    calculate_critical_catch_value,
+    calculate_overall_catch_rate,
+    calculate_shake_value,
+)
+from src.lookup import BRACKET_REGISTERED_POKEMON, MAX_MODIFIED_CATCH_RATE
+from src.scenarios import (
+    SCENARIO_BALL_IDS,
+    get_catch_scenario,
+    get_scenario_catch_rates,
+    get_scenario_mask,
+)
+from src.vectorized import (
+    calculate_modified_catch_rates_array,
+    get_ball_species_modifiers,
+)
+
+# 256 critical catch odds times 65536 ** 4 shake odds.
+CAPTURE_PROBABILITY_BITS = 72
+CAPTURE_PROBABILITY_SCALE = 2**CAPTURE_PROBABILITY_BITS
+MAX_SHAKE_VALUE = 65536
+SHAKE_VALUE_DIVISOR = (255 * 4096) ** 3
+MAX_BASE_HP = 255
+MAX_SPECIES_MODIFIER = 255 + max(modifiers.HEAVY_BALL_TABLE.values)
+MAX_DIVERGENCE_EXAMPLES = 5
+
+ExactModifierArrays = tuple[ArrayLike, ArrayLike]
+
+
+def make_modified_catch_rate_calculator(  # noqa: PLR0913
+    hp: ArrayLike,
+    current_hp: ArrayLike,
+    level: ArrayLike,
+    dark_grass_modifier: ArrayLike,
+    badge_modifier: ExactModifierArrays,
+    status_modifier: ArrayLike,
+    cvc_modifier: ExactModifierArrays,
+) -> Callable[[ArrayLike], NDArray[np.int64]]:
+    """
+    Return the modified catch rates as a function of the scenarios' catch
+    rates times their species modifiers, the only inputs varying per
+    scenario. Every input broadcasts, the badge and capture value
+    coefficient modifiers being given as their numerators and denominators.
+    """
+    hp = np.asarray(hp, dtype=np.int64)
+    level = np.asarray(level, dtype=np.int64)
+    badge_numerator, badge_denominator = np.asarray(
+        badge_modifier,
+        dtype=np.int64,
+    )
+    cvc_numerator, cvc_denominator = np.asarray(cvc_modifier, dtype=np.int64)
+
+    a = (3 * hp - 2 * np.asarray(current_hp, dtype=np.int64)) * 4096
+    b = (np.asarray(dark_grass_modifier, dtype=np.int64) * a + 2048) >> 12
+    # x * numerator / denominator rounds half up to
+    # (2 * numerator * x + denominator) // (2 * denominator).
+    badge_numerator = 2 * badge_numerator
+    badge_divisor = 2 * badge_denominator
+    # e is kept as a fraction over 3 * hp, and so is f unless the low level
+    # bonus rounds it down to an integer.
+    has_low_level_bonus = level <= LOW_LEVEL_BONUS_THRESHOLD
+    f_multiplier = np.where(has_low_level_bonus, 36 - 2 * level, 1)
+    f_divisor = np.where(has_low_level_bonus, 30 * hp, 1)
+    f_denominator = np.where(has_low_level_bonus, 1, 3 * hp)
+    status_numerator = 2 * np.asarray(status_modifier, dtype=np.int64)
+    status_offset = 4096 * f_denominator
+    status_divisor = 2 * status_offset
+    cvc_numerator = 2 * cvc_numerator
+    cvc_divisor = 2 * cvc_denominator
+
+    def _calculate(catch_rates: ArrayLike) -> NDArray[np.int64]:
+        d = (np.asarray(catch_rates, dtype=np.int64) * b + 2048) >> 12
+        e_numerator = (
+            badge_numerator * d + badge_denominator
+        ) // badge_divisor
+        f_numerator = f_multiplier * e_numerator // f_divisor
+        g = (status_numerator * f_numerator + status_offset) // status_divisor
+        modified_catch_rates: NDArray[np.int64] = np.minimum(
+            (cvc_numerator * g + cvc_denominator) // cvc_divisor,
+            MAX_MODIFIED_CATCH_RATE,
+        )
+        return modified_catch_rates
+
+    return _calculate
+
+
+@lru_cache(maxsize=CONSTANT_MODIFIERS_CACHE_SIZE)
+def get_modified_catch_rate_calculator(  # noqa: PLR0913
+    hp: int,
+    current_hp: int,
+    level: int,
+    dark_grass_modifier: int,
+    badge_modifier: modifiers.ExactModifier,
+    status_modifier: int,
+    cvc_modifier: modifiers.ExactModifier,
+) -> Callable[[ArrayLike], NDArray[np.int64]]:
+    """Return make_modified_catch_rate_calculator, cached for one target."""
+    return make_modified_catch_rate_calculator(
+        hp,
+        current_hp,
+        level,
+        dark_grass_modifier,
+        badge_modifier,
+        status_modifier,
+        cvc_modifier,
+    )
+
+
+def calculate_modified_catch_rate_exact(  # noqa: PLR0913
+    scenario_catch_rate: int,
+    species_modifier: int,
+    hp: int,
+    current_hp: int,
+    level: int,
+    dark_grass_modifier: int,
+    badge_modifier: modifiers.ExactModifier,
+    status_modifier: int,
+    cvc_modifier: modifiers.ExactModifier,
+) -> int:
+    """Return the modified catch rate using integer arithmetic only."""
+    return int(
+        get_modified_catch_rate_calculator(
+            hp,
+            current_hp,
+            level,
+            dark_grass_modifier,
+            badge_modifier,
+            status_modifier,
+            cvc_modifier,
+        )(scenario_catch_rate * species_modifier),
+    )
+
+
+def calculate_modified_catch_rates_exact(
+    pokemon: Pokemon,
+    hp: int,
+    battle_variables: BattleVariables,
+    game_variables: GameVariables,
+) -> list[tuple[CatchScenario, int]]:
+    """Exact counterpart of calculate_modified_catch_rates."""
+    indexes = np.flatnonzero(get_scenario_mask(pokemon)).tolist()
+    scenarios = [get_catch_scenario(index, pokemon.level) for index in indexes]
+    calculate = get_modified_catch_rate_calculator(
+        hp,
+        battle_variables.target_current_hp,
+        pokemon.level,
+        modifiers.get_dark_grass_modifier(game_variables.registered_pokemon),
+        modifiers.get_exact_badge_modifier(
+            game_variables.badges,
+            pokemon.level,
+        ),
+        modifiers.get_status_modifier(battle_variables.target_status),
+        modifiers.get_exact_capture_value_coefficient_modifier(
+            battle_variables.catching_power_level,
+            backstrike=battle_variables.backstrike,
+        ),
+    )
+    modified_catch_rates = calculate(
+        np.array([scenario.catch_rate for scenario in scenarios])
+        * get_ball_species_modifiers(pokemon.catch_rate, pokemon.weight)[
+            SCENARIO_BALL_IDS[indexes]
+        ],
+    )
+    return list(zip(scenarios, modified_catch_rates.tolist(), strict=True))
+
+
+def calculate_critical_catch_value_exact(
+    modified_catch_rate: int,
+    critical_catch_modifier: int,
+    *,
+    catching_charm: bool,
+) -> int:
+    return (
+        ((critical_catch_modifier * modified_catch_rate + 2048) >> 12)
+        * (2 if catching_charm else 1)
+        * 715827883
+    ) >> 44
+
+
+@cache
+def get_shake_value_thresholds() -> list[int]:
+    """
+    Return the lowest modified catch rate reaching each shake value.
+
+    A rate reaches shake value s when s <= 65536 * (rate / (255 * 4096)) **
+    (3/16), that is when rate ** 3 * 2 ** 256 >= s ** 16 * (255 * 4096) ** 3,
+    so each threshold is an integer cube root.
+    """
+    thresholds = []
+    for shake_value in range(MAX_SHAKE_VALUE + 1):
+        # Ceiling division by 2 ** 256.
+        min_cube = -(-(shake_value**16) * SHAKE_VALUE_DIVISOR >> 256)
+        threshold = round(min_cube ** (1 / 3))
+        while threshold**3 < min_cube:
+            threshold += 1
+        while threshold > 0 and (threshold - 1) ** 3 >= min_cube:
+            threshold -= 1
+        thresholds.append(threshold)
+    return thresholds
+
+
+def calculate_shake_value_exact(modified_catch_rate: int) -> int:
+    """Return value used to evaluate whether a shake is successful."""
+    if modified_catch_rate <= 0:
+        return 0
+    return (
+        bisect.bisect_right(get_shake_value_thresholds(), modified_catch_rate)
+        - 1
+    )
+
+
+@cache
+def get_shake_values() -> Sequence[int]:
+    """Return the shake value of every modified catch rate, from 0 up."""
+    shake_values = (
+        np.searchsorted(
+            get_shake_value_thresholds(),
+            np.arange(MAX_MODIFIED_CATCH_RATE + 1),
+            side='right',
+        )
+        - 1
+    )
+    shake_values[0] = 0
+    return array.array('i', shake_values.astype(np.int32).tobytes())
+
+
+@cache
+def get_shake_value_fourth_powers() -> list[int]:
+    return [shake_value**4 for shake_value in range(MAX_SHAKE_VALUE + 1)]
+
+
+def calculate_capture_probability_numerator(
+    modified_catch_rate: int,
+    critical_catch_modifier: int,
+    *,
+    catching_charm: bool,
+) -> int:
+    """Return the capture probability times CAPTURE_PROBABILITY_SCALE."""
+    ccv = calculate_critical_catch_value_exact(
+        modified_catch_rate,
+        critical_catch_modifier,
+        catching_charm=catching_charm,
+    )
+    shake_value = calculate_shake_value_exact(modified_catch_rate)
+    return ccv * shake_value * 2**48 + (256 - ccv) * shake_value**4
+
+
+@lru_cache(maxsize=CONSTANT_MODIFIERS_CACHE_SIZE)
+def get_overall_catch_rate_calculator(
+    registered_pokemon: int,
+    catching_charm_modifier: int,
+) -> Callable[[int], float]:
+    """
+    Return calculate_overall_catch_rate_exact as a function of the modified
+    catch rate, from 0 to MAX_MODIFIED_CATCH_RATE. The catching charm
+    modifier is 2 with the Catching Charm, 1 otherwise.
+    """
+    critical_catch_modifier = modifiers.get_critical_catch_modifier(
+        registered_pokemon,
+    )
+    critical_catch_multiplier = catching_charm_modifier * 715827883
+    shake_values = get_shake_values()
+    fourth_powers = get_shake_value_fourth_powers()
+
+    # calculate_capture_probability_numerator, inlined with both tables as
+    # this runs once per catch rate.
+    def _calculate(modified_catch_rate: int) -> float:
+        ccv = (
+            ((critical_catch_modifier * modified_catch_rate + 2048) >> 12)
+            * critical_catch_multiplier
+        ) >> 44
+        shake_value = shake_values[modified_catch_rate]
+        return math.ldexp(
+            (ccv * shake_value << 48)
+            + (256 - ccv) * fourth_powers[shake_value],
+            -CAPTURE_PROBABILITY_BITS,
+        )
+
+    return _calculate
+
+
+def calculate_overall_catch_rate_exact(
+    modified_catch_rate: int,
+    registered_pokemon: int = 843,
+    *,
+    catching_charm: bool = True,
+) -> float:
+    """Exact counterpart of calculate_overall_catch_rate, rounded once."""
+    return get_overall_catch_rate_calculator(
+        registered_pokemon,
+        2 if catching_charm else 1,
+    )(modified_catch_rate)
+
+
+def get_hp_cases(level: int) -> list[tuple[int, int]]:
+    """Return the lowest and highest HP at `level`, each full and at 1 HP."""
+    hps = [
+        math.floor((2 * base_hp + iv) * level / 100) + level + 10
+        for base_hp, iv in ((1, 0), (MAX_BASE_HP, MAX_IV))
+    ]
+    return [(hp, current_hp) for hp in hps for current_hp in (hp, 1)]
+
+
+def compare_modified_catch_rates(
+    level: int,
+    species_modifiers: NDArray[np.int64],
+) -> tuple[int, list[str]]:
+    """
+    Compare the exact and float modified catch rates at `level`, returning
+    how many were compared and a description of each divergence.
+    """
+    # Past the Nest Ball levels its catalogue catch rate goes negative, for
+    # a scenario that cannot happen.
+    catch_rates = np.unique(get_scenario_catch_rates(level))
+    catch_rates = catch_rates[catch_rates > 0]
+    # Badges past the ones the level requires change nothing.
+    badge_counts = range(bisect.bisect_left(BADGE_THRESHOLDS, level) + 1)
+    status_modifiers = sorted(
+        {
+            modifiers.get_status_modifier(status)
+            for status in [None, *PokemonStatus]
+        },
+    )
+    cvc_cases = list(
+        itertools.product(CATCHING_POWER_MODIFIERS, (False, True)),
+    )
+    dark_grass_modifiers = sorted(
+        {
+            modifiers.get_dark_grass_modifier(registered_pokemon)
+            for registered_pokemon in BRACKET_REGISTERED_POKEMON
+        },
+    )
+
+    badge_modifiers = np.array(
+        [
+            modifiers.get_badge_modifier(badges, level)
+            for badges in badge_counts
+        ],
+    )
+    exact_badge_modifiers = np.array(
+        [
+            modifiers.get_exact_badge_modifier(badges, level)
+            for badges in badge_counts
+        ],
+    )
+    cvc_modifiers = np.array(
+        [
+            modifiers.get_capture_value_coefficient_modifier(
+                catching_power_level,
+                backstrike=backstrike,
+            )
+            for catching_power_level, backstrike in cvc_cases
+        ],
+    )
+    exact_cvc_modifiers = np.array(
+        [
+            modifiers.get_exact_capture_value_coefficient_modifier(
+                catching_power_level,
+                backstrike=backstrike,
+            )
+            for catching_power_level, backstrike in cvc_cases
+        ],
+    )
+    badges, status_modifier, cvc_case, catch_rate, species_modifier = (
+        np.meshgrid(
+            badge_counts,
+            status_modifiers,
+            range(len(cvc_cases)),
+            catch_rates,
+            species_modifiers,
+            indexing='ij',
+            sparse=True,
+        )
+    )
+
+    compared = 0
+    divergences = []
+    for dark_grass_modifier, (hp, current_hp) in itertools.product(
+        dark_grass_modifiers,
+        get_hp_cases(level),
+    ):
+        float_rates = calculate_modified_catch_rates_array(
+            catch_rate,
+            species_modifier,
+            hp,
+            current_hp,
+            level,
+            dark_grass_modifier,
+            badge_modifiers[badges],
+            status_modifier,
+            cvc_modifiers[cvc_case],
+        )
+        exact_rates = make_modified_catch_rate_calculator(
+            hp,
+            current_hp,
+            level,
+            dark_grass_modifier,
+            (
+                exact_badge_modifiers[badges, 0],
+                exact_badge_modifiers[badges, 1],
+            ),
+            status_modifier,
+            (
+                exact_cvc_modifiers[cvc_case, 0],
+                exact_cvc_modifiers[cvc_case, 1],
+            ),
+        )(catch_rate * species_modifier)
+        compared += exact_rates.size
+        for index in np.argwhere(float_rates != exact_rates).tolist():
+            catching_power_level, backstrike = cvc_cases[index[2]]
+            divergences.append(
+                f'{level=} {hp=} {current_hp=} '
+                f'{dark_grass_modifier=} badges={badge_counts[index[0]]} '
+                f'status_modifier={status_modifiers[index[1]]} '
+                f'{catching_power_level=} {backstrike=} '
+                f'catch_rate={catch_rates[index[3]]} '
+                f'species_modifier={species_modifiers[index[4]]}: '
+                f'float {float_rates[tuple(index)]}, '
+                f'exact {exact_rates[tuple(index)]}',
+            )
+    return compared, divergences
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--step',
+        type=int,
+        default=1,
+        help=(
+            'check every Nth species modifier and modified catch rate '
+            '(default: %(default)s)'
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    species_modifiers = np.arange(1, MAX_SPECIES_MODIFIER + 1, args.step)
+    compared = 0
+    divergences = []
+    for level in range(1, POKEMON_LEVEL_CAP + 1):
+        level_compared, level_divergences = compare_modified_catch_rates(
+            level,
+            species_modifiers,
+        )
+        compared += level_compared
+        divergences += level_divergences
+    print(  # noqa: T201
+        f'modified catch rates: {len(divergences)} divergences in '
+        f'{compared} combinations',
+    )
+    for divergence in divergences[:MAX_DIVERGENCE_EXAMPLES]:
+        print(f'  {divergence}')  # noqa: T201
+
+    modified_catch_rates = range(1, MAX_MODIFIED_CATCH_RATE + 1, args.step)
+    shake_value_mismatches = sum(
+        calculate_shake_value_exact(modified_catch_rate)
+        != calculate_shake_value(modified_catch_rate)
+        for modified_catch_rate in modified_catch_rates
+    )
+    print(f'shake values: {shake_value_mismatches} mismatches')  # noqa: T201
+
+    for registered_pokemon in BRACKET_REGISTERED_POKEMON:
+        critical_catch_modifier = modifiers.get_critical_catch_modifier(
+            registered_pokemon,
+        )
+        for catching_charm in (False, True):
+            critical_catch_value_mismatches = 0
+            max_ulps = 0.0
+            for modified_catch_rate in modified_catch_rates:
+                critical_catch_value_mismatches += (
+                    calculate_critical_catch_value_exact(
+                        modified_catch_rate,
+                        critical_catch_modifier,
+                        catching_charm=catching_charm,
+                    )
+                    != calculate_critical_catch_value(
+                        modified_catch_rate,
+                        registered_pokemon,
+                        catching_charm=catching_charm,
+                    )
+                )
+                exact_catch_rate = calculate_overall_catch_rate_exact(
+                    modified_catch_rate,
+                    registered_pokemon,
+                    catching_charm=catching_charm,
+                )
+                max_ulps = max(
+                    max_ulps,
+                    abs(
+                        exact_catch_rate
+                        - calculate_overall_catch_rate(
+                            modified_catch_rate,
+                            registered_pokemon,
+                            catching_charm=catching_charm,
+                        ),
+                    )
+                    / math.ulp(exact_catch_rate),
+                )
+            print(  # noqa: T201
+                f'{registered_pokemon=} {catching_charm=}: '
+                f'{critical_catch_value_mismatches} critical catch value '
+                f'mismatches, catch rates within {max_ulps:g} ulps',
+            )
+
+
+if __name__ == '__main__':
+    main()
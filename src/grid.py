@@ -0,0 +1,126 @@
+"""Catch rates of one Pokémon across every level and current HP at once."""
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from models.pokemon import Pokemon
+from settings import POKEMON_LEVEL_CAP
+from src import metrics, modifiers
+from src.calc import BattleVariables, GameVariables
+from src.scenarios import (
+    HIDDEN_SCENARIOS,
+    SCENARIO_BALL_IDS,
+    get_scenario_catch_rates,
+    get_scenario_mask,
+)
+from src.vectorized import (
+    calculate_modified_catch_rates_array,
+    calculate_overall_catch_rates_array,
+    get_ball_species_modifiers,
+)
+
+LEVELS = np.arange(1, POKEMON_LEVEL_CAP + 1)
+
+
+class CatchRateGrid(NamedTuple):
+    """Capture probabilities indexed by [scenario, level, current HP - 1]."""
+
+    scenario_indexes: NDArray[np.int64]
+    levels: NDArray[np.int64]
+    hps: NDArray[np.int64]
+    current_hps: NDArray[np.int64]
+    catch_rates: NDArray[np.float64]
+
+
+@metrics.timed('catch_rate_grid')
+def calculate_catch_rate_grid(
+    pokemon: Pokemon,
+    battle_variables: BattleVariables,
+    game_variables: GameVariables,
+) -> CatchRateGrid:
+    """
+    Return the catch rates of every scenario, level and current HP.
+
+    The target's current HP in `battle_variables` is ignored, as every value
+    from 1 to the HP at each level is covered. Cells past that HP, or of
+    scenarios impossible at that level, are NaN. Timer Ball rows without a
+    turn count are left out, as in the catch rate table.
+    """
+    hps = np.array(
+        [pokemon.with_level(level).min_hp for level in LEVELS.tolist()],
+    )
+    current_hps = np.arange(1, hps.max() + 1)
+    scenario_masks = np.array(
+        [get_scenario_mask(pokemon, level) for level in LEVELS.tolist()],
+    ).T
+    scenario_masks[HIDDEN_SCENARIOS] = False
+    scenario_indexes = np.flatnonzero(scenario_masks.any(axis=1))
+    scenario_masks = scenario_masks[scenario_indexes]
+
+    # The formula only depends on the product of the scenario's catch rate
+    # and the species modifier, which many scenarios share, so each distinct
+    # row of products is calculated once. Impossible scenarios, like the
+    # Nest Ball past its level range, get a zero catch rate.
+    rate_products = np.where(
+        scenario_masks,
+        get_scenario_catch_rates(LEVELS)[:, scenario_indexes].T
+        * get_ball_species_modifiers(pokemon.catch_rate, pokemon.weight)[
+            SCENARIO_BALL_IDS[scenario_indexes],
+            np.newaxis,
+        ],
+        0,
+    )
+    unique_rate_products, inverse = np.unique(
+        rate_products,
+        axis=0,
+        return_inverse=True,
+    )
+
+    # Axes: distinct scenario, level, current HP.
+    level_axis = (np.newaxis, slice(None), np.newaxis)
+    modified_catch_rates = calculate_modified_catch_rates_array(
+        scenario_catch_rates=unique_rate_products[..., np.newaxis],
+        species_modifiers=1,
+        hp=hps[level_axis],
+        # Cells past the HP at their level are masked out below.
+        current_hp=np.minimum(current_hps, hps[level_axis]),
+        level=LEVELS[level_axis],
+        dark_grass_modifier=modifiers.get_dark_grass_modifier(
+            game_variables.registered_pokemon,
+        ),
+        badge_modifier=modifiers.get_badge_modifier_array(
+            game_variables.badges,
+            LEVELS[level_axis],
+        ),
+        status_modifier=modifiers.get_status_modifier(
+            battle_variables.target_status,
+        ),
+        cvc_modifier=modifiers.get_capture_value_coefficient_modifier(
+            battle_variables.catching_power_level,
+            backstrike=battle_variables.backstrike,
+        ),
+    )
+    catch_rates = calculate_overall_catch_rates_array(
+        modified_catch_rates,
+        modifiers.get_critical_catch_modifier(
+            game_variables.registered_pokemon,
+        ),
+        game_variables.catching_charm,
+    )
+
+    is_possible = scenario_masks[..., np.newaxis] & (
+        current_hps <= hps[:, np.newaxis]
+    )
+    return CatchRateGrid(
+        scenario_indexes=scenario_indexes,
+        levels=LEVELS,
+        hps=hps,
+        current_hps=current_hps,
+        catch_rates=np.where(
+            is_possible,
+            catch_rates[inverse.reshape(-1)],
+            np.nan,
+        ),
+    )
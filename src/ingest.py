@@ -0,0 +1,134 @@
+"""Download PokéAPI resources into the local datastore.
+
+Usage: python -m src.ingest [endpoint ...] [--base-url URL] [--rate N]
+                            [--concurrency N] [--retries N] [--timeout S]
+                            [--datastore PATH]
+
+Resources are fetched concurrently but within a request rate, and failed
+requests are retried with backoff. Resources that still fail are skipped;
+re-running the command fetches whatever is missing. An endpoint is marked
+complete once all of its listed resources are stored.
+"""
+
+import argparse
+import functools
+import logging
+from pathlib import Path
+from typing import Any, cast
+
+from settings import (
+    BASE_API_URL,
+    DATASTORE_PATH,
+    INGEST_RATE_LIMIT,
+    INGEST_RETRIES,
+    INGEST_TIMEOUT,
+    INGESTED_ENDPOINTS,
+    MAX_FETCH_WORKERS,
+)
+from src.api import PAYLOAD
+from src.client import EndpointPolicy, PokeAPIClient
+from src.datastore import Datastore
+from src.scheduler import FetchScheduler
+
+logger = logging.getLogger(__name__)
+
+COMMIT_EVERY = 100
+
+
+def get_resource_id(url: str) -> int:
+    return int(url.rstrip('/').rsplit('/', 1)[-1])
+
+
+def fetch_resource(client: PokeAPIClient, url: str) -> dict[str, Any]:
+    endpoint = url.rstrip('/').rsplit('/', 2)[-2]
+    return cast(dict[str, Any], client.get_json(url, endpoint=endpoint))
+
+
+def ingest_endpoint(
+    datastore: Datastore,
+    endpoint: str,
+    client: PokeAPIClient,
+    scheduler: FetchScheduler[Any],
+) -> int:
+    stored_ids = datastore.get_resource_ids(endpoint)
+    listing = client.get_json(client.get_pages()[endpoint], PAYLOAD, endpoint)
+    urls = [
+        entry['url']
+        for entry in cast(list[dict[str, str]], listing['results'])
+        if get_resource_id(entry['url']) not in stored_ids
+    ]
+
+    ingested = 0
+    for url, future in scheduler.fetch_all(urls):
+        if (error := future.exception()) is not None:
+            logger.warning('%s: %s', url, error)
+            continue
+
+        datastore.put_resource(endpoint, future.result())
+        ingested += 1
+        if ingested % COMMIT_EVERY == 0:
+            datastore.commit()
+
+    datastore.commit()
+    failed = len(urls) - ingested
+    if failed:
+        logger.warning('%s: %d resources failed', endpoint, failed)
+    # Until then the endpoint's listing is read from PokéAPI.
+    datastore.set_complete(endpoint, complete=not failed)
+    return ingested
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        'endpoints',
+        nargs='*',
+        default=INGESTED_ENDPOINTS,
+        help='PokéAPI endpoints to ingest (default: %(default)s)',
+    )
+    parser.add_argument('--base-url', default=BASE_API_URL)
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=INGEST_RATE_LIMIT,
+        help='requests per second (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=MAX_FETCH_WORKERS,
+    )
+    parser.add_argument('--retries', type=int, default=INGEST_RETRIES)
+    parser.add_argument('--timeout', type=float, default=INGEST_TIMEOUT)
+    parser.add_argument('--datastore', type=Path, default=DATASTORE_PATH)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    # The scheduler retries, so the client's own retries are disabled, and
+    # pages go straight to the datastore, so the client does not cache them.
+    policy = EndpointPolicy(timeout=args.timeout, retries=0)
+    client = PokeAPIClient(
+        args.base_url,
+        policies=dict.fromkeys(('', *args.endpoints), policy),
+        pool_maxsize=args.concurrency,
+        cache_maxsize=0,
+    )
+
+    args.datastore.parent.mkdir(parents=True, exist_ok=True)
+    with (
+        Datastore(args.datastore) as datastore,
+        FetchScheduler(
+            functools.partial(fetch_resource, client),
+            max_concurrency=args.concurrency,
+            rate=args.rate,
+            retries=args.retries,
+        ) as scheduler,
+    ):
+        for endpoint in args.endpoints:
+            ingested = ingest_endpoint(datastore, endpoint, client, scheduler)
+            logger.info('%s: %d new resources ingested', endpoint, ingested)
+        logger.info('%s', scheduler.progress)
+
+
+if __name__ == '__main__':
+    main()
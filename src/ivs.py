@@ -0,0 +1,55 @@
+"""Catch rates over every HP IV, not only the lowest one."""
+
+from collections.abc import Callable
+
+import numpy as np
+
+from models.catch_rate_record import IVCatchRateRecord
+from models.pokemon import Pokemon
+from src import metrics
+from src.calc import BattleVariables, GameVariables
+from src.vectorized import CatchCase, calculate_catch_rates_batch
+
+
+@metrics.timed('iv_catch_rates')
+def calculate_iv_catch_rates(
+    pokemon: Pokemon,
+    get_battle_variables: Callable[[int], BattleVariables],
+    game_variables: GameVariables,
+) -> list[IVCatchRateRecord]:
+    """
+    Return the lowest, highest and expected catch rate of each scenario.
+
+    Every IV from 0 to 31 is equally likely. Many IVs share the same HP,
+    so each distinct HP is calculated once, all in one vectorized batch.
+    `get_battle_variables` receives each HP.
+    """
+    hps, iv_counts = np.unique(pokemon.hps_by_iv, return_counts=True)
+    results = calculate_catch_rates_batch(
+        [
+            CatchCase(pokemon, hp, get_battle_variables(hp), game_variables)
+            for hp in hps.tolist()
+        ],
+    )
+    scenarios = results[0][0]
+    # Axes: distinct HP, scenario.
+    catch_rates = np.array([catch_rates for _, catch_rates in results])
+    expected_catch_rates = iv_counts @ catch_rates / iv_counts.sum()
+
+    return [
+        IVCatchRateRecord(
+            poke_ball=scenario.poke_ball,
+            condition=scenario.condition or '',
+            catch_rate=catch_rate,
+            turns=scenario.turns,
+            min_catch_rate=min_catch_rate,
+            max_catch_rate=max_catch_rate,
+        )
+        for scenario, catch_rate, min_catch_rate, max_catch_rate in zip(
+            scenarios,
+            expected_catch_rates.tolist(),
+            catch_rates.min(axis=0).tolist(),
+            catch_rates.max(axis=0).tolist(),
+            strict=True,
+        )
+    ]
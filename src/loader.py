@@ -0,0 +1,85 @@
+"""Builds Pokémon while downloading their PokéAPI pages concurrently."""
+
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from models.pokemon import Pokemon
+from settings import MAX_FETCH_WORKERS, POKEMON_CACHE_SIZE
+from src import metrics
+from src.api import get_resource, get_resource_by_url
+from src.cache import TTLCache
+
+pokemon_cache: TTLCache[str, Pokemon] = TTLCache(
+    'pokemon',
+    maxsize=POKEMON_CACHE_SIZE,
+)
+
+
+def _get_species_page(species_id: str | int) -> dict[str, Any] | None:
+    import requests  # noqa: PLC0415
+
+    try:
+        return get_resource('pokemon-species', species_id)
+    except requests.HTTPError:
+        return None
+
+
+def fetch_pokemon(form_id: str | int, level: int = 1) -> Pokemon:
+    """
+    Build a Pokémon, fetching its form and species pages at the same time.
+
+    The species page is requested with the form identifier, which matches
+    for every default form. Other forms fall back to a second request once
+    the form page names the actual species.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        form_future = executor.submit(get_resource, 'pokemon', form_id)
+        species_future: Future[dict[str, Any] | None] = executor.submit(
+            _get_species_page,
+            form_id,
+        )
+        form_page = form_future.result()
+        species_page = species_future.result()
+
+    species_name = form_page['species']['name']
+    if species_page is None or species_page['name'] != species_name:
+        species_page = get_resource('pokemon-species', species_name)
+
+    evolution_page = get_resource_by_url(
+        species_page['evolution_chain']['url'],
+    )
+    with metrics.span('pokemon_construction'):
+        return Pokemon(
+            form_id,
+            level,
+            form_page=form_page,
+            species_page=species_page,
+            evolution_page=evolution_page,
+        )
+
+
+def fetch_pokemon_batch(
+    form_ids: Iterable[str | int],
+    level: int = 1,
+    max_workers: int = MAX_FETCH_WORKERS,
+) -> list[Pokemon]:
+    """Build many Pokémon, with at most `max_workers` loading at once."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                lambda form_id: fetch_pokemon(form_id, level),
+                form_ids,
+            ),
+        )
+
+
+def get_pokemon(form_id: str | int, level: int = 1) -> Pokemon:
+    """Return a copy of the cached Pokémon, loading it on a miss."""
+    key = str(form_id).lower()
+    pokemon = pokemon_cache.get(key)
+    if pokemon is None:
+        pokemon = fetch_pokemon(key)
+        pokemon_cache.set(key, pokemon)
+        pokemon_cache.set(str(pokemon.form_id), pokemon)
+    return pokemon.with_level(level)
@@ -0,0 +1,147 @@
+"""Precomputed capture probabilities for every modified catch rate.
+
+Usage: python -m src.lookup [--step N]
+"""
+
+import argparse
+import os
+from functools import cache
+
+import numpy as np
+from numpy.typing import NDArray
+
+from models.exceptions import CatchRateTableMismatchError
+from settings import CATCH_RATE_TABLES_DIR, CRITICAL_CATCH_RANGES
+from src import modifiers
+from src.calc import calculate_overall_catch_rate
+from src.vectorized import calculate_overall_catch_rates_array
+
+MAX_MODIFIED_CATCH_RATE = 0xFF000
+SELF_CHECK_STEP = 4099
+
+# One registered Pokémon count per critical catch bracket, the last one
+# standing for every count above the highest range.
+BRACKET_REGISTERED_POKEMON = (
+    *(min_registered for min_registered, _ in CRITICAL_CATCH_RANGES),
+    max(max_registered for _, max_registered in CRITICAL_CATCH_RANGES) + 1,
+)
+
+
+def verify_catch_rate_table(
+    table: NDArray[np.float64],
+    registered_pokemon: int,
+    *,
+    catching_charm: bool,
+    step: int = 1,
+) -> list[int]:
+    """Return the modified catch rates whose entry differs from the formula."""
+    return [
+        modified_catch_rate
+        for modified_catch_rate in (
+            *range(1, MAX_MODIFIED_CATCH_RATE + 1, step),
+            MAX_MODIFIED_CATCH_RATE,
+        )
+        if table[modified_catch_rate]
+        != calculate_overall_catch_rate(
+            modified_catch_rate,
+            registered_pokemon,
+            catching_charm=catching_charm,
+        )
+    ]
+
+
+def _build_catch_rate_table(
+    registered_pokemon: int,
+    *,
+    catching_charm: bool,
+) -> NDArray[np.float64]:
+    table = calculate_overall_catch_rates_array(
+        np.arange(MAX_MODIFIED_CATCH_RATE + 1),
+        modifiers.get_critical_catch_modifier(registered_pokemon),
+        catching_charm,
+    )
+    if mismatches := verify_catch_rate_table(
+        table,
+        registered_pokemon,
+        catching_charm=catching_charm,
+        step=SELF_CHECK_STEP,
+    ):
+        raise CatchRateTableMismatchError(mismatches)
+    return table
+
+
+@cache
+def get_catch_rate_table(
+    critical_catch_modifier: int,
+    *,
+    catching_charm: bool,
+) -> NDArray[np.float64]:
+    """Return the memory-mapped table, generating its file if needed."""
+    path = (
+        CATCH_RATE_TABLES_DIR
+        / f'{critical_catch_modifier}_{int(catching_charm)}.npy'
+    )
+    if not path.exists():
+        registered_pokemon = next(
+            registered
+            for registered in BRACKET_REGISTERED_POKEMON
+            if modifiers.get_critical_catch_modifier(registered)
+            == critical_catch_modifier
+        )
+        table = _build_catch_rate_table(
+            registered_pokemon,
+            catching_charm=catching_charm,
+        )
+        CATCH_RATE_TABLES_DIR.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with temporary_path.open('wb') as file:
+            np.save(file, table)
+        temporary_path.replace(path)
+
+    return np.load(path, mmap_mode='r')  # type: ignore[no-any-return]
+
+
+def lookup_overall_catch_rate(
+    modified_catch_rate: int,
+    registered_pokemon: int = 843,
+    *,
+    catching_charm: bool = True,
+) -> float:
+    """Table-backed equivalent of calculate_overall_catch_rate."""
+    table = get_catch_rate_table(
+        modifiers.get_critical_catch_modifier(registered_pokemon),
+        catching_charm=catching_charm,
+    )
+    return float(table[modified_catch_rate])
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--step',
+        type=int,
+        default=1,
+        help='verify every Nth modified catch rate (default: %(default)s)',
+    )
+    args = parser.parse_args(argv)
+
+    for registered_pokemon in BRACKET_REGISTERED_POKEMON:
+        for catching_charm in (False, True):
+            table = get_catch_rate_table(
+                modifiers.get_critical_catch_modifier(registered_pokemon),
+                catching_charm=catching_charm,
+            )
+            mismatches = verify_catch_rate_table(
+                table,
+                registered_pokemon,
+                catching_charm=catching_charm,
+                step=args.step,
+            )
+            print(  # noqa: T201
+                f'{registered_pokemon=} {catching_charm=}: '
+                f'{len(mismatches)} mismatches',
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""In-process timing spans, counters and histograms for the hot paths.
+
+Every stage of a catch rate request records its duration under
+`stage_duration_seconds`, PokéAPI round trips under
+`upstream_request_duration_seconds`, and the process-wide caches report
+their hits and misses. The registry renders as Prometheus text or JSON,
+which `start_json_dump` writes to disk periodically.
+
+Usage: python -m src.metrics [PATH]  (print a JSON dump as Prometheus text)
+"""
+
+import argparse
+import bisect
+import contextlib
+import functools
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+from settings import METRICS_DUMP_INTERVAL, METRICS_DUMP_PATH
+from src.cache import get_cache_stats
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec('P')
+R = TypeVar('R')
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)  # seconds
+METRIC_HELP = {
+    'stage_duration_seconds': 'Time spent in each stage of a request.',
+    'upstream_request_duration_seconds': 'PokéAPI round trip time.',
+    'upstream_requests_total': 'PokéAPI requests by endpoint and status.',
+    'http_cache_requests_total': 'PokéAPI client cache lookups by result.',
+    'server_requests_total': 'HTTP API requests by route and status.',
+    'cache_hits_total': 'Cache lookups that found a fresh entry.',
+    'cache_misses_total': 'Cache lookups that found no fresh entry.',
+    'cache_entries': 'Entries currently held by each cache.',
+    'cache_max_entries': 'Entries each cache holds before evicting.',
+}
+
+
+@dataclass
+class Histogram:
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.total += value
+
+    def get_cumulative_counts(self) -> list[tuple[str, int]]:
+        """Return (upper bound, count) pairs, ending with +Inf."""
+        cumulative_counts = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts, strict=True):
+            total += count
+            cumulative_counts.append((_format_value(bound), total))
+        cumulative_counts.append(('+Inf', self.count))
+        return cumulative_counts
+
+
+def _get_labels(labels: dict[str, str] | None) -> Labels:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels: Labels, **extra_labels: str) -> str:
+    pairs = [*labels, *extra_labels.items()]
+    if not pairs:
+        return ''
+    escaped_pairs = (
+        (name, value.replace('\\', r'\\').replace('"', r'\"'))
+        for name, value in pairs
+    )
+    return (
+        '{'
+        + ','.join(f'{name}="{value}"' for name, value in escaped_pairs)
+        + '}'
+    )
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and histograms keyed by labels."""
+
+    def __init__(self) -> None:
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(
+        self,
+        name: str,
+        labels: dict[str, str] | None = None,
+        amount: float = 1,
+    ) -> None:
+        key = (name, _get_labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        key = (name, _get_labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def get_snapshot(self) -> dict[str, Any]:
+        """Return every metric and cache statistic as JSON data."""
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': histogram.count,
+                    'sum': histogram.total,
+                    'buckets': dict(histogram.get_cumulative_counts()),
+                }
+                for (name, labels), histogram in sorted(
+                    self.histograms.items(),
+                )
+            ]
+        return {
+            'timestamp': time.time(),
+            'counters': counters,
+            'histograms': histograms,
+            'caches': {
+                name: asdict(stats)
+                for name, stats in get_cache_stats().items()
+            },
+        }
+
+
+def render_prometheus(snapshot: dict[str, Any]) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    samples: dict[str, tuple[str, list[str]]] = {}
+
+    def _add_sample(name: str, type_: str, sample: str) -> None:
+        samples.setdefault(name, (type_, []))[1].append(sample)
+
+    for counter in snapshot['counters']:
+        counter_labels = _format_labels(tuple(counter['labels'].items()))
+        _add_sample(
+            counter['name'],
+            'counter',
+            f'{counter["name"]}{counter_labels} '
+            f'{_format_value(counter["value"])}',
+        )
+    for histogram in snapshot['histograms']:
+        name = histogram['name']
+        label_pairs = tuple(histogram['labels'].items())
+        for bound, count in histogram['buckets'].items():
+            _add_sample(
+                name,
+                'histogram',
+                f'{name}_bucket{_format_labels(label_pairs, le=bound)} '
+                f'{count}',
+            )
+        _add_sample(
+            name,
+            'histogram',
+            f'{name}_sum{_format_labels(label_pairs)} {histogram["sum"]!r}',
+        )
+        _add_sample(
+            name,
+            'histogram',
+            f'{name}_count{_format_labels(label_pairs)} {histogram["count"]}',
+        )
+    for cache_name, stats in snapshot['caches'].items():
+        cache_labels = _format_labels((('cache', cache_name),))
+        for name, type_, value in (
+            ('cache_hits_total', 'counter', stats['hits']),
+            ('cache_misses_total', 'counter', stats['misses']),
+            ('cache_entries', 'gauge', stats['size']),
+            ('cache_max_entries', 'gauge', stats['maxsize']),
+        ):
+            _add_sample(name, type_, f'{name}{cache_labels} {value}')
+
+    lines = []
+    for name, (type_, metric_samples) in samples.items():
+        if name in METRIC_HELP:
+            lines.append(f'# HELP {name} {METRIC_HELP[name]}')
+        lines.append(f'# TYPE {name} {type_}')
+        lines.extend(metric_samples)
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def increment(
+    name: str,
+    labels: dict[str, str] | None = None,
+    amount: float = 1,
+) -> None:
+    registry.increment(name, labels, amount)
+
+
+def observe(
+    name: str,
+    value: float,
+    labels: dict[str, str] | None = None,
+) -> None:
+    registry.observe(name, value, labels)
+
+
+@contextlib.contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Record the time spent inside the block, even when it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(
+            'stage_duration_seconds',
+            time.perf_counter() - start,
+            {'stage': stage},
+        )
+
+
+def timed(stage: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Record every call of the decorated function as a `stage` span."""
+
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(stage):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_prometheus_text() -> str:
+    return render_prometheus(registry.get_snapshot())
+
+
+def dump_json(path: Path = METRICS_DUMP_PATH) -> None:
+    """Write a snapshot to `path`, replacing the previous one atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_suffix(f'{path.suffix}.tmp')
+    temporary_path.write_text(json.dumps(registry.get_snapshot()))
+    temporary_path.replace(path)
+
+
+_dump_thread: threading.Thread | None = None
+_dump_lock = threading.Lock()
+
+
+def start_json_dump(
+    path: Path = METRICS_DUMP_PATH,
+    interval: float = METRICS_DUMP_INTERVAL,
+) -> None:
+    """Dump a snapshot every `interval` seconds; later calls do nothing."""
+    global _dump_thread  # noqa: PLW0603
+
+    def _dump_periodically() -> None:
+        while True:
+            time.sleep(interval)
+            # A failed dump, like on a full disk, is retried next time.
+            try:
+                dump_json(path)
+            except OSError:
+                logger.exception('Could not dump metrics to %s', path)
+
+    with _dump_lock:
+        if _dump_thread is None:
+            _dump_thread = threading.Thread(
+                target=_dump_periodically,
+                name='metrics-dump',
+                daemon=True,
+            )
+            _dump_thread.start()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        'path',
+        nargs='?',
+        type=Path,
+        default=METRICS_DUMP_PATH,
+    )
+    args = parser.parse_args(argv)
+
+    snapshot = json.loads(args.path.read_text())
+    print(render_prometheus(snapshot), end='')  # noqa: T201
+
+
+if __name__ == '__main__':
+    main()
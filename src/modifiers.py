@@ -1,4 +1,10 @@
+import bisect
 import math
+from collections.abc import Mapping
+from typing import Generic, NamedTuple, TypeVar
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
 from models.exceptions import InvalidCatchingPowerError
 from models.poke_ball import PokeBall
@@ -11,19 +17,97 @@ from settings import (
     HEAVY_BALL_RANGES,
 )
 
+Key = TypeVar('Key', int, float)
+
 
 def get_hp_modifier(hp: int, current_hp: int = 1) -> int:
     return math.floor((3 * hp - 2 * current_hp) * 4096 + 0.5)
 
 
+class ExactModifier(NamedTuple):
+    """A 4096-scaled modifier as 4096 * numerator / denominator, reduced."""
+
+    numerator: int
+    denominator: int
+
+
+def _get_exact_modifier(numerator: int, denominator: int) -> ExactModifier:
+    divisor = math.gcd(numerator, denominator)
+    return ExactModifier(numerator // divisor, denominator // divisor)
+
+
+class RangeTable(Generic[Key]):
+    """
+    Values of consecutive right-closed ranges, found by bisecting edges.
+
+    `values[i]` holds for keys in (edges[i - 1], edges[i]], the first value
+    for keys up to the first edge and the last for keys past the last one.
+    """
+
+    __slots__ = ('edges', 'values', 'values_array')
+
+    def __init__(
+        self,
+        ranges: Mapping[tuple[Key, Key], int],
+        default: int,
+        *,
+        closed: bool,
+    ) -> None:
+        # Closed ranges, which include their lower bound, have integer keys,
+        # so they are the same as right-closed ranges from one below it.
+        self.edges: list[Key] = []
+        self.values: list[int] = []
+        for (lower, upper), value in sorted(ranges.items()):
+            start = lower - 1 if closed else lower
+            if not self.edges or start != self.edges[-1]:
+                self.edges.append(start)
+                self.values.append(default)
+            self.edges.append(upper)
+            self.values.append(value)
+        self.values.append(default)
+        self.values_array: NDArray[np.int64] = np.array(self.values)
+
+    def get(self, key: Key) -> int:
+        return self.values[bisect.bisect_left(self.edges, key)]
+
+    def get_array(self, keys: ArrayLike) -> NDArray[np.int64]:
+        values: NDArray[np.int64] = self.values_array[
+            np.searchsorted(self.edges, keys, side='left')
+        ]
+        return values
+
+
+DARK_GRASS_TABLE = RangeTable(DARK_GRASS_RANGES, 4096, closed=True)
+HEAVY_BALL_TABLE = RangeTable(HEAVY_BALL_RANGES, 30, closed=False)
+CRITICAL_CATCH_TABLE = RangeTable(CRITICAL_CATCH_RANGES, 10240, closed=True)
+# Indexed by the number of badges missing for the level.
+BADGE_MODIFIERS = [
+    0.8**missing_badges * 4096
+    for missing_badges in range(len(BADGE_THRESHOLDS))
+]
+EXACT_BADGE_MODIFIERS = [
+    _get_exact_modifier(4**missing_badges, 5**missing_badges)
+    for missing_badges in range(len(BADGE_THRESHOLDS))
+]
+# Catching power modifiers have at most two decimals, so they are exact in
+# hundredths.
+EXACT_CATCHING_POWER_MODIFIERS = {
+    catching_power_level: _get_exact_modifier(round(modifier * 100), 100)
+    for catching_power_level, modifier in CATCHING_POWER_MODIFIERS.items()
+}
+
+
 def get_dark_grass_modifier(registered_pokemon_on_dex: int) -> int:
+    # Scarlet and Violet have no dark grass.
     return 4096
 
-    for (min_registered, max_registered), value in DARK_GRASS_RANGES.items():
-        if min_registered <= registered_pokemon_on_dex <= max_registered:
-            return value
+    return DARK_GRASS_TABLE.get(registered_pokemon_on_dex)
 
-    return 4096
+
+def get_dark_grass_modifier_array(
+    registered_pokemon_on_dex: ArrayLike,
+) -> NDArray[np.int64]:
+    return np.full(np.shape(registered_pokemon_on_dex), 4096)
 
 
 def get_species_modifier(
@@ -32,21 +116,56 @@ def get_species_modifier(
     poke_ball: PokeBall,
 ) -> int:
     if poke_ball == PokeBall.HEAVY_BALL:
-        for (min_weight, max_weight), modifier in HEAVY_BALL_RANGES.items():
-            if min_weight < weight <= max_weight:
-                return max(catch_rate + modifier, 1)
-
-        return catch_rate + 30
+        return max(catch_rate + HEAVY_BALL_TABLE.get(weight), 1)
 
     return catch_rate
 
 
-def get_badge_modifier(badges: int, level: int) -> float:
-    for badges_required in range(len(BADGE_THRESHOLDS)):
-        if level <= BADGE_THRESHOLDS[badges_required]:
-            return (0.8 ** (max(0, badges_required - badges))) * 4096
+def get_species_modifier_array(
+    catch_rate: ArrayLike,
+    weight: ArrayLike,
+    poke_ball: PokeBall,
+) -> NDArray[np.int64]:
+    catch_rates = np.asarray(catch_rate, dtype=np.int64)
+    if poke_ball == PokeBall.HEAVY_BALL:
+        species_modifiers: NDArray[np.int64] = np.maximum(
+            catch_rates + HEAVY_BALL_TABLE.get_array(weight),
+            1,
+        )
+        return species_modifiers
 
-    return 4096
+    return catch_rates + np.zeros(np.shape(weight), dtype=np.int64)
+
+
+def get_badge_modifier(badges: int, level: int) -> float:
+    badges_required = bisect.bisect_left(BADGE_THRESHOLDS, level)
+    if badges_required == len(BADGE_THRESHOLDS):
+        return 4096
+    return BADGE_MODIFIERS[max(0, badges_required - badges)]
+
+
+def get_badge_modifier_array(
+    badges: ArrayLike,
+    level: ArrayLike,
+) -> NDArray[np.float64]:
+    badges_required = np.searchsorted(BADGE_THRESHOLDS, level, side='left')
+    missing_badges = np.where(
+        badges_required == len(BADGE_THRESHOLDS),
+        0,
+        np.maximum(0, badges_required - np.asarray(badges)),
+    )
+    badge_modifiers: NDArray[np.float64] = np.array(BADGE_MODIFIERS)[
+        missing_badges
+    ]
+    return badge_modifiers
+
+
+def get_exact_badge_modifier(badges: int, level: int) -> ExactModifier:
+    """Exact counterpart of get_badge_modifier, without float rounding."""
+    badges_required = bisect.bisect_left(BADGE_THRESHOLDS, level)
+    if badges_required == len(BADGE_THRESHOLDS):
+        return EXACT_BADGE_MODIFIERS[0]
+    return EXACT_BADGE_MODIFIERS[max(0, badges_required - badges)]
 
 
 def get_status_modifier(status: PokemonStatus | None) -> int:
@@ -69,12 +188,29 @@ def get_capture_value_coefficient_modifier(
     raise InvalidCatchingPowerError
 
 
+def get_exact_capture_value_coefficient_modifier(
+    catching_power_level: int,
+    *,
+    backstrike: bool,
+) -> ExactModifier:
+    """Exact counterpart of get_capture_value_coefficient_modifier."""
+    backstrike_modifier = 2 if backstrike else 1
+    if catching_power_level in EXACT_CATCHING_POWER_MODIFIERS:
+        numerator, denominator = EXACT_CATCHING_POWER_MODIFIERS[
+            catching_power_level
+        ]
+        return _get_exact_modifier(
+            backstrike_modifier * numerator,
+            denominator,
+        )
+    raise InvalidCatchingPowerError
+
+
 def get_critical_catch_modifier(registered_pokemon_on_dex: int) -> int:
-    for (
-        min_registered,
-        max_registered,
-    ), value in CRITICAL_CATCH_RANGES.items():
-        if min_registered <= registered_pokemon_on_dex <= max_registered:
-            return value
-
-    return 10240
+    return CRITICAL_CATCH_TABLE.get(registered_pokemon_on_dex)
+
+
+def get_critical_catch_modifier_array(
+    registered_pokemon_on_dex: ArrayLike,
+) -> NDArray[np.int64]:
+    return CRITICAL_CATCH_TABLE.get_array(registered_pokemon_on_dex)
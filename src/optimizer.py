@@ -0,0 +1,246 @@
+"""Finds the best order to throw the balls of an inventory."""
+
+import itertools
+from dataclasses import dataclass
+from typing import Literal
+
+from models.catch_scenario import CatchScenario
+from models.poke_ball import PokeBall
+from models.pokemon import Pokemon
+from src.calc import BattleVariables, GameVariables
+from src.vectorized import calculate_catch_rates_array
+
+Objective = Literal['probability', 'throws']
+
+TURN_DEPENDENT_BALLS = (PokeBall.TIMER_BALL, PokeBall.QUICK_BALL)
+# Orders that only differ by float noise count as ties for the objective.
+TIE_DIGITS = 12
+
+
+@dataclass
+class ThrowPlan:
+    throws: list[PokeBall]
+    catch_rates: list[float]
+    catch_probability: float
+    expected_throws: float
+
+
+def get_ball_catch_rates(
+    scenarios: list[CatchScenario],
+    catch_rates: list[float],
+    *,
+    optimistic: bool = False,
+) -> dict[PokeBall, float]:
+    """
+    Return the turn-independent catch rate of every ball.
+
+    Conditions the user has to set up are assumed to be met only when
+    `optimistic` is true, otherwise the ball's lowest possible rate is used.
+    """
+    choose = max if optimistic else min
+    ball_catch_rates: dict[PokeBall, float] = {PokeBall.MASTER_BALL: 1}
+    for scenario, catch_rate in zip(scenarios, catch_rates, strict=True):
+        if scenario.turns is not None:
+            continue
+        ball = scenario.poke_ball
+        ball_catch_rates[ball] = choose(
+            ball_catch_rates.get(ball, catch_rate),
+            catch_rate,
+        )
+    # Balls without a scenario of their own behave like Poké Balls.
+    base_catch_rate = ball_catch_rates[PokeBall.POKÉ_BALL]
+    for ball in PokeBall:
+        ball_catch_rates.setdefault(ball, base_catch_rate)
+    return ball_catch_rates
+
+
+def get_turn_catch_rates(
+    scenarios: list[CatchScenario],
+    catch_rates: list[float],
+    poke_ball: PokeBall,
+) -> list[float]:
+    """Return the catch rate of a turn-dependent ball on each turn."""
+    by_turn = {
+        scenario.turns: catch_rate
+        for scenario, catch_rate in zip(scenarios, catch_rates, strict=True)
+        if scenario.poke_ball == poke_ball and scenario.turns is not None
+    }
+    return [by_turn[turns] for turns in sorted(by_turn)]
+
+
+# The numbers of Timer, Quick and other balls thrown so far.
+ThrowState = tuple[int, int, int]
+# The catch probability and expected throws from a state, and the next ball.
+Solution = tuple[float, float, PokeBall | None]
+
+NO_SOLUTION: Solution = (0, 0, None)
+
+
+@dataclass
+class _ThrowSearch:
+    """Best throws from every state, solved from the last turn backwards."""
+
+    ball_catch_rates: dict[PokeBall, float]
+    timer_catch_rates: list[float]
+    quick_turn_catch_rate: float
+    other_balls: list[PokeBall]
+    timer_balls: int
+    quick_balls: int
+    max_turns: int
+    objective: Objective
+
+    def get_catch_rate(self, ball: PokeBall, turn: int, others: int) -> float:
+        if ball == PokeBall.TIMER_BALL:
+            return self.timer_catch_rates[
+                min(turn, len(self.timer_catch_rates) - 1)
+            ]
+        if ball == PokeBall.QUICK_BALL and turn == 0:
+            return self.quick_turn_catch_rate
+        if ball == PokeBall.QUICK_BALL:
+            return self.ball_catch_rates[ball]
+        return self.ball_catch_rates[self.other_balls[others]]
+
+    def get_rank(self, solution: Solution) -> tuple[float, float]:
+        probability = round(solution[0], TIE_DIGITS)
+        throws = round(solution[1], TIE_DIGITS)
+        if self.objective == 'probability':
+            return probability, -throws
+        return -throws, probability
+
+    def get_options(
+        self,
+        state: ThrowState,
+    ) -> list[tuple[PokeBall, ThrowState]]:
+        """Return the balls left to throw from `state`, with their states."""
+        timers, quicks, others = state
+        options = []
+        if timers < self.timer_balls:
+            options.append((PokeBall.TIMER_BALL, (timers + 1, quicks, others)))
+        if quicks < self.quick_balls:
+            options.append((PokeBall.QUICK_BALL, (timers, quicks + 1, others)))
+        if others < len(self.other_balls):
+            options.append(
+                (self.other_balls[others], (timers, quicks, others + 1)),
+            )
+        return options
+
+    def solve_state(
+        self,
+        state: ThrowState,
+        solutions: dict[ThrowState, Solution],
+    ) -> Solution:
+        """Return the best solution of `state` from its solved successors."""
+        turn = sum(state)
+        best = NO_SOLUTION
+        if turn >= self.max_turns:
+            return best
+        for ball, next_state in self.get_options(state):
+            catch_rate = self.get_catch_rate(ball, turn, state[2])
+            probability, throws, _ = solutions[next_state]
+            option = (
+                catch_rate + (1 - catch_rate) * probability,
+                1 + (1 - catch_rate) * throws,
+                ball,
+            )
+            if best[2] is None or self.get_rank(option) > self.get_rank(best):
+                best = option
+        return best
+
+    def solve(self) -> dict[ThrowState, Solution]:
+        """
+        Return the solution of every reachable state.
+
+        States are visited with every count decreasing, so the states one
+        throw later are always solved first.
+        """
+        solutions: dict[ThrowState, Solution] = {}
+        for state in itertools.product(
+            range(min(self.timer_balls, self.max_turns), -1, -1),
+            range(min(self.quick_balls, self.max_turns), -1, -1),
+            range(min(len(self.other_balls), self.max_turns), -1, -1),
+        ):
+            if sum(state) <= self.max_turns:
+                solutions[state] = self.solve_state(state, solutions)
+        return solutions
+
+    def get_plan(self) -> ThrowPlan:
+        solutions = self.solve()
+        catch_probability, expected_throws, _ = solutions[0, 0, 0]
+        plan = ThrowPlan([], [], catch_probability, expected_throws)
+        state = (0, 0, 0)
+        while (ball := solutions[state][2]) is not None:
+            plan.throws.append(ball)
+            plan.catch_rates.append(
+                self.get_catch_rate(ball, sum(state), state[2]),
+            )
+            state = (
+                state[0] + (ball == PokeBall.TIMER_BALL),
+                state[1] + (ball == PokeBall.QUICK_BALL),
+                state[2] + (ball not in TURN_DEPENDENT_BALLS),
+            )
+        return plan
+
+
+def optimize_throws(  # noqa: PLR0913
+    pokemon: Pokemon,
+    hp: int,
+    battle_variables: BattleVariables,
+    game_variables: GameVariables,
+    inventory: dict[PokeBall, int],
+    max_turns: int | None = None,
+    *,
+    objective: Objective = 'probability',
+    optimistic: bool = False,
+) -> ThrowPlan:
+    """
+    Return the throw order that best meets `objective` within `max_turns`.
+
+    Turn-independent balls are always best thrown strongest first, so the
+    search only has to decide on which turns to throw Timer and Quick
+    Balls. Its state is the number of Timer, Quick and other balls thrown.
+    """
+    scenarios, rates = calculate_catch_rates_array(
+        pokemon,
+        hp,
+        battle_variables,
+        game_variables,
+    )
+    catch_rates = rates.tolist()
+    ball_catch_rates = get_ball_catch_rates(
+        scenarios,
+        catch_rates,
+        optimistic=optimistic,
+    )
+    other_balls = sorted(
+        (
+            ball
+            for ball, count in inventory.items()
+            if ball not in TURN_DEPENDENT_BALLS
+            for _ in range(count)
+        ),
+        key=lambda ball: ball_catch_rates[ball],
+        reverse=True,
+    )
+    timer_balls = inventory.get(PokeBall.TIMER_BALL, 0)
+    quick_balls = inventory.get(PokeBall.QUICK_BALL, 0)
+    if max_turns is None:
+        max_turns = timer_balls + quick_balls + len(other_balls)
+
+    return _ThrowSearch(
+        ball_catch_rates=ball_catch_rates,
+        timer_catch_rates=get_turn_catch_rates(
+            scenarios,
+            catch_rates,
+            PokeBall.TIMER_BALL,
+        ),
+        quick_turn_catch_rate=get_turn_catch_rates(
+            scenarios,
+            catch_rates,
+            PokeBall.QUICK_BALL,
+        )[0],
+        other_balls=other_balls,
+        timer_balls=timer_balls,
+        quick_balls=quick_balls,
+        max_turns=max_turns,
+        objective=objective,
+    ).get_plan()
@@ -0,0 +1,234 @@
+"""Catch rate queries answered outside of Streamlit, one or many at once."""
+
+import math
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any, Self
+
+from models.catch_rate_record import CatchRateRecord, rank_catch_rates
+from models.exceptions import (
+    InvalidCatchingPowerError,
+    InvalidLevelError,
+    InvalidQueryError,
+    NoPokemonFoundError,
+    PokemonLoadError,
+)
+from models.pokemon import Pokemon, PokemonStatus
+from settings import (
+    BADGE_THRESHOLDS,
+    CATCHING_POWER_MODIFIERS,
+    MAX_FETCH_WORKERS,
+    POKEMON_LEVEL_CAP,
+)
+from src import metrics
+from src.calc import BattleVariables, GameVariables
+from src.loader import get_pokemon
+from src.vectorized import CatchCase, calculate_catch_rates_batch
+
+STATUSES = {
+    'none': None,
+    **{
+        name.lower(): status
+        for name, status in PokemonStatus.__members__.items()
+    },
+}
+FIELD_TYPES: dict[str, tuple[type, ...]] = {
+    'pokemon': (str, int),
+    'level': (int,),
+    'hp_fraction': (int, float),
+    'status': (str,),
+    'backstrike': (bool,),
+    'catching_power_level': (int,),
+    'badges': (int,),
+    'registered_pokemon': (int,),
+    'catching_charm': (bool,),
+}
+
+
+@dataclass(frozen=True)
+class CatchQuery:
+    pokemon: str | int
+    level: int = 50
+    hp_fraction: float = 1
+    status: str = 'none'
+    backstrike: bool = False
+    catching_power_level: int = 0
+    badges: int = len(BADGE_THRESHOLDS) - 1
+    registered_pokemon: int = 843
+    catching_charm: bool = False
+
+    @classmethod
+    def from_json(cls, data: Any) -> Self:  # noqa: ANN401
+        """Build a query from decoded JSON, rejecting invalid fields."""
+        if not isinstance(data, dict):
+            message = 'expected a JSON object'
+            raise InvalidQueryError(message)
+        if unknown := data.keys() - {field.name for field in fields(cls)}:
+            message = f'unknown fields {sorted(unknown)}'
+            raise InvalidQueryError(message)
+        if 'pokemon' not in data:
+            message = 'missing field pokemon'
+            raise InvalidQueryError(message)
+        for name, value in data.items():
+            expected = FIELD_TYPES[name]
+            if (isinstance(value, bool) and bool not in expected) or (
+                not isinstance(value, expected)
+            ):
+                message = f'wrong type for field {name}'
+                raise InvalidQueryError(message)
+
+        query = cls(**data)
+        query.validate()
+        return query
+
+    def validate(self) -> None:
+        if isinstance(self.pokemon, str) and not self.pokemon.strip():
+            message = 'pokemon must not be blank'
+            raise InvalidQueryError(message)
+        if not 1 <= self.level <= POKEMON_LEVEL_CAP:
+            raise InvalidLevelError(self.level)
+        if self.catching_power_level not in CATCHING_POWER_MODIFIERS:
+            raise InvalidCatchingPowerError
+        if not 0 < self.hp_fraction <= 1:
+            message = 'hp_fraction must be in (0, 1]'
+            raise InvalidQueryError(message)
+        if self.status.lower() not in STATUSES:
+            message = f'status must be one of {list(STATUSES)}'
+            raise InvalidQueryError(message)
+        if not 0 <= self.badges < len(BADGE_THRESHOLDS):
+            message = f'badges must be in [0, {len(BADGE_THRESHOLDS) - 1}]'
+            raise InvalidQueryError(message)
+        if self.registered_pokemon < 0:
+            message = 'registered_pokemon must not be negative'
+            raise InvalidQueryError(message)
+
+
+def load_pokemon(pokemon: str | int) -> Pokemon:
+    import requests  # noqa: PLC0415
+
+    try:
+        return get_pokemon(pokemon)
+    except requests.HTTPError as error:
+        if error.response is not None and error.response.status_code == (
+            requests.codes.not_found
+        ):
+            raise NoPokemonFoundError(pokemon) from error
+        raise
+
+
+def get_query_key(query: CatchQuery) -> str:
+    return str(query.pokemon).lower()
+
+
+def load_species(
+    keys: Iterable[str],
+) -> dict[str, Pokemon | PokemonLoadError]:
+    """Load each species once, keeping the lookups that failed."""
+    import requests  # noqa: PLC0415
+
+    def _load_species(key: str) -> Pokemon | PokemonLoadError:
+        try:
+            return load_pokemon(key)
+        except NoPokemonFoundError as error:
+            return error
+        # Malformed pages surface as missing keys or wrong types.
+        except (
+            requests.RequestException,
+            LookupError,
+            TypeError,
+            ValueError,
+        ) as error:
+            return PokemonLoadError(key, error)
+
+    keys = list(dict.fromkeys(keys))
+    if len(keys) == 1:
+        return {keys[0]: _load_species(keys[0])}
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        return dict(
+            zip(keys, executor.map(_load_species, keys), strict=True),
+        )
+
+
+def get_catch_case(query: CatchQuery, pokemon: Pokemon) -> CatchCase:
+    pokemon = pokemon.with_level(query.level)
+    hp = pokemon.min_hp
+    current_hp = max(1, math.floor(query.hp_fraction * hp))
+    return CatchCase(
+        pokemon,
+        hp,
+        BattleVariables(
+            target_current_hp=current_hp,
+            target_status=STATUSES[query.status.lower()],
+            backstrike=query.backstrike,
+            catching_power_level=query.catching_power_level,
+        ),
+        GameVariables(
+            badges=query.badges,
+            registered_pokemon=query.registered_pokemon,
+            catching_charm=query.catching_charm,
+        ),
+    )
+
+
+def get_catch_cases(queries: Sequence[CatchQuery]) -> list[CatchCase]:
+    """Load every queried Pokémon, each species only once."""
+    species = load_species(get_query_key(query) for query in queries)
+    cases = []
+    for query in queries:
+        pokemon = species[get_query_key(query)]
+        if isinstance(pokemon, PokemonLoadError):
+            raise pokemon
+        cases.append(get_catch_case(query, pokemon))
+    return cases
+
+
+def _serialize_record(record: CatchRateRecord) -> dict[str, Any]:
+    return {
+        'poke_ball': record.poke_ball.value,
+        'condition': record.condition,
+        'turns': record.turns,
+        'catch_rate': record.catch_rate,
+    }
+
+
+def get_results(cases: Sequence[CatchCase]) -> list[dict[str, Any]]:
+    """Return each case's Poké Balls ranked by catch rate, as JSON data."""
+    with metrics.span('catch_rates_batch'):
+        batch = calculate_catch_rates_batch(cases)
+    results = []
+    for case, (scenarios, catch_rates) in zip(cases, batch, strict=True):
+        records = rank_catch_rates(
+            CatchRateRecord(
+                poke_ball=scenario.poke_ball,
+                condition=scenario.condition or '',
+                catch_rate=catch_rate,
+                turns=scenario.turns,
+            )
+            for scenario, catch_rate in zip(
+                scenarios,
+                catch_rates.tolist(),
+                strict=True,
+            )
+        )
+        results.append(
+            {
+                'pokemon': case.pokemon.name,
+                'dex_no': case.pokemon.dex_no,
+                'level': case.pokemon.level,
+                'hp': case.hp,
+                'current_hp': case.battle_variables.target_current_hp,
+                'catch_rates': [
+                    _serialize_record(record) for record in records
+                ],
+            },
+        )
+    return results
+
+
+def run_queries(queries: Sequence[CatchQuery]) -> list[dict[str, Any]]:
+    return get_results(get_catch_cases(queries))
+
+
+def run_query(query: CatchQuery) -> dict[str, Any]:
+    return run_queries([query])[0]
@@ -1,4 +1,17 @@
+"""
+Catalogue of every catch scenario, compiled once into parallel arrays.
+
+A Pokémon's possible scenarios are a mask over the catalogue, found by
+evaluating each predicate once instead of building every scenario.
+"""
+
 import math
+from enum import IntEnum
+from functools import cache
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
 from models.catch_scenario import CatchScenario
 from models.poke_ball import PokeBall
@@ -10,210 +23,353 @@ from settings import (
     POKEMON_LEVEL_CAP,
     UB_DEX_NUMBERS,
 )
+from src import metrics
 
 
-def get_catch_scenarios(target_pokemon: Pokemon) -> list[CatchScenario]:
-    catch_scenarios: list[CatchScenario] = []
-
-    def _get_base_catch_rates() -> None:
-        base_catch_rate_balls = [
-            PokeBall.POKÉ_BALL,
-            PokeBall.SAFARI_BALL,
-            PokeBall.LEVEL_BALL,
-            PokeBall.LURE_BALL,
-            PokeBall.HEAVY_BALL,
-            PokeBall.LOVE_BALL,
-            PokeBall.FRIEND_BALL,
-            PokeBall.SPORT_BALL,
-            PokeBall.DIVE_BALL,
-            PokeBall.NEST_BALL,
-            PokeBall.REPEAT_BALL,
+class Predicate(IntEnum):
+    """Conditions on the target Pokémon deciding if a scenario can happen."""
+
+    ALWAYS = 0
+    FAST = 1
+    NOT_FAST = 2
+    QUADRUPLE_LEVEL_REACHABLE = 3
+    DOUBLE_LEVEL_REACHABLE = 4
+    HIGHER_LEVEL_REACHABLE = 5
+    HAS_GENDER = 6
+    EVOLVES_WITH_MOON_STONE = 7
+    NOT_EVOLVES_WITH_MOON_STONE = 8
+    BUG_OR_WATER = 9
+    NOT_BUG_OR_WATER = 10
+    NEST_BALL_LEVEL = 11
+    NOT_NEST_BALL_LEVEL = 12
+    ULTRA_BEAST = 13
+    NOT_ULTRA_BEAST = 14
+
+
+class RateCode(IntEnum):
+    """How a scenario's catch rate is obtained."""
+
+    CONSTANT = 0
+    NEST_BALL = 1
+
+
+class ScenarioSpec(NamedTuple):
+    poke_ball: PokeBall
+    catch_rate: int
+    condition: str | None = None
+    predicate: Predicate = Predicate.ALWAYS
+    rate_code: RateCode = RateCode.CONSTANT
+    turns: int | None = None
+
+
+BASE_CATCH_RATE_BALLS = (
+    PokeBall.POKÉ_BALL,
+    PokeBall.SAFARI_BALL,
+    PokeBall.LEVEL_BALL,
+    PokeBall.LURE_BALL,
+    PokeBall.HEAVY_BALL,
+    PokeBall.LOVE_BALL,
+    PokeBall.FRIEND_BALL,
+    PokeBall.SPORT_BALL,
+    PokeBall.DIVE_BALL,
+    PokeBall.NEST_BALL,
+    PokeBall.REPEAT_BALL,
+    PokeBall.TIMER_BALL,
+    PokeBall.LUXURY_BALL,
+    PokeBall.PREMIER_BALL,
+    PokeBall.DUSK_BALL,
+    PokeBall.HEAL_BALL,
+    PokeBall.QUICK_BALL,
+)
+
+# Conditions are str.format templates filled by _get_condition_fields.
+SCENARIO_CATALOGUE = (
+    *(ScenarioSpec(ball, 0x1000) for ball in BASE_CATCH_RATE_BALLS),
+    *(
+        ScenarioSpec(
             PokeBall.TIMER_BALL,
-            PokeBall.LUXURY_BALL,
-            PokeBall.PREMIER_BALL,
-            PokeBall.DUSK_BALL,
-            PokeBall.HEAL_BALL,
-            PokeBall.QUICK_BALL,
-        ]
-
-        catch_scenarios.extend(
-            [
-                CatchScenario(base_catch_rate_ball, 0x1000)
-                for base_catch_rate_ball in base_catch_rate_balls
-            ],
+            min(turns * 1229 + 0x1000, 0x4000),
+            f'{turns} {"turn" if turns == 1 else "turns"}'
+            ' since battle started',
+            turns=turns,
+            # is_condition_true=user information required
         )
+        for turns in range(11)
+    ),
+    ScenarioSpec(PokeBall.GREAT_BALL, 0x1800),
+    ScenarioSpec(PokeBall.ULTRA_BALL, 0x2000),
+    ScenarioSpec(
+        PokeBall.FAST_BALL,
+        0x4000,
+        f'Target Pokémon Speed >= {FAST_BALL_SPEED_MIN}',
+        Predicate.FAST,
+    ),
+    ScenarioSpec(
+        PokeBall.FAST_BALL,
+        0x1000,
+        f'Target Pokémon Speed < {FAST_BALL_SPEED_MIN}',
+        Predicate.NOT_FAST,
+    ),
+    ScenarioSpec(
+        PokeBall.LEVEL_BALL,
+        0x8000,
+        'User Pokémon Level {quadruple_level_operator} {quadruple_level}',
+        Predicate.QUADRUPLE_LEVEL_REACHABLE,
+    ),
+    ScenarioSpec(
+        PokeBall.LEVEL_BALL,
+        0x4000,
+        'User Pokémon Level {double_level_operator} {double_level}',
+        Predicate.DOUBLE_LEVEL_REACHABLE,
+    ),
+    ScenarioSpec(
+        PokeBall.LEVEL_BALL,
+        0x2000,
+        'User Pokémon Level > {level}',
+        Predicate.HIGHER_LEVEL_REACHABLE,
+    ),
+    ScenarioSpec(
+        PokeBall.LURE_BALL,
+        0x4000,
+        'Target Pokémon is in water or just above water',
+        # is_condition_true=user information required
+    ),
+    ScenarioSpec(
+        PokeBall.LOVE_BALL,
+        0x8000,
+        'User Pokémon Species is the same as Target, but opposite gender',
+        Predicate.HAS_GENDER,
+    ),
+    ScenarioSpec(
+        PokeBall.MOON_BALL,
+        0x4000,
+        'Target Pokémon evolves with Moon Stone',
+        Predicate.EVOLVES_WITH_MOON_STONE,
+    ),
+    ScenarioSpec(
+        PokeBall.MOON_BALL,
+        0x1000,
+        'Target Pokémon does not evolve with Moon Stone',
+        Predicate.NOT_EVOLVES_WITH_MOON_STONE,
+    ),
+    ScenarioSpec(
+        PokeBall.NET_BALL,
+        0x3800,
+        'Target Pokémon is either Bug or Water type',
+        Predicate.BUG_OR_WATER,
+    ),
+    ScenarioSpec(
+        PokeBall.NET_BALL,
+        0x1000,
+        'Target Pokémon is neither Bug nor Water type',
+        Predicate.NOT_BUG_OR_WATER,
+    ),
+    ScenarioSpec(
+        PokeBall.DIVE_BALL,
+        0x3800,
+        'Target Pokémon is in water',
+        # is_condition_true=user information required
+    ),
+    ScenarioSpec(
+        PokeBall.NEST_BALL,
+        0,
+        'Target Pokémon Level < 30',
+        Predicate.NEST_BALL_LEVEL,
+        RateCode.NEST_BALL,
+    ),
+    ScenarioSpec(
+        PokeBall.NEST_BALL,
+        0x1000,
+        'Target Pokémon Level >= 30',
+        Predicate.NOT_NEST_BALL_LEVEL,
+    ),
+    ScenarioSpec(
+        PokeBall.REPEAT_BALL,
+        0x3800,
+        'Target Pokémon has been registered',
+        # is_possible=user information required
+    ),
+    ScenarioSpec(
+        PokeBall.DUSK_BALL,
+        0x3000,
+        'Catch inside caves or during nighttime',
+        # is_possible=user information required
+    ),
+    ScenarioSpec(
+        PokeBall.QUICK_BALL,
+        0x5000,
+        '0 turns since battle started',
+        turns=0,
+        # is_possible=user information required
+    ),
+    ScenarioSpec(
+        PokeBall.DREAM_BALL,
+        0x4000,
+        'Target Pokémon is asleep',
+        # is_possible=user information required
+    ),
+    ScenarioSpec(
+        PokeBall.BEAST_BALL,
+        0x5000,
+        'Target Pokémon is an Ultra Beast',
+        Predicate.ULTRA_BEAST,
+    ),
+    ScenarioSpec(
+        PokeBall.BEAST_BALL,
+        0x19A,
+        'Target Pokémon is not an Ultra Beast',
+        Predicate.NOT_ULTRA_BEAST,
+    ),
+)
 
-    def _get_timer_ball_rates() -> None:
-        catch_scenarios.extend(
-            CatchScenario(
-                poke_ball=PokeBall.TIMER_BALL,
-                catch_rate=min(turns * 1229 + 0x1000, 0x4000),
-                condition=f'{turns} {"turn" if turns == 1 else "turns"}'
-                ' since battle started',
-                # is_condition_true=user information required
-            )
-            for turns in range(11)
+POKE_BALLS = tuple(PokeBall)
+SCENARIO_BALLS = tuple(spec.poke_ball for spec in SCENARIO_CATALOGUE)
+SCENARIO_BALL_IDS = np.array(
+    [POKE_BALLS.index(spec.poke_ball) for spec in SCENARIO_CATALOGUE],
+)
+SCENARIO_CATCH_RATES = np.array(
+    [spec.catch_rate for spec in SCENARIO_CATALOGUE],
+)
+SCENARIO_RATE_CODES = np.array(
+    [spec.rate_code for spec in SCENARIO_CATALOGUE],
+)
+SCENARIO_CONDITIONS = tuple(spec.condition for spec in SCENARIO_CATALOGUE)
+SCENARIO_PREDICATES = np.array(
+    [spec.predicate for spec in SCENARIO_CATALOGUE],
+)
+SCENARIO_TURNS = tuple(spec.turns for spec in SCENARIO_CATALOGUE)
+# The Timer Ball without a turn count is left out of tables and grids.
+HIDDEN_SCENARIOS = np.array(
+    [
+        poke_ball == PokeBall.TIMER_BALL and turns is None
+        for poke_ball, turns in zip(
+            SCENARIO_BALLS,
+            SCENARIO_TURNS,
+            strict=True,
         )
+    ],
+)
+# Condition fields worded for any level, to label a scenario across levels.
+CONDITION_LABELS = {
+    'level': 'target level',
+    'double_level': '2x target level',
+    'double_level_operator': '>=',
+    'quadruple_level': '4x target level',
+    'quadruple_level_operator': '>=',
+}
 
-    _get_base_catch_rates()
-    _get_timer_ball_rates()
-
-    catch_scenarios.extend(
-        [
-            CatchScenario(
-                poke_ball=PokeBall.GREAT_BALL,
-                catch_rate=0x1800,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.ULTRA_BALL,
-                catch_rate=0x2000,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.FAST_BALL,
-                catch_rate=0x4000,
-                condition=f'Target Pokémon Speed >= {FAST_BALL_SPEED_MIN}',
-                is_possible=target_pokemon.stats.speed >= FAST_BALL_SPEED_MIN,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.FAST_BALL,
-                catch_rate=0x1000,
-                condition=f'Target Pokémon Speed < {FAST_BALL_SPEED_MIN}',
-                is_possible=target_pokemon.stats.speed < FAST_BALL_SPEED_MIN,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.LEVEL_BALL,
-                catch_rate=0x8000,
-                condition='User Pokémon Level '
-                + (
-                    '='
-                    if 4 * target_pokemon.level == POKEMON_LEVEL_CAP
-                    else '>='
-                )
-                + f' {4 * target_pokemon.level}',
-                is_possible=4 * target_pokemon.level <= POKEMON_LEVEL_CAP,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.LEVEL_BALL,
-                catch_rate=0x4000,
-                condition='User Pokémon Level '
-                + (
-                    '='
-                    if 2 * target_pokemon.level == POKEMON_LEVEL_CAP
-                    else '>='
-                )
-                + f' {2 * target_pokemon.level}',
-                is_possible=2 * target_pokemon.level <= POKEMON_LEVEL_CAP,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.LEVEL_BALL,
-                catch_rate=0x2000,
-                condition=f'User Pokémon Level > {target_pokemon.level}',
-                is_possible=target_pokemon.level < POKEMON_LEVEL_CAP,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.LURE_BALL,
-                catch_rate=0x4000,
-                condition='Target Pokémon is in water or just above water',
-                # is_condition_true=user information required
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.LOVE_BALL,
-                catch_rate=0x8000,
-                condition='User Pokémon Species is the same as Target,'
-                ' but opposite gender',
-                is_possible=target_pokemon.gender_rate != GENDER_UNKNOWN_VALUE,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.MOON_BALL,
-                catch_rate=0x4000,
-                condition='Target Pokémon evolves with Moon Stone',
-                is_possible=target_pokemon.evolution is not None
-                and target_pokemon.evolution.item == 'Moon Stone',
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.MOON_BALL,
-                catch_rate=0x1000,
-                condition='Target Pokémon does not evolve with Moon Stone',
-                is_possible=not (
-                    target_pokemon.evolution is not None
-                    and target_pokemon.evolution.item == 'Moon Stone'
-                ),
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.NET_BALL,
-                catch_rate=0x3800,
-                condition='Target Pokémon is either Bug or Water type',
-                is_possible=any(
-                    type_ in (PokemonType.BUG, PokemonType.WATER)
-                    for type_ in target_pokemon.types
-                ),
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.NET_BALL,
-                catch_rate=0x1000,
-                condition='Target Pokémon is neither Bug nor Water type',
-                is_possible=not any(
-                    type_ in (PokemonType.BUG, PokemonType.WATER)
-                    for type_ in target_pokemon.types
-                ),
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.DIVE_BALL,
-                catch_rate=0x3800,
-                condition='Target Pokémon is in water',
-                # is_condition_true=user information required
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.NEST_BALL,
-                catch_rate=math.floor(
-                    ((41 - target_pokemon.level) * 0x1000 + 0.5) / 10,
-                ),
-                condition='Target Pokémon Level < 30',
-                is_possible=target_pokemon.level < NEST_BALL_LEVEL_MIN,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.NEST_BALL,
-                catch_rate=0x1000,
-                condition='Target Pokémon Level >= 30',
-                is_possible=target_pokemon.level >= NEST_BALL_LEVEL_MIN,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.REPEAT_BALL,
-                catch_rate=0x3800,
-                condition='Target Pokémon has been registered',
-                # is_possible=user information required
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.DUSK_BALL,
-                catch_rate=0x3000,
-                condition='Catch inside caves or during nighttime',
-                # is_possible=user information required
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.QUICK_BALL,
-                catch_rate=0x5000,
-                condition='0 turns since battle started',
-                # is_possible=user information required
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.DREAM_BALL,
-                catch_rate=0x4000,
-                condition='Target Pokémon is asleep',
-                # is_possible=user information required
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.BEAST_BALL,
-                catch_rate=0x5000,
-                condition='Target Pokémon is an Ultra Beast',
-                is_possible=target_pokemon.dex_no in UB_DEX_NUMBERS,
-            ),
-            CatchScenario(
-                poke_ball=PokeBall.BEAST_BALL,
-                catch_rate=0x19A,
-                condition='Target Pokémon is not an Ultra Beast',
-                is_possible=target_pokemon.dex_no not in UB_DEX_NUMBERS,
-            ),
-        ],
+
+def get_nest_ball_catch_rate(level: int) -> int:
+    return math.floor(((41 - level) * 0x1000 + 0.5) / 10)
+
+
+def get_scenario_catch_rates(level: ArrayLike) -> NDArray[np.int64]:
+    """Return the catalogue's catch rates, one row per level if many."""
+    level = np.asarray(level)[..., np.newaxis]
+    nest_ball_catch_rate = np.floor(((41 - level) * 0x1000 + 0.5) / 10)
+    return np.where(
+        SCENARIO_RATE_CODES == RateCode.NEST_BALL,
+        nest_ball_catch_rate,
+        SCENARIO_CATCH_RATES,
+    ).astype(np.int64)
+
+
+def get_predicate_values(
+    target_pokemon: Pokemon,
+    level: int | None = None,
+) -> NDArray[np.bool_]:
+    """Return whether each Predicate holds, indexed by its value."""
+    level = target_pokemon.level if level is None else level
+    is_fast = target_pokemon.speed >= FAST_BALL_SPEED_MIN
+    evolves_with_moon_stone = target_pokemon.evolution_item == 'Moon Stone'
+    is_bug_or_water = any(
+        type_ in (PokemonType.BUG, PokemonType.WATER)
+        for type_ in target_pokemon.types
+    )
+    is_nest_ball_level = level < NEST_BALL_LEVEL_MIN
+    is_ultra_beast = target_pokemon.dex_no in UB_DEX_NUMBERS
+
+    values = np.empty(len(Predicate), dtype=np.bool_)
+    values[Predicate.ALWAYS] = True
+    values[Predicate.FAST] = is_fast
+    values[Predicate.NOT_FAST] = not is_fast
+    values[Predicate.QUADRUPLE_LEVEL_REACHABLE] = (
+        4 * level <= POKEMON_LEVEL_CAP
+    )
+    values[Predicate.DOUBLE_LEVEL_REACHABLE] = 2 * level <= POKEMON_LEVEL_CAP
+    values[Predicate.HIGHER_LEVEL_REACHABLE] = level < POKEMON_LEVEL_CAP
+    values[Predicate.HAS_GENDER] = (
+        target_pokemon.gender_rate != GENDER_UNKNOWN_VALUE
+    )
+    values[Predicate.EVOLVES_WITH_MOON_STONE] = evolves_with_moon_stone
+    values[Predicate.NOT_EVOLVES_WITH_MOON_STONE] = not evolves_with_moon_stone
+    values[Predicate.BUG_OR_WATER] = is_bug_or_water
+    values[Predicate.NOT_BUG_OR_WATER] = not is_bug_or_water
+    values[Predicate.NEST_BALL_LEVEL] = is_nest_ball_level
+    values[Predicate.NOT_NEST_BALL_LEVEL] = not is_nest_ball_level
+    values[Predicate.ULTRA_BEAST] = is_ultra_beast
+    values[Predicate.NOT_ULTRA_BEAST] = not is_ultra_beast
+    return values
+
+
+def get_scenario_mask(
+    target_pokemon: Pokemon,
+    level: int | None = None,
+) -> NDArray[np.bool_]:
+    """Return which catalogue scenarios are possible for the Pokémon."""
+    mask: NDArray[np.bool_] = get_predicate_values(target_pokemon, level)[
+        SCENARIO_PREDICATES
+    ]
+    return mask
+
+
+def _get_condition_fields(level: int) -> dict[str, int | str]:
+    return {
+        'level': level,
+        'double_level': 2 * level,
+        'double_level_operator': (
+            '=' if 2 * level == POKEMON_LEVEL_CAP else '>='
+        ),
+        'quadruple_level': 4 * level,
+        'quadruple_level_operator': (
+            '=' if 4 * level == POKEMON_LEVEL_CAP else '>='
+        ),
+    }
+
+
+def get_scenario_label(index: int) -> str:
+    """Return the catalogue scenario's ball and level-independent condition."""
+    condition = SCENARIO_CONDITIONS[index]
+    if not condition:
+        return SCENARIO_BALLS[index].value
+    return f'{SCENARIO_BALLS[index].value}: ' + condition.format(
+        **CONDITION_LABELS,
     )
 
-    return [scenario for scenario in catch_scenarios if scenario.is_possible]
+
+@cache
+def get_catch_scenario(index: int, level: int) -> CatchScenario:
+    """Return the catalogue scenario as seen by a Pokémon of `level`."""
+    condition = SCENARIO_CONDITIONS[index]
+    return CatchScenario(
+        poke_ball=SCENARIO_BALLS[index],
+        catch_rate=(
+            get_nest_ball_catch_rate(level)
+            if SCENARIO_RATE_CODES[index] == RateCode.NEST_BALL
+            else int(SCENARIO_CATCH_RATES[index])
+        ),
+        condition=(
+            condition.format(**_get_condition_fields(level))
+            if condition
+            else None
+        ),
+        turns=SCENARIO_TURNS[index],
+    )
+
+
+@metrics.timed('catch_scenarios')
+def get_catch_scenarios(target_pokemon: Pokemon) -> list[CatchScenario]:
+    return [
+        get_catch_scenario(int(index), target_pokemon.level)
+        for index in np.flatnonzero(get_scenario_mask(target_pokemon))
+    ]
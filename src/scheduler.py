@@ -0,0 +1,195 @@
+"""Bulk fetches that stay within a concurrency cap and a request rate.
+
+Requests answered with 429 or a 5xx status, or failing to connect, are
+retried with exponential backoff, honouring Retry-After when it is sent.
+Submitting a URL that is already being fetched returns the pending future.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Generic, Self, TypeVar
+
+import requests
+
+from settings import (
+    INGEST_BACKOFF_FACTOR,
+    INGEST_BURST,
+    INGEST_MAX_BACKOFF,
+    INGEST_RATE_LIMIT,
+    INGEST_RETRIES,
+    MAX_FETCH_WORKERS,
+)
+from src.client import RETRY_STATUSES
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+PROGRESS_INTERVAL = 5  # seconds
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per second, with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst,
+                    self.tokens + (now - self.updated_at) * self.rate,
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class Progress:
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    retries: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return (self.done + self.failed) / elapsed if elapsed else 0
+
+    def __str__(self) -> str:
+        finished = self.done + self.failed
+        remaining = (self.total - finished) / self.rate if self.rate else 0
+        return (
+            f'{finished}/{self.total} fetched, {self.failed} failed, '
+            f'{self.retries} retries, {self.rate:.1f}/s, '
+            f'{remaining:.0f}s left'
+        )
+
+
+def get_retry_delay(
+    error: Exception,
+    attempt: int,
+    backoff_factor: float = INGEST_BACKOFF_FACTOR,
+    max_backoff: float = INGEST_MAX_BACKOFF,
+) -> float | None:
+    """Return how long to wait before retrying, or None to give up."""
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        if response is None or response.status_code not in RETRY_STATUSES:
+            return None
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(max_backoff, float(retry_after))
+    elif not isinstance(error, requests.ConnectionError | requests.Timeout):
+        return None
+
+    delay = min(max_backoff, backoff_factor * 2.0**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)  # noqa: S311
+
+
+class FetchScheduler(Generic[T]):
+    """Run `fetch` on many URLs without overwhelming the server."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        fetch: Callable[[str], T],
+        max_concurrency: int = MAX_FETCH_WORKERS,
+        rate: float = INGEST_RATE_LIMIT,
+        burst: int = INGEST_BURST,
+        retries: int = INGEST_RETRIES,
+        backoff_factor: float = INGEST_BACKOFF_FACTOR,
+        max_backoff: float = INGEST_MAX_BACKOFF,
+    ) -> None:
+        self.fetch = fetch
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.bucket = TokenBucket(rate, burst)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.progress = Progress()
+        self._in_flight: dict[str, Future[T]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+    def _fetch_with_retries(self, url: str) -> T:
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                return self.fetch(url)
+            except Exception as error:
+                delay = (
+                    get_retry_delay(
+                        error,
+                        attempt,
+                        self.backoff_factor,
+                        self.max_backoff,
+                    )
+                    if attempt < self.retries
+                    else None
+                )
+                if delay is None:
+                    raise
+                with self._lock:
+                    self.progress.retries += 1
+                logger.debug('Retrying %s in %.2fs', url, delay)
+                time.sleep(delay)
+            attempt += 1
+
+    def _finish(self, url: str, future: Future[T]) -> None:
+        with self._lock:
+            self._in_flight.pop(url, None)
+            if future.cancelled() or future.exception() is not None:
+                self.progress.failed += 1
+            else:
+                self.progress.done += 1
+
+    def submit(self, url: str) -> Future[T]:
+        """Fetch `url`, sharing the future of a fetch already under way."""
+        with self._lock:
+            if (future := self._in_flight.get(url)) is not None:
+                return future
+            future = self.executor.submit(self._fetch_with_retries, url)
+            self._in_flight[url] = future
+            self.progress.total += 1
+        future.add_done_callback(lambda future: self._finish(url, future))
+        return future
+
+    def fetch_all(
+        self,
+        urls: Iterable[str],
+        progress_interval: float = PROGRESS_INTERVAL,
+    ) -> Iterator[tuple[str, Future[T]]]:
+        """Yield each URL with its finished future, in completion order."""
+        futures = {self.submit(url): url for url in urls}
+        reported_at = time.monotonic()
+        for future in as_completed(futures):
+            yield futures[future], future
+            if time.monotonic() - reported_at >= progress_interval:
+                reported_at = time.monotonic()
+                logger.info('%s', self.progress)
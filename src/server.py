@@ -0,0 +1,350 @@
+"""Asynchronous HTTP JSON API for catch rate queries.
+
+Usage: python -m src.server [--host HOST] [--port PORT]
+
+POST /catch-rates takes one query object and POST /catch-rates/batch takes
+{"queries": [...]}; both answer with Poké Balls ranked by catch rate.
+GET /metrics exposes timings and cache statistics in Prometheus format.
+Connections are kept alive between requests. Once `max_concurrency`
+requests are being calculated, new ones get 503 instead of queueing.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from models.exceptions import (
+    NoPokemonFoundError,
+    PokemonLoadError,
+    RequestError,
+)
+from settings import (
+    SERVER_HOST,
+    SERVER_KEEP_ALIVE_TIMEOUT,
+    SERVER_MAX_BATCH_SIZE,
+    SERVER_MAX_BODY_SIZE,
+    SERVER_MAX_CONCURRENCY,
+    SERVER_PORT,
+)
+from src import metrics
+from src.queries import CatchQuery, run_queries
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+RETRY_AFTER = 1  # seconds
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    version: str
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    def get_json(self) -> Any:  # noqa: ANN401
+        try:
+            return json.loads(self.body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(error)) from error
+
+
+@dataclass
+class Response:
+    status: HTTPStatus
+    payload: Any
+    headers: dict[str, str] = field(default_factory=dict)
+    content_type: str = 'application/json'
+
+    def encode(self, *, keep_alive: bool) -> bytes:
+        body = (
+            self.payload.encode()
+            if isinstance(self.payload, str)
+            else json.dumps(self.payload, separators=(',', ':')).encode()
+        )
+        headers = {
+            'Content-Type': self.content_type,
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+            **self.headers,
+        }
+        head = ''.join(
+            [
+                f'HTTP/1.1 {self.status.value} {self.status.phrase}\r\n',
+                *(f'{name}: {value}\r\n' for name, value in headers.items()),
+                '\r\n',
+            ],
+        )
+        return head.encode('latin-1') + body
+
+
+def get_error_response(status: HTTPStatus, message: str) -> Response:
+    return Response(status, {'error': message})
+
+
+async def read_request(
+    reader: asyncio.StreamReader,
+    max_body_size: int = SERVER_MAX_BODY_SIZE,
+) -> Request | None:
+    """Read one request, or return None once the client closed."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, version = request_line.decode('latin-1').split()
+    except ValueError as error:
+        message = 'malformed request line'
+        raise RequestError(HTTPStatus.BAD_REQUEST, message) from error
+
+    headers = {}
+    while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        content_length = int(headers.get('content-length', 0))
+    except ValueError as error:
+        message = 'invalid Content-Length'
+        raise RequestError(HTTPStatus.BAD_REQUEST, message) from error
+    if content_length < 0:
+        message = 'invalid Content-Length'
+        raise RequestError(HTTPStatus.BAD_REQUEST, message)
+    if content_length > max_body_size:
+        message = f'body is larger than {max_body_size} bytes'
+        raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, message)
+
+    body = await reader.readexactly(content_length)
+    return Request(method, path.split('?', 1)[0], version, headers, body)
+
+
+class CatchRateServer:
+    def __init__(
+        self,
+        max_concurrency: int = SERVER_MAX_CONCURRENCY,
+        max_batch_size: int = SERVER_MAX_BATCH_SIZE,
+        keep_alive_timeout: float = SERVER_KEEP_ALIVE_TIMEOUT,
+    ) -> None:
+        self.max_batch_size = max_batch_size
+        self.keep_alive_timeout = keep_alive_timeout
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.routes: dict[
+            tuple[str, str],
+            Callable[[Request], Awaitable[Response]],
+        ] = {
+            ('GET', '/health'): self.get_health,
+            ('GET', '/metrics'): self.get_metrics,
+            ('POST', '/catch-rates'): self.post_catch_rates,
+            ('POST', '/catch-rates/batch'): self.post_catch_rates_batch,
+        }
+        self.paths = {path for _, path in self.routes}
+
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Serve requests from one connection until it closes or idles."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        read_request(reader),
+                        self.keep_alive_timeout,
+                    )
+                except RequestError as error:
+                    response = get_error_response(
+                        HTTPStatus(error.status),
+                        str(error),
+                    )
+                    writer.write(response.encode(keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                response = await self.dispatch(request)
+                metrics.increment(
+                    'server_requests_total',
+                    {
+                        'route': request.path
+                        if request.path in self.paths
+                        else 'other',
+                        'status': str(response.status.value),
+                    },
+                )
+                writer.write(response.encode(keep_alive=request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (
+            TimeoutError,
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+        ):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def get_unrouted_response(self, request: Request) -> Response:
+        if request.path in self.paths:
+            return get_error_response(
+                HTTPStatus.METHOD_NOT_ALLOWED,
+                f'{request.method} is not allowed on {request.path}',
+            )
+        return get_error_response(
+            HTTPStatus.NOT_FOUND,
+            f'{request.path} not found',
+        )
+
+    async def dispatch(self, request: Request) -> Response:
+        handler = self.routes.get((request.method, request.path))
+        if handler is None:
+            return self.get_unrouted_response(request)
+
+        try:
+            return await handler(request)
+        except RequestError as error:
+            response = get_error_response(HTTPStatus(error.status), str(error))
+            if error.status == HTTPStatus.SERVICE_UNAVAILABLE:
+                response.headers['Retry-After'] = str(RETRY_AFTER)
+            return response
+        except PokemonLoadError as error:
+            # Pages PokéAPI failed to serve are its error, not the client's.
+            status = (
+                HTTPStatus.NOT_FOUND
+                if isinstance(error, NoPokemonFoundError)
+                else HTTPStatus.BAD_GATEWAY
+            )
+            return get_error_response(status, str(error))
+        except ValueError as error:
+            return get_error_response(HTTPStatus.BAD_REQUEST, str(error))
+        except Exception:
+            logger.exception('%s %s failed', request.method, request.path)
+            return get_error_response(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                'internal server error',
+            )
+
+    async def run_queries(
+        self,
+        queries: list[CatchQuery],
+    ) -> list[dict[str, Any]]:
+        """Calculate in a worker thread, refusing work once saturated."""
+        if self.semaphore.locked():
+            raise RequestError(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                'server is at capacity, retry later',
+            )
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor,
+                run_queries,
+                queries,
+            )
+
+    async def get_health(self, _: Request) -> Response:
+        return Response(HTTPStatus.OK, {'status': 'ok'})
+
+    async def get_metrics(self, _: Request) -> Response:
+        return Response(
+            HTTPStatus.OK,
+            metrics.get_prometheus_text(),
+            content_type=PROMETHEUS_CONTENT_TYPE,
+        )
+
+    async def post_catch_rates(self, request: Request) -> Response:
+        query = CatchQuery.from_json(request.get_json())
+        results = await self.run_queries([query])
+        return Response(HTTPStatus.OK, results[0])
+
+    async def post_catch_rates_batch(self, request: Request) -> Response:
+        data = request.get_json()
+        if not isinstance(data, dict) or not isinstance(
+            data.get('queries'),
+            list,
+        ):
+            message = 'expected {"queries": [...]}'
+            raise RequestError(HTTPStatus.BAD_REQUEST, message)
+        if len(data['queries']) > self.max_batch_size:
+            message = f'batches are limited to {self.max_batch_size} queries'
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, message)
+
+        queries = []
+        for index, query in enumerate(data['queries']):
+            try:
+                queries.append(CatchQuery.from_json(query))
+            except ValueError as error:
+                message = f'queries[{index}]: {error}'
+                raise RequestError(HTTPStatus.BAD_REQUEST, message) from error
+        results = await self.run_queries(queries)
+        return Response(HTTPStatus.OK, {'results': results})
+
+
+async def serve(
+    host: str = SERVER_HOST,
+    port: int = SERVER_PORT,
+    **server_options: Any,  # noqa: ANN401
+) -> None:
+    server = CatchRateServer(**server_options)
+    tcp_server = await asyncio.start_server(
+        server.handle_connection,
+        host,
+        port,
+    )
+    logger.info('Serving catch rates on http://%s:%d', host, port)
+    async with tcp_server:
+        await tcp_server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=SERVER_MAX_CONCURRENCY,
+    )
+    parser.add_argument(
+        '--max-batch-size',
+        type=int,
+        default=SERVER_MAX_BATCH_SIZE,
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(
+            serve(
+                args.host,
+                args.port,
+                max_concurrency=args.max_concurrency,
+                max_batch_size=args.max_batch_size,
+            ),
+        )
+
+
+if __name__ == '__main__':
+    main()
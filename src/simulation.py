@@ -0,0 +1,123 @@
+"""Monte Carlo simulation of the Gen IX capture check.
+
+Usage: python -m src.simulation MODIFIED_CATCH_RATE [--throws N] [--seed S]
+"""
+
+import argparse
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.calc import (
+    calculate_critical_catch_value,
+    calculate_overall_catch_rate,
+    calculate_shake_value,
+)
+
+Z_95 = 1.959963984540054
+
+
+@dataclass
+class SimulationResult:
+    throws: int
+    catches: int
+    expected_rate: float
+    elapsed: float
+
+    @property
+    def empirical_rate(self) -> float:
+        return self.catches / self.throws
+
+    @property
+    def throws_per_second(self) -> float:
+        return self.throws / self.elapsed
+
+    def get_confidence_interval(self, z: float = Z_95) -> tuple[float, float]:
+        """Return the Wilson score interval of the empirical rate."""
+        rate = self.empirical_rate
+        denominator = 1 + z**2 / self.throws
+        center = (rate + z**2 / (2 * self.throws)) / denominator
+        margin = (
+            z
+            * math.sqrt(
+                rate * (1 - rate) / self.throws + z**2 / (4 * self.throws**2),
+            )
+            / denominator
+        )
+        return max(0, center - margin), min(1, center + margin)
+
+
+def simulate_throws(  # noqa: PLR0913
+    modified_catch_rate: int,
+    registered_pokemon: int = 843,
+    *,
+    catching_charm: bool = True,
+    throws: int = 1_000_000,
+    batch_size: int = 1_000_000,
+    seed: int | None = None,
+) -> SimulationResult:
+    """Throw `throws` balls, each rolling a critical catch and its shakes."""
+    rng = np.random.default_rng(seed)
+    critical_catch_value = calculate_critical_catch_value(
+        modified_catch_rate,
+        registered_pokemon,
+        catching_charm=catching_charm,
+    )
+    shake_value = calculate_shake_value(modified_catch_rate)
+
+    catches = 0
+    start = time.perf_counter()
+    for batch_start in range(0, throws, batch_size):
+        size = min(batch_size, throws - batch_start)
+        is_critical = rng.integers(0, 256, size) < critical_catch_value
+        shakes = rng.integers(0, 65536, (size, 4)) < shake_value
+        catches += int(
+            np.count_nonzero(
+                np.where(is_critical, shakes[:, 0], shakes.all(axis=1)),
+            ),
+        )
+    elapsed = time.perf_counter() - start
+
+    return SimulationResult(
+        throws=throws,
+        catches=catches,
+        expected_rate=calculate_overall_catch_rate(
+            modified_catch_rate,
+            registered_pokemon,
+            catching_charm=catching_charm,
+        ),
+        elapsed=elapsed,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('modified_catch_rate', type=int)
+    parser.add_argument('--registered-pokemon', type=int, default=843)
+    parser.add_argument('--catching-charm', action='store_true')
+    parser.add_argument('--throws', type=int, default=10_000_000)
+    parser.add_argument('--batch-size', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    result = simulate_throws(
+        args.modified_catch_rate,
+        args.registered_pokemon,
+        catching_charm=args.catching_charm,
+        throws=args.throws,
+        batch_size=args.batch_size,
+        seed=args.seed,
+    )
+    low, high = result.get_confidence_interval()
+    print(  # noqa: T201
+        f'empirical: {result.empirical_rate:.4%} '
+        f'(95% CI {low:.4%} - {high:.4%})\n'
+        f'analytic:  {result.expected_rate:.4%}\n'
+        f'{result.throws_per_second:,.0f} throws per second',
+    )
+
+
+if __name__ == '__main__':
+    main()
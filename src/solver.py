@@ -0,0 +1,295 @@
+"""Find the least effort each Poké Ball needs to reach a catch rate.
+
+Usage: python -m src.solver POKEMON [--level N] [--target P] [--backstrike]
+                            [--badges N] [--registered-pokemon N]
+                            [--catching-charm]
+
+Effort is ranked by catching power level first, then status, then Timer
+Ball turns. For the cheapest combination reaching the target, the answer
+also gives the highest current HP at which the target is still reached.
+The catch rate falls as current HP rises and grows with every other
+variable, so each of them is found by binary search instead of a scan.
+"""
+
+import argparse
+import bisect
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from models.catch_scenario import CatchScenario
+from models.poke_ball import PokeBall
+from models.pokemon import Pokemon, PokemonStatus
+from settings import BADGE_THRESHOLDS, CATCHING_POWER_MODIFIERS
+from src import metrics, modifiers
+from src.calc import GameVariables
+from src.scenarios import POKE_BALLS, get_catch_scenarios
+from src.vectorized import (
+    calculate_modified_catch_rates_array,
+    calculate_overall_catch_rates_array,
+    get_ball_species_modifiers,
+)
+
+DEFAULT_TARGET = 0.9
+CATCHING_POWER_LEVELS = sorted(CATCHING_POWER_MODIFIERS)
+# One status per catch bonus, from no status to the strongest bonus.
+STATUSES: tuple[PokemonStatus | None, ...] = (
+    None,
+    *sorted(PokemonStatus, key=lambda status: status.value),
+)
+# Balls whose condition already implies a status.
+REQUIRED_STATUSES = {PokeBall.DREAM_BALL: PokemonStatus.ASLEEP}
+
+
+@dataclass(frozen=True)
+class Requirement:
+    scenario: CatchScenario
+    catching_power_level: int
+    status: PokemonStatus | None
+    max_current_hp: int
+    catch_rate: float
+
+    @property
+    def effort(self) -> tuple[int, int, int, int]:
+        return (
+            self.catching_power_level,
+            modifiers.get_status_modifier(self.status),
+            self.scenario.turns or 0,
+            -self.max_current_hp,
+        )
+
+
+def _get_options(
+    scenarios: Sequence[CatchScenario],
+) -> list[list[CatchScenario]]:
+    """Group Timer Ball scenarios by turns; every other one stands alone."""
+    timer_scenarios = sorted(
+        (
+            scenario
+            for scenario in scenarios
+            if scenario.poke_ball == PokeBall.TIMER_BALL
+            and scenario.turns is not None
+        ),
+        key=lambda scenario: scenario.turns or 0,
+    )
+    options = [
+        [scenario]
+        for scenario in scenarios
+        if scenario.poke_ball != PokeBall.TIMER_BALL
+    ]
+    if timer_scenarios:
+        options.append(timer_scenarios)
+    return options
+
+
+@metrics.timed('solver')
+def find_requirements(
+    pokemon: Pokemon,
+    target: float = DEFAULT_TARGET,
+    game_variables: GameVariables | None = None,
+    *,
+    backstrike: bool = False,
+) -> list[Requirement]:
+    """
+    Return the least effort for each Poké Ball to reach `target`.
+
+    Balls that cannot reach it at 1 HP with the strongest status and
+    catching power are left out. The rest are sorted by effort.
+    """
+    game_variables = game_variables or GameVariables(
+        badges=len(BADGE_THRESHOLDS) - 1,
+        registered_pokemon=843,
+        catching_charm=False,
+    )
+    hp = pokemon.min_hp
+    species_modifiers = get_ball_species_modifiers(
+        pokemon.catch_rate,
+        pokemon.weight,
+    )
+    dark_grass_modifier = modifiers.get_dark_grass_modifier(
+        game_variables.registered_pokemon,
+    )
+    badge_modifier = modifiers.get_badge_modifier(
+        game_variables.badges,
+        pokemon.level,
+    )
+    critical_catch_modifier = modifiers.get_critical_catch_modifier(
+        game_variables.registered_pokemon,
+    )
+
+    def _get_catch_rate(
+        scenario: CatchScenario,
+        catching_power_level: int,
+        status: PokemonStatus | None,
+        current_hp: int,
+    ) -> float:
+        modified_catch_rate = calculate_modified_catch_rates_array(
+            scenario_catch_rates=scenario.catch_rate,
+            species_modifiers=species_modifiers[
+                POKE_BALLS.index(scenario.poke_ball)
+            ],
+            hp=hp,
+            current_hp=current_hp,
+            level=pokemon.level,
+            dark_grass_modifier=dark_grass_modifier,
+            badge_modifier=badge_modifier,
+            status_modifier=modifiers.get_status_modifier(status),
+            cvc_modifier=modifiers.get_capture_value_coefficient_modifier(
+                catching_power_level,
+                backstrike=backstrike,
+            ),
+        )
+        return float(
+            calculate_overall_catch_rates_array(
+                modified_catch_rate,
+                critical_catch_modifier,
+                game_variables.catching_charm,
+            ),
+        )
+
+    def _reaches_target(
+        scenario: CatchScenario,
+        catching_power_level: int,
+        status: PokemonStatus | None,
+        current_hp: int,
+    ) -> bool:
+        return (
+            _get_catch_rate(scenario, catching_power_level, status, current_hp)
+            >= target
+        )
+
+    def _get_min_turns_scenario(
+        option: list[CatchScenario],
+        catching_power_level: int,
+        status: PokemonStatus | None,
+    ) -> CatchScenario:
+        """Return the first scenario of the option reaching the target."""
+        return option[
+            bisect.bisect_left(
+                option,
+                1,
+                key=lambda scenario: int(
+                    _reaches_target(scenario, catching_power_level, status, 1),
+                ),
+            )
+        ]
+
+    def _get_max_current_hp(
+        scenario: CatchScenario,
+        catching_power_level: int,
+        status: PokemonStatus | None,
+    ) -> int:
+        """Return the highest current HP still reaching the target."""
+        return bisect.bisect_left(
+            range(1, hp + 1),
+            1,
+            key=lambda current_hp: int(
+                not _reaches_target(
+                    scenario,
+                    catching_power_level,
+                    status,
+                    current_hp,
+                ),
+            ),
+        )
+
+    def _solve(option: list[CatchScenario]) -> Requirement | None:
+        statuses = (
+            (REQUIRED_STATUSES[option[0].poke_ball],)
+            if option[0].poke_ball in REQUIRED_STATUSES
+            else STATUSES
+        )
+        efforts = [
+            (catching_power_level, status)
+            for catching_power_level in CATCHING_POWER_LEVELS
+            for status in statuses
+        ]
+        # Every variable at its best, the Timer Ball at its most turns.
+        if not _reaches_target(option[-1], *efforts[-1], 1):
+            return None
+
+        for catching_power_level, status in efforts:
+            if not _reaches_target(
+                option[-1],
+                catching_power_level,
+                status,
+                1,
+            ):
+                continue
+
+            scenario = _get_min_turns_scenario(
+                option,
+                catching_power_level,
+                status,
+            )
+            max_current_hp = _get_max_current_hp(
+                scenario,
+                catching_power_level,
+                status,
+            )
+            return Requirement(
+                scenario=scenario,
+                catching_power_level=catching_power_level,
+                status=status,
+                max_current_hp=max_current_hp,
+                catch_rate=_get_catch_rate(
+                    scenario,
+                    catching_power_level,
+                    status,
+                    max_current_hp,
+                ),
+            )
+        return None
+
+    requirements = [
+        requirement
+        for option in _get_options(get_catch_scenarios(pokemon))
+        if (requirement := _solve(option)) is not None
+    ]
+    return sorted(requirements, key=lambda requirement: requirement.effort)
+
+
+def main(argv: list[str] | None = None) -> None:
+    from src.queries import load_pokemon  # noqa: PLC0415
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('pokemon')
+    parser.add_argument('--level', type=int, default=50)
+    parser.add_argument('--target', type=float, default=DEFAULT_TARGET)
+    parser.add_argument('--backstrike', action='store_true')
+    parser.add_argument(
+        '--badges',
+        type=int,
+        default=len(BADGE_THRESHOLDS) - 1,
+    )
+    parser.add_argument('--registered-pokemon', type=int, default=843)
+    parser.add_argument('--catching-charm', action='store_true')
+    args = parser.parse_args(argv)
+
+    pokemon = load_pokemon(args.pokemon).with_level(args.level)
+    requirements = find_requirements(
+        pokemon,
+        args.target,
+        GameVariables(
+            badges=args.badges,
+            registered_pokemon=args.registered_pokemon,
+            catching_charm=args.catching_charm,
+        ),
+        backstrike=args.backstrike,
+    )
+    print(  # noqa: T201
+        f'{pokemon.name.title()} (level {pokemon.level}, {pokemon.min_hp} HP)'
+        f' reaching {args.target:.0%}:',
+    )
+    for requirement in requirements:
+        scenario = requirement.scenario
+        status = requirement.status.name.title() if requirement.status else '-'
+        print(  # noqa: T201
+            f'{scenario.poke_ball.value:<12} {scenario.condition or "":<64} '
+            f'power {requirement.catching_power_level}  {status:<7} '
+            f'HP <= {requirement.max_current_hp:<4} '
+            f'{requirement.catch_rate:.2%}',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Species ids and names shipped with the app, so startup needs no network.
+
+Usage: python -m src.species_index
+
+Rebuilds the index from the datastore, or from PokéAPI when there is none.
+Run it after new Pokémon are released and commit the result.
+"""
+
+import argparse
+import json
+from functools import cache
+from pathlib import Path
+
+from settings import SPECIES_INDEX_PATH
+
+SpeciesIndex = tuple[tuple[int, str], ...]
+
+
+@cache
+def load_species_index(path: Path = SPECIES_INDEX_PATH) -> SpeciesIndex:
+    """Return the (dex number, name) pairs, or nothing if not generated."""
+    if not path.exists():
+        return ()
+    with path.open() as file:
+        return tuple((dex_no, name) for dex_no, name in json.load(file))
+
+
+def write_species_index(
+    species_index: SpeciesIndex,
+    path: Path = SPECIES_INDEX_PATH,
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('w') as file:
+        json.dump([list(entry) for entry in species_index], file)
+        file.write('\n')
+    load_species_index.cache_clear()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', type=Path, default=SPECIES_INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    from src.api import get_endpoint  # noqa: PLC0415
+
+    species_index = sorted(
+        (int(species['url'].rstrip('/').rsplit('/', 1)[-1]), species['name'])
+        for species in get_endpoint('pokemon-species')
+    )
+    write_species_index(tuple(species_index), args.output)
+    print(  # noqa: T201
+        f'{len(species_index)} species written to {args.output}',
+    )
+
+
+if __name__ == '__main__':
+    main()
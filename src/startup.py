@@ -0,0 +1,114 @@
+"""Report how long importing the app takes, module by module.
+
+Usage: python -m src.startup [--top N] [--budget SECONDS]
+
+app.py's imports run in a fresh interpreter with -X importtime. The
+Streamlit server has streamlit loaded before the script runs, so it is
+imported first and reported apart; the budget covers the app's own imports.
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import NamedTuple
+
+from settings import IMPORT_TIME_BUDGET, ROOT
+
+FRAMEWORK_MODULE = 'streamlit'
+IMPORT_SCRIPT = (
+    f'import {FRAMEWORK_MODULE}, runpy; '
+    "runpy.run_path('app.py', run_name='__startup__')"
+)
+
+
+class ImportTime(NamedTuple):
+    module: str
+    depth: int
+    self_time: float  # seconds
+    cumulative_time: float  # seconds
+
+
+def parse_import_times(report: str) -> list[ImportTime]:
+    """Parse -X importtime output, keeping the order modules finished."""
+    import_times = []
+    for line in report.splitlines():
+        if not line.startswith('import time:') or line.endswith('package'):
+            continue
+        self_time, cumulative_time, name = line[12:].split('|')
+        module = name[1:]
+        import_times.append(
+            ImportTime(
+                module=module.lstrip(),
+                depth=(len(module) - len(module.lstrip())) // 2,
+                self_time=int(self_time) / 1e6,
+                cumulative_time=int(cumulative_time) / 1e6,
+            ),
+        )
+    return import_times
+
+
+def measure_import_times() -> list[ImportTime]:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-X', 'importtime', '-c', IMPORT_SCRIPT],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_import_times(result.stderr)
+
+
+def get_app_import_times(
+    import_times: list[ImportTime],
+) -> tuple[ImportTime, list[ImportTime]]:
+    """Split the framework import from everything the app imports after it."""
+    framework_index = next(
+        index
+        for index, import_time in enumerate(import_times)
+        if import_time.module == FRAMEWORK_MODULE and import_time.depth == 0
+    )
+    return import_times[framework_index], import_times[framework_index + 1 :]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument(
+        '--budget',
+        type=float,
+        default=IMPORT_TIME_BUDGET,
+        help='allowed app import time, in seconds (default: %(default)s)',
+    )
+    args = parser.parse_args(argv)
+
+    framework, app_import_times = get_app_import_times(measure_import_times())
+    total = sum(
+        import_time.cumulative_time
+        for import_time in app_import_times
+        if import_time.depth == 0
+    )
+    slowest = sorted(
+        app_import_times,
+        key=lambda import_time: import_time.cumulative_time,
+        reverse=True,
+    )[: args.top]
+
+    lines = [
+        f'{"module":<50} {"self":>10} {"cumulative":>12}',
+        *(
+            f'{import_time.module:<50} '
+            f'{import_time.self_time * 1e3:>8.1f}ms '
+            f'{import_time.cumulative_time * 1e3:>10.1f}ms'
+            for import_time in slowest
+        ),
+        '',
+        f'{FRAMEWORK_MODULE}: {framework.cumulative_time * 1e3:.1f}ms',
+        f'app imports: {total * 1e3:.1f}ms (budget {args.budget * 1e3:.1f}ms)',
+    ]
+    print('\n'.join(lines))  # noqa: T201
+    if total > args.budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Answer catch rate queries read as JSON Lines, writing JSON Lines back.
+
+Usage: python -m src.stream [INPUT] [--output FILE] [--chunk-size N]
+
+Lines are read, answered and written one chunk at a time, so memory use
+does not grow with the input. Within a chunk each species is loaded once.
+Every output line carries the number of its input line; lines that cannot
+be answered get an "error" instead of catch rates.
+"""
+
+import argparse
+import itertools
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+from models.exceptions import PokemonLoadError
+from settings import STREAM_CHUNK_SIZE
+from src.queries import (
+    CatchQuery,
+    get_catch_case,
+    get_query_key,
+    get_results,
+    load_species,
+)
+
+Line = tuple[int, str]
+
+
+def get_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[list[Line]]:
+    """Yield numbered non-blank lines, at most `chunk_size` at a time."""
+    numbered_lines = (
+        (line_no, line)
+        for line_no, line in enumerate(lines, start=1)
+        if line.strip()
+    )
+    while chunk := list(itertools.islice(numbered_lines, chunk_size)):
+        yield chunk
+
+
+def answer_chunk(chunk: list[Line]) -> list[dict[str, Any]]:
+    """Return the answer to every line of the chunk, in input order."""
+    answers: dict[int, dict[str, Any]] = {}
+    queries: list[tuple[int, CatchQuery]] = []
+    for line_no, line in chunk:
+        try:
+            queries.append((line_no, CatchQuery.from_json(json.loads(line))))
+        except ValueError as error:
+            answers[line_no] = {'line': line_no, 'error': str(error)}
+
+    species = load_species(get_query_key(query) for _, query in queries)
+    cases = []
+    for line_no, query in queries:
+        pokemon = species[get_query_key(query)]
+        if isinstance(pokemon, PokemonLoadError):
+            answers[line_no] = {'line': line_no, 'error': str(pokemon)}
+            continue
+        cases.append((line_no, get_catch_case(query, pokemon)))
+
+    results = get_results([case for _, case in cases])
+    for (line_no, _), result in zip(cases, results, strict=True):
+        answers[line_no] = {'line': line_no, **result}
+    return [answers[line_no] for line_no, _ in chunk]
+
+
+def stream(
+    lines: Iterable[str],
+    output: IO[str],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> int:
+    """Answer every line, writing each chunk once done. Return line count."""
+    answered = 0
+    for chunk in get_chunks(lines, chunk_size):
+        output.writelines(
+            json.dumps(answer, separators=(',', ':')) + '\n'
+            for answer in answer_chunk(chunk)
+        )
+        output.flush()
+        answered += len(chunk)
+    return answered
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        'input',
+        nargs='?',
+        type=argparse.FileType(encoding='utf-8'),
+        default=sys.stdin,
+    )
+    parser.add_argument(
+        '--output',
+        type=argparse.FileType('w', encoding='utf-8'),
+        default=sys.stdout,
+    )
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    with args.input, args.output:
+        stream(args.input, args.output, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
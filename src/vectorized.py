@@ -0,0 +1,249 @@
+"""NumPy implementation of the catch rate formula for batches of inputs.
+
+Every function mirrors its scalar counterpart in src/calc.py operation by
+operation, so results match the scalar path bit for bit.
+"""
+
+from collections.abc import Sequence
+from functools import cache
+from typing import Any, NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from models.catch_scenario import CatchScenario
+from models.pokemon import Pokemon
+from settings import LOW_LEVEL_BONUS_THRESHOLD
+from src import modifiers
+from src.calc import (
+    BattleVariables,
+    GameVariables,
+    get_constant_modifiers,
+)
+from src.scenarios import (
+    POKE_BALLS,
+    SCENARIO_BALL_IDS,
+    get_catch_scenario,
+    get_scenario_catch_rates,
+    get_scenario_mask,
+)
+
+
+class CatchCase(NamedTuple):
+    pokemon: Pokemon
+    hp: int
+    battle_variables: BattleVariables
+    game_variables: GameVariables
+
+
+class _SpeciesScenarios(NamedTuple):
+    """The parts of a case depending only on its Pokémon and level."""
+
+    scenarios: list[CatchScenario]
+    catch_rates: NDArray[np.int64]
+    species_modifiers: NDArray[np.int64]
+
+
+def _get_species_scenarios(pokemon: Pokemon) -> _SpeciesScenarios:
+    indexes = np.flatnonzero(get_scenario_mask(pokemon))
+    return _SpeciesScenarios(
+        scenarios=[
+            get_catch_scenario(index, pokemon.level)
+            for index in indexes.tolist()
+        ],
+        catch_rates=get_scenario_catch_rates(pokemon.level)[indexes],
+        species_modifiers=get_ball_species_modifiers(
+            pokemon.catch_rate,
+            pokemon.weight,
+        )[SCENARIO_BALL_IDS[indexes]],
+    )
+
+
+@cache
+def _get_fourth_powers() -> NDArray[np.float64]:
+    # NumPy's float power rounds differently from the C library pow used
+    # by the scalar path, so the 65537 possible values are built with it.
+    return np.array([(value / 65536) ** 4 for value in range(65537)])
+
+
+def special_round_array(values: ArrayLike) -> NDArray[np.int64]:
+    rounded: NDArray[np.float64] = np.floor(
+        (np.asarray(values) + 2048) / 4096,
+    )
+    return rounded.astype(np.int64)
+
+
+def get_hp_modifier_array(
+    hp: ArrayLike,
+    current_hp: ArrayLike,
+) -> NDArray[np.int64]:
+    hp_modifier = (3 * np.asarray(hp) - 2 * np.asarray(current_hp)) * 4096
+    rounded: NDArray[np.float64] = np.floor(hp_modifier + 0.5)
+    return rounded.astype(np.int64)
+
+
+def calculate_modified_catch_rates_array(  # noqa: PLR0913
+    scenario_catch_rates: ArrayLike,
+    species_modifiers: ArrayLike,
+    hp: ArrayLike,
+    current_hp: ArrayLike,
+    level: ArrayLike,
+    dark_grass_modifier: ArrayLike,
+    badge_modifier: ArrayLike,
+    status_modifier: ArrayLike,
+    cvc_modifier: ArrayLike,
+) -> NDArray[np.int64]:
+    """Return the modified catch rates of broadcastable input arrays."""
+    hp = np.asarray(hp, dtype=np.int64)
+    level = np.asarray(level, dtype=np.int64)
+
+    a = get_hp_modifier_array(hp, current_hp)
+    b = special_round_array(np.asarray(dark_grass_modifier) * a)
+    c = np.asarray(species_modifiers, dtype=np.int64) * b
+    d = special_round_array(np.asarray(scenario_catch_rates) * c)
+    e = special_round_array(np.asarray(badge_modifier) * d) / (3 * hp)
+    f = np.where(
+        level <= LOW_LEVEL_BONUS_THRESHOLD,
+        np.floor((36 - 2 * level) * e / 10),
+        e,
+    )
+    g = special_round_array(np.asarray(status_modifier) * f)
+
+    return np.minimum(
+        special_round_array(np.asarray(cvc_modifier) * g),
+        0xFF000,
+    )
+
+
+def calculate_overall_catch_rates_array(
+    modified_catch_rates: ArrayLike,
+    critical_catch_modifier: ArrayLike,
+    catching_charm: ArrayLike,
+) -> NDArray[np.float64]:
+    """Return the capture probabilities of the modified catch rates."""
+    modified_catch_rates = np.asarray(modified_catch_rates, dtype=np.int64)
+
+    ccv = np.floor(
+        special_round_array(
+            np.asarray(critical_catch_modifier) * modified_catch_rates,
+        )
+        * np.where(catching_charm, 2, 1)
+        * 715827883
+        / (4294967296 * 4096),
+    )
+    critical_catch_odds = ccv / 256
+
+    with np.errstate(divide='ignore'):
+        shake_values = np.trunc(
+            65536 / (((255 * 4096) / modified_catch_rates) ** (3 / 16)),
+        )
+    successful_shake_odds = shake_values / 65536
+    successful_shake_odds_pow4 = _get_fourth_powers()[
+        shake_values.astype(np.int64)
+    ]
+
+    catch_rates: NDArray[np.float64] = (
+        critical_catch_odds * successful_shake_odds
+        + (1 - critical_catch_odds) * successful_shake_odds_pow4
+    )
+    return catch_rates
+
+
+@cache
+def get_ball_species_modifiers(
+    catch_rate: int,
+    weight: float,
+) -> NDArray[np.int64]:
+    return np.array(
+        [
+            modifiers.get_species_modifier(catch_rate, weight, poke_ball)
+            for poke_ball in POKE_BALLS
+        ],
+    )
+
+
+def calculate_catch_rates_batch(
+    cases: Sequence[CatchCase],
+) -> list[tuple[list[CatchScenario], NDArray[np.float64]]]:
+    """Return the scenarios and capture probabilities of every case at once."""
+    if not cases:
+        return []
+
+    # Cases sharing a Pokémon, like the HPs of each IV, share its scenarios,
+    # so those are only looked up once.
+    species_scenarios: dict[int, _SpeciesScenarios] = {}
+    for case in cases:
+        if id(case.pokemon) not in species_scenarios:
+            species_scenarios[id(case.pokemon)] = _get_species_scenarios(
+                case.pokemon,
+            )
+    case_scenarios = [species_scenarios[id(case.pokemon)] for case in cases]
+    counts = [len(scenarios.scenarios) for scenarios in case_scenarios]
+    constant_modifiers = [
+        get_constant_modifiers(
+            case.hp,
+            case.pokemon.level,
+            case.battle_variables,
+            case.game_variables,
+        )
+        for case in cases
+    ]
+
+    def _repeat(values: ArrayLike) -> NDArray[Any]:
+        return np.repeat(values, counts)
+
+    modified_catch_rates = calculate_modified_catch_rates_array(
+        scenario_catch_rates=np.concatenate(
+            [scenarios.catch_rates for scenarios in case_scenarios],
+        ),
+        species_modifiers=np.concatenate(
+            [scenarios.species_modifiers for scenarios in case_scenarios],
+        ),
+        hp=_repeat([case.hp for case in cases]),
+        current_hp=_repeat(
+            [case.battle_variables.target_current_hp for case in cases],
+        ),
+        level=_repeat([case.pokemon.level for case in cases]),
+        dark_grass_modifier=_repeat(
+            [constants.dark_grass for constants in constant_modifiers],
+        ),
+        badge_modifier=_repeat(
+            [constants.badge for constants in constant_modifiers],
+        ),
+        status_modifier=_repeat(
+            [constants.status for constants in constant_modifiers],
+        ),
+        cvc_modifier=_repeat(
+            [constants.cvc for constants in constant_modifiers],
+        ),
+    )
+    catch_rates = calculate_overall_catch_rates_array(
+        modified_catch_rates,
+        _repeat(
+            modifiers.get_critical_catch_modifier_array(
+                [case.game_variables.registered_pokemon for case in cases],
+            ),
+        ),
+        _repeat([case.game_variables.catching_charm for case in cases]),
+    )
+
+    return [
+        (list(scenarios.scenarios), case_catch_rates)
+        for scenarios, case_catch_rates in zip(
+            case_scenarios,
+            np.split(catch_rates, np.cumsum(counts)[:-1]),
+            strict=True,
+        )
+    ]
+
+
+def calculate_catch_rates_array(
+    pokemon: Pokemon,
+    hp: int,
+    battle_variables: BattleVariables,
+    game_variables: GameVariables,
+) -> tuple[list[CatchScenario], NDArray[np.float64]]:
+    """Return every possible scenario and its capture probability."""
+    return calculate_catch_rates_batch(
+        [CatchCase(pokemon, hp, battle_variables, game_variables)],
+    )[0]